@@ -0,0 +1,64 @@
+"""Write/read throughput of the export formats against the CSV path.
+
+For each size, writes one projection with every available format (Arrow and
+Parquet are skipped without pyarrow), reads it back, and reports file size,
+write and read time and rows/s. "read" loads every column; "mmap" opens the
+file memory-mapped and sums one column, which is what a downstream tool
+pulling a single series pays.
+
+Usage: python benchmarks/bench_export.py [rows ...]     (default: 100000 1000000)
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from export import export_result, read_columns  # noqa: E402
+from simulator import project_months  # noqa: E402
+
+FORMATS = (('csv', False), ('npz', False), ('npz', True), ('arrow', False), ('arrow', True), ('parquet', False))
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    value = fn()
+    return time.perf_counter() - started, value
+
+
+def bench(rows, workdir):
+    # Zero growth keeps every month finite at any horizon.
+    results = project_months(10000, 50, 20, 200, 0.0, rows)
+    report = []
+    written = {}
+    for fmt, mmap in FORMATS:
+        path = os.path.join(workdir, f'bench.{fmt}')
+        try:
+            if fmt not in written:
+                written[fmt] = _timed(lambda: export_result(path, results, fmt))[0]
+        except ImportError:
+            continue
+        if mmap:
+            read_time, _ = _timed(lambda: float(read_columns(path, fmt, mmap=True)['cumulative_profit'].sum()))
+        else:
+            read_time, _ = _timed(lambda: read_columns(path, fmt))
+        report.append((fmt + (' mmap' if mmap else ''), os.path.getsize(path), written[fmt], read_time))
+    return report
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            print(f"\n{rows:,} rows")
+            print(f"{'format':<12} {'MB':>8} {'write s':>9} {'read s':>9} {'write rows/s':>14} {'read rows/s':>14}")
+            for name, size, write_time, read_time in bench(rows, workdir):
+                print(f"{name:<12} {size / 1e6:>8.1f} {write_time:>9.3f} {read_time:>9.3f} "
+                      f"{rows / write_time:>14,.0f} {rows / read_time:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Latency of an incremental patch vs. a full project_months recompute.
+
+For each horizon, times one change of each kind through
+incremental.patch_projection against recomputing the projection from scratch,
+then a price change through the API: POST /api/project/patch by key with the
+results omitted, vs. GET /api/project (result cache disabled, so it recomputes and
+serializes every month) and GET /api/project?break_even_only=1.
+
+Usage: python benchmarks/bench_incremental.py [months ...]     (default: 1200 12000 120000)
+"""
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from incremental import patch_projection  # noqa: E402
+from precompute import PROJECTION_PARAMETERS  # noqa: E402
+from simulator import project_months  # noqa: E402
+
+BASE = dict(fixed_costs=10000, price=50, variable_cost=20, initial_sales=200, monthly_growth=0.0001)
+
+
+def cases(months):
+    return {
+        'fixed_costs': ({'fixed_costs': 12000}, 1),
+        'price': ({'price': 55}, 1),
+        'monthly_growth': ({'monthly_growth': 0.0002}, 1),
+        'price, last 10%': ({'price': 55}, months - months // 10 + 1),
+        'months +10%': ({'months': months + months // 10}, 1),
+    }
+
+
+def best_ms(fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number * 1000
+
+
+def bench_functions(months):
+    params = dict(BASE, months=months)
+    results = project_months(*(params[name] for name in PROJECTION_PARAMETERS))
+    rows = []
+    for name, (changes, from_month) in cases(months).items():
+        new = dict(params, **changes)
+        full = best_ms(lambda: project_months(*(new[name] for name in PROJECTION_PARAMETERS)))
+        patch = best_ms(lambda: patch_projection(results, params, changes, from_month))
+        rows.append((name, full, patch))
+    return rows
+
+
+def bench_api(months):
+    from api import result_cache
+    from webapp import app
+
+    result_cache.max_entries = 0
+    client = app.test_client()
+    key = client.post('/api/project/patch', json={'params': dict(BASE, months=months),
+                                                   'include_results': False}).get_json()['data']['key']
+    query = '&'.join(f'{name}={value}' for name, value in dict(BASE, price=55, months=months).items())
+    full = best_ms(lambda: client.get(f'/api/project?{query}'))
+    patch = best_ms(lambda: client.post('/api/project/patch', json={
+        'key': key, 'changes': {'price': 55}, 'include_results': False}))
+    summary = best_ms(lambda: client.get(f'/api/project?{query}&break_even_only=1'))
+    return full, patch, summary
+
+
+def main():
+    horizons = [int(arg) for arg in sys.argv[1:]] or [1200, 12000, 120000]
+    for months in horizons:
+        print(f"\n{months:,} months")
+        print(f"{'change':<18} {'full ms':>9} {'patch ms':>9} {'speedup':>8}")
+        for name, full, patch in bench_functions(months):
+            print(f"{name:<18} {full:>9.3f} {patch:>9.3f} {full / patch:>7.1f}x")
+        full, patch, summary = bench_api(months)
+        print(f"API price change: /api/project {full:.2f} ms, /api/project/patch {patch:.2f} ms "
+              f"(break_even_only {summary:.2f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Overhead of the timing instrumentation, disabled and enabled.
+
+Compares each instrumented call against the undecorated function
+(``fn.__wrapped__``), and a bare block against ``with timed(...)``. The
+disabled column is the cost every request pays when SIM_METRICS is unset.
+
+Usage: python benchmarks/bench_instrumentation.py [repeats]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+import instrumentation  # noqa: E402
+from instrumentation import timed  # noqa: E402
+from simulator import cohort_projection, project_months  # noqa: E402
+
+BASE = (10000, 50, 20, 200, 0.001)
+
+
+def per_call_ns(fn, repeat):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def block():
+    with timed('bench.block'):
+        pass
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cases = [
+        ('project_months(12)', lambda: project_months.__wrapped__(*BASE, 12), lambda: project_months(*BASE, 12)),
+        ('project_months(1200)', lambda: project_months.__wrapped__(*BASE, 1200),
+         lambda: project_months(*BASE, 1200)),
+        ('cohort_projection(12)', lambda: cohort_projection.__wrapped__(1000, 5.0, 0.02, 12),
+         lambda: cohort_projection(1000, 5.0, 0.02, 12)),
+        ('timed() block', lambda: None, block),
+    ]
+    print(f"{'case':<24} {'bare ns':>9} {'disabled ns':>12} {'enabled ns':>11} {'disabled +%':>12}")
+    for name, bare, wrapped in cases:
+        instrumentation.enable(False)
+        base_ns = per_call_ns(bare, repeat)
+        off_ns = per_call_ns(wrapped, repeat)
+        instrumentation.enable(True)
+        on_ns = per_call_ns(wrapped, repeat)
+        instrumentation.enable(False)
+        print(f"{name:<24} {base_ns:>9.0f} {off_ns:>12.0f} {on_ns:>11.0f} "
+              f"{(off_ns / base_ns - 1) * 100:>11.1f}%")
+    instrumentation.reset()
+
+
+if __name__ == '__main__':
+    main()
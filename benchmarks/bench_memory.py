@@ -0,0 +1,50 @@
+"""Per-month memory footprint of columnar results versus the legacy list of dicts.
+
+For each horizon it reports the bytes per month still allocated once the result is
+built (retained) and the peak allocation while building it (peak), both from
+tracemalloc.
+
+Usage: python benchmarks/bench_memory.py [months ...]
+"""
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from simulator import project_months, cohort_projection
+
+
+def _measure(build):
+    """Return ``(result, retained bytes, peak bytes)`` for one call of ``build``."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    obj = build()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return obj, size, peak - start
+
+
+def main():
+    horizons = [int(a) for a in sys.argv[1:]] or [12, 120, 600, 6000]
+    print(f"{'kind':<10} {'months':>7} {'columnar B/month':>17} {'peak':>7} {'dicts B/month':>14} {'peak':>7} "
+          f"{'ratio':>6}")
+    for months in horizons:
+        cases = (
+            ('project', lambda: project_months(10000, 50, 20, 200, 0.01, months)),
+            ('cohort', lambda: cohort_projection(1000, 5.0, 0.02, months)),
+        )
+        for kind, build in cases:
+            result, columnar, columnar_peak = _measure(build)
+            _, dicts, dicts_peak = _measure(result.to_records)
+            print(f"{kind:<10} {months:>7} {columnar / months:>17.1f} {columnar_peak / months:>7.1f} "
+                  f"{dicts / months:>14.1f} {dicts_peak / months:>7.1f} {dicts / columnar:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Cost of a multi-product portfolio: one products x months matrix vs. a loop of projections.
+
+For each product count and horizon, times portfolio.simulate_portfolio against
+the by-hand approach it replaces: one project_months call per product, summed
+month by month (without double-counting fixed costs, so the two agree).
+
+Usage: python benchmarks/bench_portfolio.py [months ...]     (default: 36 120 1200)
+"""
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from portfolio import simulate_portfolio  # noqa: E402
+from simulator import break_even_month, project_months  # noqa: E402
+
+FIXED_COSTS = 250000
+PRODUCT_COUNTS = (10, 50, 200)
+
+
+def products(count):
+    return [{'name': f'line-{i}', 'price': 20 + i % 40, 'variable_cost': 5 + i % 15,
+             'initial_sales': 100 + 10 * (i % 25), 'monthly_growth': 0.001 * (i % 5)} for i in range(count)]
+
+
+def looped(lines, fixed_costs, months):
+    """Reference: project each product on its own and add the monthly profit."""
+    results = [project_months(0, p['price'], p['variable_cost'], p['initial_sales'], p['monthly_growth'], months)
+               for p in lines]
+    profit = [sum(column) for column in zip(*(r.column('profit') for r in results))]
+    cumulative, total = [], -fixed_costs
+    for value in profit:
+        total += value
+        cumulative.append(total)
+    return [break_even_month(r) for r in results], cumulative
+
+
+def best_ms(fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number * 1000
+
+
+def main():
+    horizons = [int(arg) for arg in sys.argv[1:]] or [36, 120, 1200]
+    print(f"{'products':>8} {'months':>7} {'portfolio ms':>13} {'loop ms':>9} {'speedup':>8}")
+    for count in PRODUCT_COUNTS:
+        lines = products(count)
+        for months in horizons:
+            matrix = best_ms(lambda: simulate_portfolio(lines, FIXED_COSTS, months))
+            loop = best_ms(lambda: looped(lines, FIXED_COSTS, months))
+            print(f"{count:>8} {months:>7} {matrix:>13.3f} {loop:>9.3f} {loop / matrix:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
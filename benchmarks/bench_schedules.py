@@ -0,0 +1,76 @@
+"""Cost of time-varying schedules in project_months.
+
+Compares, per scenario, a plain constant projection, the segment-wise schedule
+evaluator, and a naive evaluator that expands every schedule into per-month
+Python lists and steps through them (building the same ProjectionResult). The
+plan is a 10-year one scaled to longer horizons: a price step each year, a ramp
+in variable cost, recurring monthly fixed costs and 12-month seasonality.
+
+Usage: python benchmarks/bench_schedules.py [months ...]     (default: 120 1200 12000)
+"""
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from results import ProjectionResult  # noqa: E402
+from schedules import expand, schedule_key  # noqa: E402
+from simulator import project_months  # noqa: E402
+
+ARGS = (100000, 50.0, 20.0, 200, 0.01)
+SEASONALITY = [0.8, 0.9, 1.0, 1.0, 1.0, 1.1, 1.2, 1.2, 1.0, 1.0, 1.1, 1.5]
+
+
+def plan(months):
+    return {
+        'price': [{'from': year * 12 + 1, 'value': 50 * 1.03 ** year} for year in range(1, max(months // 12, 1))],
+        'variable_cost': [{'from': 1, 'value': 20, 'to': 25, 'until': max(months, 2)}],
+        'monthly_growth': [{'from': months // 2 + 1, 'value': 0.0}],
+        'monthly_fixed_costs': 2000,
+        'seasonality': SEASONALITY,
+    }
+
+
+def naive(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, schedule):
+    """Reference: one value lookup per parameter per month, rows built one at a time."""
+    key = dict(schedule_key(schedule))
+    prices = list(expand(key['price'], price, months))
+    variable_costs = list(expand(key['variable_cost'], variable_cost, months))
+    growth = list(expand(key['monthly_growth'], monthly_growth, months))
+    monthly_fixed = list(expand(key['monthly_fixed_costs'], 0.0, months))
+    season = key['seasonality']
+    rows = []
+    cumulative = -fixed_costs
+    units = initial_sales
+    for m in range(months):
+        sold = int(units * season[m % len(season)])
+        revenue = sold * prices[m]
+        variable = sold * variable_costs[m]
+        profit = revenue - variable - monthly_fixed[m]
+        cumulative += profit
+        rows.append((m + 1, sold, revenue, variable, profit, cumulative))
+        units = int(units * (1 + growth[m]))
+    return ProjectionResult.from_rows(rows)
+
+
+def best_us(fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number * 1e6
+
+
+def main():
+    horizons = [int(arg) for arg in sys.argv[1:]] or [120, 1200, 12000]
+    print(f"{'months':>7} {'constant us':>12} {'scheduled us':>13} {'naive us':>10} {'scenarios/s':>12}")
+    for months in horizons:
+        schedule = schedule_key(plan(months))
+        constant = best_us(lambda: project_months(*ARGS, months))
+        scheduled = best_us(lambda: project_months(*ARGS, months, schedule=schedule))
+        reference = best_us(lambda: naive(*ARGS, months, schedule))
+        print(f"{months:>7} {constant:>12.1f} {scheduled:>13.1f} {reference:>10.1f} {1e6 / scheduled:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
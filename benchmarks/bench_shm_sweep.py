@@ -0,0 +1,84 @@
+"""Shared-memory sweep vs. ProcessPoolExecutor.map for large project_months sweeps.
+
+Runs the same scenarios three ways on a pool of the same size:
+
+- ``map (dicts)``: ``pool.map`` returning ``project_months(...).to_records()``,
+  i.e. a pickled list of per-month dicts per scenario
+- ``map (columnar)``: ``pool.map`` returning the ProjectionResult itself
+- ``shm_sweep``: workers write into one shared block, and the parent gets NumPy views
+
+For each mode it reports wall time and the parent's peak Python allocation while
+collecting results (traced in a second, untimed run with tracemalloc). The shared
+block is allocated outside the Python heap, so its size is listed separately.
+
+Usage: python benchmarks/bench_shm_sweep.py [scenarios] [months] [workers]   (default: 100000 12 CPU count)
+"""
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from shm_sweep import shm_sweep  # noqa: E402
+from simulator import project_months  # noqa: E402
+
+
+def _records(args):
+    return project_months(*args).to_records()
+
+
+def _columnar(args):
+    return project_months(*args)
+
+
+def scenarios(count, months):
+    return [(10000 + i % 1000, 40 + i % 30, 20, 100 + i % 500, 0.001 * (i % 20), months) for i in range(count)]
+
+
+def run_map(fn, jobs, workers):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def run_shm(jobs, workers):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return shm_sweep('project_months', jobs, executor=pool)
+
+
+def measure(build):
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    del result
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    months = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    jobs = scenarios(count, months)
+    print(f"{count:,} scenarios x {months} months, {workers} workers")
+    print(f"{'mode':<16} {'seconds':>8} {'scenarios/s':>12} {'parent peak MB':>15}")
+    cases = (
+        ('map (dicts)', lambda: run_map(_records, jobs, workers)),
+        ('map (columnar)', lambda: run_map(_columnar, jobs, workers)),
+        ('shm_sweep', lambda: run_shm(jobs, workers)),
+    )
+    for name, build in cases:
+        result, elapsed, peak = measure(build)
+        print(f"{name:<16} {elapsed:>8.2f} {count / elapsed:>12,.0f} {peak / 1e6:>15.1f}")
+    print(f"shared block: {result.column('month').nbytes * len(result.fields) / 1e6:.1f} MB")
+    result.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Startup cost of the command-line entry points.
+
+Runs each CLI in a fresh interpreter with ``python -X importtime`` and reports
+the total module import time, the slowest top-level imports and the median
+wall time of the whole process. Exits 1 if any case imports a heavy optional
+dependency (Flask, matplotlib, NumPy) it doesn't need, or exceeds ``--budget``
+milliseconds of import time.
+
+Usage:
+    python benchmarks/bench_startup.py                   # report
+    python benchmarks/bench_startup.py --runs 20 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Import-time budget per CLI invocation, interpreter startup (site, encodings) included.
+STARTUP_BUDGET_MS = 60.0
+HEAVY_MODULES = ('flask', 'matplotlib', 'numpy')
+PROJECTION_ARGS = ['--fixed-costs', '10000', '--price', '50', '--variable-cost', '20', '--months', '24']
+
+
+def cases(workdir):
+    """Return ``{name: argv}`` for each entry point on its lightweight path."""
+    config = Path(workdir) / 'config.json'
+    config.write_text(json.dumps({'fixed_costs': 10000, 'price': 50, 'variable_cost': 20, 'months': 24,
+                                  'export_csv': str(Path(workdir) / 'out.csv')}))
+    return {
+        'main': [str(ROOT / 'src' / 'main.py')] + PROJECTION_ARGS,
+        'main --solve-for': [str(ROOT / 'src' / 'main.py')] + PROJECTION_ARGS + ['--solve-for', 'price'],
+        'startup-sim': ['-c', 'import sys; from startup_simulator.cli import main; '
+                              f'sys.argv = ["startup-sim"] + {PROJECTION_ARGS!r}; main()'],
+        'run_from_config': [str(ROOT / 'src' / 'run_from_config.py'), str(config)],
+    }
+
+
+def parse_importtime(stderr: str):
+    """Parse ``-X importtime`` output.
+
+    Returns ``(total_us, modules, top_level)``: the summed cumulative time of the
+    top-level imports, and ``{module: cumulative_us}`` for every import and for the
+    top-level ones only.
+    """
+    modules = {}
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        cumulative_us = cumulative_us.strip()
+        if not cumulative_us.isdigit():
+            continue  # header line
+        # One space after the bar, then two more per nesting level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        modules[name] = int(cumulative_us)
+        if depth == 0:
+            top_level[name] = int(cumulative_us)
+    return sum(top_level.values()), modules, top_level
+
+
+def import_profile(argv):
+    """Run ``argv`` with ``-X importtime``; return :func:`parse_importtime` of its output."""
+    env = dict(os.environ, PYTHONPATH='')
+    out = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return parse_importtime(out.stderr)
+
+
+def wall_time(argv, runs):
+    """Median wall time in seconds of ``runs`` fresh interpreter runs of ``argv``."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + argv, cwd=ROOT, capture_output=True, check=True)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def heavy_imports(modules):
+    """Names from HEAVY_MODULES that appear among the imported ``modules``."""
+    return sorted({name.split('.')[0] for name in modules} & set(HEAVY_MODULES))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Measure CLI startup cost")
+    p.add_argument("--runs", type=int, default=10, help="Wall-time runs per case")
+    p.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list per case")
+    p.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="Import-time budget in ms")
+    args = p.parse_args(argv)
+
+    baseline = wall_time(['-c', 'pass'], args.runs)
+    print(f"bare interpreter: {baseline * 1000:.1f} ms wall")
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, case_argv in cases(workdir).items():
+            total, modules, top_level = import_profile(case_argv)
+            wall = wall_time(case_argv, args.runs)
+            heavy = heavy_imports(modules)
+            over = total / 1000 > args.budget
+            failed = failed or over or bool(heavy)
+            print(f"\n{name}: imports {total / 1000:.1f} ms (budget {args.budget:g}), wall {wall * 1000:.1f} ms"
+                  + (f"  HEAVY: {', '.join(heavy)}" if heavy else '') + ("  OVER BUDGET" if over else ''))
+            for mod, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+                print(f"    {us / 1000:>7.2f} ms  {mod}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
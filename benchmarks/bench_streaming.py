@@ -0,0 +1,58 @@
+"""Peak memory and time-to-first-byte of /api/project: buffered JSON vs streamed NDJSON/CSV.
+
+Each format runs in a fresh subprocess so peak RSS (ru_maxrss) is not shared
+between measurements.
+
+Usage: python benchmarks/bench_streaming.py [months]
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CHILD = r'''
+import json, resource, sys, time, tracemalloc
+sys.path.insert(0, {src!r})
+from webapp import app
+from api import result_cache
+result_cache.max_entries = 0
+client = app.test_client()
+client.get('/api/project?months=1')
+url = '/api/project?months={months}&monthly_growth=0.001&format={fmt}'
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+started = time.perf_counter()
+response = client.get(url, buffered=False)
+chunks = iter(response.response)
+first = next(chunks)
+ttfb = time.perf_counter() - started
+size = len(first) + sum(len(c) for c in chunks)
+total = time.perf_counter() - started
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+print(json.dumps({{"ttfb_ms": ttfb * 1000, "total_ms": total * 1000, "bytes": size,
+                  "peak_traced_kb": peak / 1024, "rss_growth_kb": rss}}))
+'''
+
+
+def run(fmt, months):
+    code = CHILD.format(src=str(ROOT / 'src'), months=months, fmt=fmt)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    months = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"/api/project at {months} months")
+    print(f"{'format':<8} {'TTFB ms':>9} {'total ms':>9} {'body KB':>9} {'peak traced KB':>15} {'RSS growth KB':>14}")
+    for fmt in ('json', 'ndjson', 'csv'):
+        r = run(fmt, months)
+        print(f"{fmt:<8} {r['ttfb_ms']:>9.1f} {r['total_ms']:>9.1f} {r['bytes'] / 1024:>9.0f} "
+              f"{r['peak_traced_kb']:>15.0f} {r['rss_growth_kb']:>14}")
+
+
+if __name__ == '__main__':
+    main()
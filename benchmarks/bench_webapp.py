@@ -0,0 +1,55 @@
+"""Requests/sec and time-to-first-byte of the HTML /simulate page.
+
+Posts the simulator form through the Flask test client (no network, one thread)
+at several projection horizons and reports throughput plus the time until the
+first body chunk is available, which is what a browser waits for before it can
+start rendering.
+
+Usage: python benchmarks/bench_webapp.py [months ...]     (default: 12 240 2400)
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from webapp import app  # noqa: E402
+
+FORM = dict(fixed_costs=10000, price=50, variable_cost=20, initial_sales=200, monthly_growth=0.001)
+# Each horizon runs for at least this long.
+TIME_BUDGET = 1.0
+
+
+def bench(client, months):
+    form = dict(FORM, months=months)
+    requests = 0
+    first_byte = 0.0
+    started = time.perf_counter()
+    while True:
+        sent = time.perf_counter()
+        response = client.post('/simulate', data=form, buffered=False)
+        chunks = iter(response.response)
+        next(chunks, b'')
+        first_byte += time.perf_counter() - sent
+        for _ in chunks:
+            pass
+        response.close()
+        requests += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= TIME_BUDGET:
+            return requests / elapsed, first_byte / requests
+
+
+def main():
+    horizons = [int(arg) for arg in sys.argv[1:]] or [12, 240, 2400]
+    client = app.test_client()
+    client.post('/simulate', data=dict(FORM, months=1))
+    print(f"{'months':>7} {'req/s':>9} {'TTFB ms':>9}")
+    for months in horizons:
+        rate, ttfb = bench(client, months)
+        print(f"{months:>7} {rate:>9.1f} {ttfb * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""Benchmark suite for the simulator and API hot paths.
+
+Times the core simulator functions, the CSV exporters, the plot renderers and
+every /api endpoint (through the Flask test client, with the response and chart
+caches disabled) at several projection horizons, and writes the results as JSON so
+runs can be compared between commits.
+
+Usage:
+    python benchmarks/suite.py --out bench.json                      # full run
+    python benchmarks/suite.py --horizons 12 120 --filter api.        # subset
+    python benchmarks/suite.py --compare bench.json --threshold 15    # exit 1 on regression
+
+A case regresses when its median time per call exceeds the baseline median by
+more than ``--threshold`` percent.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+DEFAULT_HORIZONS = (12, 120, 1200, 12000)
+DEFAULT_THRESHOLD = 10.0
+# Each case is repeated until it has run for this long (and at least MIN_RUNS times,
+# unless a single call already exceeds the budget).
+TIME_BUDGET = 0.25
+MIN_RUNS = 3
+MAX_RUNS = 10_000
+
+BASE = dict(fixed_costs=10000, price=50, variable_cost=20, initial_sales=200, monthly_growth=0.001)
+# Saved scenarios recomputed by the api.scenarios_warm case.
+WARM_SCENARIOS = 20
+# Product lines for the portfolio cases.
+PRODUCTS = [{'price': 20 + 5 * i, 'variable_cost': 5 + 2 * i, 'initial_sales': 100 + 20 * i, 'monthly_growth': 0.001}
+            for i in range(24)]
+
+
+def _simulator_cases(months):
+    from portfolio import simulate_portfolio
+    from simulator import break_even_month, cohort_projection, project_months, sensitivity_analysis
+
+    projection = project_months(*BASE.values(), months)
+    return {
+        'simulator.project_months': lambda: project_months(*BASE.values(), months),
+        'simulator.cohort_projection': lambda: cohort_projection(1000, 5.0, 0.02, months),
+        'simulator.sensitivity_analysis': lambda: sensitivity_analysis(*BASE.values(), months, 'price', 0.2),
+        'simulator.break_even_month': lambda: break_even_month(projection),
+        'simulator.portfolio_24': lambda: simulate_portfolio(PRODUCTS, BASE['fixed_costs'], months),
+    }
+
+
+def _export_cases(months, workdir):
+    import main as cli
+    import run_from_config
+    from simulator import project_months
+
+    projection = project_months(*BASE.values(), months)
+    path = Path(workdir) / 'bench.csv'
+
+    def cli_export():
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli.export_csv(str(path), projection)
+
+    return {
+        'export.main_csv': cli_export,
+        'export.run_from_config_csv': lambda: run_from_config.export_csv(path, projection),
+    }
+
+
+def _plot_cases(months):
+    import matplotlib
+    matplotlib.use('Agg')
+    import plot
+    from simulator import cohort_projection, project_months
+
+    projection = project_months(*BASE.values(), months)
+    cohort = cohort_projection(1000, 5.0, 0.02, months)
+    return {
+        'plot.projection': lambda: plot.make_projection_plot_bytes(projection),
+        'plot.cohort': lambda: plot.make_cohort_plot_bytes(cohort),
+        'plot.cost_pie': lambda: plot.make_cost_pie_chart_bytes(projection, BASE['fixed_costs']),
+        'plot.waterfall': lambda: plot.make_waterfall_chart_bytes(projection),
+    }
+
+
+def _api_cases(months, workdir):
+    import api
+    import plot
+    import precompute
+    from cache import ResultCache
+    from scenarios import FileScenarioStore, set_store
+    from webapp import app
+
+    api.result_cache = ResultCache(max_entries=0)
+    plot.chart_cache = ResultCache(max_entries=0)
+    set_store(FileScenarioStore(Path(workdir) / 'scenarios'))
+    app.config['TESTING'] = True
+    client = app.test_client()
+    query = '&'.join(f'{k}={v}' for k, v in BASE.items()) + f'&months={months}'
+    client.post('/api/scenarios', json={'name': 'bench', **BASE, 'months': months})
+    for i in range(WARM_SCENARIOS):
+        client.post('/api/scenarios', json={'name': f'bench_warm_{i}', **BASE, 'price': 40 + i, 'months': months})
+    patch_key = client.post('/api/project/patch', json={'params': {**BASE, 'months': months},
+                                                        'include_results': False}).get_json()['data']['key']
+
+    def get(url):
+        def call():
+            response = client.get(url)
+            response.get_data()
+            assert response.status_code == 200, (url, response.status_code)
+        return call
+
+    def post(url, body):
+        def call():
+            response = client.post(url, json=body)
+            assert response.status_code == 200, (url, response.status_code)
+        return call
+
+    def warm():
+        response = client.post('/api/scenarios/warm?force=1')
+        assert response.status_code == 202, ('/api/scenarios/warm', response.status_code)
+        precompute._warm_thread.join()
+
+    return {
+        'api.health': get('/api/health'),
+        'api.project': get(f'/api/project?{query}'),
+        'api.project_columns': get(f'/api/project?{query}&layout=columns'),
+        'api.project_ndjson': get(f'/api/project?{query}&format=ndjson'),
+        'api.project_break_even': get(f'/api/project?{query}&break_even_only=1'),
+        'api.cohort': get(f'/api/cohort?months={months}'),
+        'api.sensitivity': get(f'/api/sensitivity?{query}'),
+        'api.solve': get(f'/api/solve?{query}&solve_for=price'),
+        'api.chart_projection': get(f'/api/chart/projection?{query}'),
+        'api.chart_waterfall': get(f'/api/chart/waterfall?{query}'),
+        'api.sensitivity_grid': post('/api/sensitivity/grid', {
+            **BASE, 'months': months, 'axes': {'price': {'min': 40, 'max': 60, 'steps': 5},
+                                                'variable_cost': {'min': 15, 'max': 25, 'steps': 5}}}),
+        'api.montecarlo': post('/api/montecarlo', {
+            **BASE, 'price': {'dist': 'normal', 'mean': 50, 'std': 5}, 'months': months, 'trials': 100, 'seed': 1}),
+        'api.cohorts_layered': post('/api/cohorts/layered', {'months': months, 'cac': 40, 'monthly_churn': 0.05}),
+        'api.portfolio': post('/api/portfolio', {'products': PRODUCTS, 'months': months}),
+        'api.batch': post('/api/batch', {'jobs': [{'type': 'project', 'params': {**BASE, 'months': months}}] * 4}),
+        'api.scenarios_list': get('/api/scenarios'),
+        'api.scenario_load_results': get('/api/scenarios/bench?results=1'),
+        'api.project_patch': post('/api/project/patch', {
+            'key': patch_key, 'changes': {'price': 55}, 'from_month': months // 2 + 1}),
+        # Times the whole background run: the 202 response, then the recomputation.
+        'api.scenarios_warm': warm,
+    }
+
+
+SUITES = {
+    'simulator': lambda months, workdir: _simulator_cases(months),
+    'export': _export_cases,
+    'plot': lambda months, workdir: _plot_cases(months),
+    'api': _api_cases,
+}
+
+
+def time_call(fn, budget: float = TIME_BUDGET) -> dict:
+    """Run ``fn`` repeatedly for about ``budget`` seconds; return per-call timings in seconds."""
+    fn()  # warm-up: imports, caches, first-call allocations
+    samples = []
+    spent = 0.0
+    while len(samples) < MAX_RUNS and (spent < budget or len(samples) < MIN_RUNS):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed)
+        spent += elapsed
+        if len(samples) == 1 and elapsed > budget:
+            break
+    return {
+        'runs': len(samples),
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(horizons=DEFAULT_HORIZONS, name_filter: str = '', budget: float = TIME_BUDGET, progress=None) -> dict:
+    """Run every case whose name contains ``name_filter`` at each horizon.
+
+    Returns ``{"meta": {...}, "results": {"<case>[<months>]": {runs, min, median, mean}}}``.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for suite, build in SUITES.items():
+            # A filter like "api.project" names its suite; skip building the others.
+            if '.' in name_filter and name_filter.split('.', 1)[0] != suite:
+                continue
+            for months in horizons:
+                for name, fn in build(months, workdir).items():
+                    if name_filter and name_filter not in name:
+                        continue
+                    key = f'{name}[{months}]'
+                    results[key] = time_call(fn, budget)
+                    if progress:
+                        progress(key, results[key])
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'horizons': list(horizons),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Return ``(case, baseline_median, current_median, percent_change)`` for each case
+    present in both runs that slowed down by more than ``threshold`` percent."""
+    regressions = []
+    for key, now in current['results'].items():
+        before = baseline['results'].get(key)
+        if not before or before['median'] <= 0:
+            continue
+        change = (now['median'] / before['median'] - 1) * 100
+        if change > threshold:
+            regressions.append((key, before['median'], now['median'], change))
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark simulator and API hot paths")
+    p.add_argument("--horizons", type=int, nargs="+", default=list(DEFAULT_HORIZONS), help="Months to project")
+    p.add_argument("--filter", default="", help="Only run cases whose name contains this string")
+    p.add_argument("--budget", type=float, default=TIME_BUDGET, help="Seconds to spend per case")
+    p.add_argument("--out", default="", help="Write results JSON here")
+    p.add_argument("--compare", default="", help="Baseline results JSON to check for regressions")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                   help="Allowed slowdown of the median, in percent (default 10)")
+    args = p.parse_args(argv)
+
+    def progress(key, stats):
+        print(f"{key:<45} {stats['median'] * 1000:>10.3f} ms  (min {stats['min'] * 1000:.3f}, {stats['runs']} runs)")
+
+    report = run_suite(args.horizons, args.filter, args.budget, progress)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(report['results'])} results to {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for key, before, now, change in regressions:
+            print(f"REGRESSION {key}: {before * 1000:.3f} ms -> {now * 1000:.3f} ms (+{change:.1f}%)")
+        if regressions:
+            raise SystemExit(1)
+        print(f"No regressions above {args.threshold:g}% against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
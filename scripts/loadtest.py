@@ -0,0 +1,108 @@
+"""Local load test for the simulator server.
+
+Fires a mix of light and CPU-heavy API requests at several concurrency levels
+and reports requests/s and p50/p99 latency per level. Standard library only.
+
+    python src/server.py --port 5000 &
+    python scripts/loadtest.py --url http://127.0.0.1:5000 --concurrency 1 4 16 64 --duration 10
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# (method, path, JSON body); heavy endpoints mixed in with cheap ones.
+REQUEST_MIX = [
+    ('GET', '/api/health', None),
+    ('GET', '/api/project?months=24', None),
+    ('GET', '/api/project?months=120&price=55', None),
+    ('GET', '/api/cohort?months=36', None),
+    ('GET', '/api/sensitivity?months=240&parameter=monthly_growth', None),
+    ('POST', '/api/montecarlo', {'price': {'dist': 'normal', 'mean': 50, 'std': 5}, 'months': 36, 'trials': 20000}),
+    ('POST', '/api/batch', {'jobs': [{'type': 'project', 'params': {'months': 60, 'price': 40 + i}}
+                                     for i in range(20)]}),
+]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def _request(base_url, method, path, body, timeout):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'} if data else {})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def run_level(base_url, concurrency, duration, timeout=30.0, mix=REQUEST_MIX):
+    """Run ``concurrency`` closed-loop clients for ``duration`` seconds; return stats."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(offset):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < deadline:
+            method, path, body = mix[i % len(mix)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                ok = _request(base_url, method, path, body, timeout) < 400
+            except (urllib.error.URLError, OSError):
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / wall if wall else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Load test a running simulator server")
+    p.add_argument("--url", default="http://127.0.0.1:5000", help="Base URL of the server")
+    p.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64], help="Client counts to test")
+    p.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    p.add_argument("--json", type=str, default="", help="Optional path to write the results as JSON")
+    args = p.parse_args(argv)
+
+    base_url = args.url.rstrip('/')
+    results = []
+    print(f"{'clients':>7} | {'requests':>8} | {'errors':>6} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8}")
+    for level in args.concurrency:
+        stats = run_level(base_url, level, args.duration)
+        results.append(stats)
+        print(f"{stats['concurrency']:>7} | {stats['requests']:>8} | {stats['errors']:>6} | {stats['rps']:>8.1f} | "
+              f"{stats['p50_ms']:>8.1f} | {stats['p99_ms']:>8.1f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,172 @@
 """REST API endpoints for the Startup Simulator."""
-from flask import Blueprint, request, jsonify
-from simulator import project_months, cohort_projection, sensitivity_analysis, break_even_month
-from scenarios import save_scenario, load_scenario, list_scenarios, delete_scenario
+import csv
+import io
+import json
+import time
+
+from flask import Blueprint, Response, request, jsonify, current_app
+from simulator import project_months, cohort_projection, sensitivity_analysis, break_even_month, solve_break_even_month
+from simulator import iter_project_months, iter_cohort_projection
+from retention import MAX_TABLE_MONTHS, curve_key
+from schedules import schedule_key
+from results import CohortResult, LayeredCohortResult, ProjectionResult, iter_rows
+from cohorts import layered_cohorts_batch, summarize_layered, unit_economics
+from portfolio import simulate_portfolio
+from precompute import load_projection, store_projection, warm_in_background
+from scenarios import save_scenario, load_scenario, list_scenarios, count_scenarios, delete_scenario
+from grid import grid_row_fields, grid_sensitivity, grid_size, iter_grid_rows, normalize_axes
+from montecarlo import DEFAULT_CHUNK_SIZE, monte_carlo_projection
+from cache import ResultCache, etag_for, make_key
+from jobs import job_months, parse_flag, run_jobs
+from solver import SOLVABLE_PARAMETERS, solve_for
+from workers import process_pool, run_cpu_bound
+from plot import CHART_FORMATS, CHART_TYPES, chart_cache, chart_key, chart_series, get_chart
+from instrumentation import timed
+from incremental import merge_params, param_segments, patch_projection, patch_segments
 
 api = Blueprint('api', __name__, url_prefix='/api')
 
+RESULT_LAYOUTS = ('records', 'columns')
+STREAM_FORMATS = ('ndjson', 'csv')
+
+# Rows per chunk handed to the WSGI server when streaming.
+STREAM_CHUNK_ROWS = 256
+
+# Memoized response bodies for /project, /cohort and /sensitivity; sized via the
+# SIM_CACHE_MAX_ENTRIES, SIM_CACHE_MAX_BYTES and SIM_CACHE_TTL environment variables.
+result_cache = ResultCache.from_env()
+# Projections kept for /project/patch, as (ProjectionResult, params, segments) under the key
+# handed to the client. Sized by the result's binary size; SIM_PATCH_CACHE_* overrides the limits.
+patch_cache = ResultCache.from_env('SIM_PATCH_CACHE_')
+
+# Largest grid /api/sensitivity/grid will evaluate; override with app.config['MAX_GRID_POINTS'].
+MAX_GRID_POINTS = 250_000
+# Upper bound on grid points * months for /api/sensitivity/grid; override with app.config['MAX_GRID_CELLS'].
+MAX_GRID_CELLS = 30_000_000
+
+# Largest trials * months a single /api/montecarlo request may evaluate; override with
+# app.config['MAX_MONTE_CARLO_CELLS'].
+MAX_MONTE_CARLO_CELLS = 100_000_000
+# Longest /api/montecarlo horizon; above EXACT_PERCENTILE_CELLS it keeps
+# months * HISTOGRAM_BINS counters. Override with app.config['MAX_MONTE_CARLO_MONTHS'].
+MAX_MONTE_CARLO_MONTHS = 1200
+# Upper bound on chunk_size * months, the matrix /api/montecarlo holds per chunk; override
+# with app.config['MAX_MONTE_CARLO_CHUNK_CELLS'].
+MAX_MONTE_CARLO_CHUNK_CELLS = 5_000_000
+
+# Largest configs * months one /api/cohorts/layered request may evaluate; override with
+# app.config['MAX_LAYERED_CELLS'].
+MAX_LAYERED_CELLS = 10_000_000
+
+# Most jobs accepted by one /api/batch request; override with app.config['MAX_BATCH_JOBS'].
+MAX_BATCH_JOBS = 1000
+# Upper bound on the months of projection one /api/batch request evaluates, summed over
+# its jobs (see jobs.job_months); override with app.config['MAX_BATCH_MONTHS'].
+MAX_BATCH_MONTHS = 10_000_000
+# Upper bound on products * months for /portfolio; override with app.config['MAX_PORTFOLIO_CELLS'].
+MAX_PORTFOLIO_CELLS = 10_000_000
+
+# Longest /api/cohort horizon with a retention curve, whose survival table is built and
+# cached per curve; override with app.config['MAX_RETENTION_MONTHS'].
+MAX_RETENTION_MONTHS = MAX_TABLE_MONTHS
+
+# Longest horizon /api/chart/<type> will plot; override with app.config['MAX_CHART_MONTHS'].
+MAX_CHART_MONTHS = 12_000
+
+# Cache-Control max-age for rendered charts. The ETag is a content hash, so a
+# revalidation after expiry is answered with 304 unless the series changed.
+CHART_MAX_AGE = 3600
+
+
+def _result_layout():
+    """Read and validate the ``layout`` query parameter."""
+    layout = request.args.get('layout', 'records')
+    if layout not in RESULT_LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    return layout
+
+
+def _offload():
+    """True when CPU-heavy endpoints should run in the shared process pool (see workers.py)."""
+    return bool(current_app.config.get('OFFLOAD_CPU'))
+
+
+def _flag(name):
+    """Return True if the boolean query parameter ``name`` is set (1/true/yes)."""
+    return parse_flag(request.args.get(name, ''))
+
+
+def _cached_json(endpoint, params, build):
+    """Return a success response for ``build()``, memoized on the normalized ``params``.
+
+    The ETag is derived from the cache key, so a matching If-None-Match gets a 304
+    without computing anything. Exceptions from ``build`` propagate uncached.
+    """
+    key = make_key(endpoint, params)
+    etag = etag_for(key)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    body = result_cache.get(key)
+    if body is None:
+        with timed('api.compute'):
+            data = build()
+        with timed('api.json_dumps'):
+            body = current_app.json.dumps({'status': 'success', 'data': data}).encode('utf-8')
+        result_cache.put(key, body)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
+def _stream_format():
+    """Return 'ndjson' or 'csv' if a streaming ``format`` was requested, else None."""
+    fmt = request.args.get('format', 'json')
+    if fmt == 'json':
+        return None
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    return fmt
+
+
+def _stream_rows(rows, fields, fmt):
+    """Stream simulator row tuples as NDJSON or CSV, a chunk of rows at a time.
+
+    ``rows`` is a generator from ``simulator.iter_*``, so nothing beyond the current
+    chunk is held in memory regardless of the horizon.
+    """
+    def generate():
+        buffer = io.StringIO()
+        if fmt == 'csv':
+            writer = csv.writer(buffer, lineterminator='\n')
+            writer.writerow(fields)
+            write_row = writer.writerow
+        else:
+            def write_row(row):
+                buffer.write(json.dumps(dict(zip(fields, row))))
+                buffer.write('\n')
+        pending = 0
+        for row in rows:
+            write_row(row)
+            pending += 1
+            if pending == STREAM_CHUNK_ROWS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(generate(), mimetype=mimetype)
+
+
+def _serialize_results(results, layout):
+    """Convert a columnar simulator result into its JSON form."""
+    return results.to_columns() if layout == 'columns' else results.to_records()
+
 
 @api.route('/project', methods=['GET'])
 def api_project():
@@ -18,6 +180,13 @@ def api_project():
     - initial_sales (int): Initial sales/units
     - monthly_growth (float): Monthly growth rate (0-1)
     - months (int): Number of months to project
+    - layout (str): 'records' (default, one object per month) or 'columns' (one list per field)
+    - break_even_only (bool): return only the break-even month, solved without building the
+      series; if months is omitted the horizon is unbounded
+    - format (str): 'json' (default), or 'ndjson' / 'csv' to stream one row per month as it
+      is computed (constant memory, not cached)
+    - schedule (JSON): time-varying price, variable_cost, monthly_growth, monthly_fixed_costs
+      and seasonality, e.g. {"price": [{"from": 13, "value": 55}]} (see schedules.py)
     """
     try:
         fixed_costs = float(request.args.get('fixed_costs', 10000))
@@ -25,19 +194,129 @@ def api_project():
         variable_cost = float(request.args.get('variable_cost', 20))
         initial_sales = int(request.args.get('initial_sales', 200))
         monthly_growth = float(request.args.get('monthly_growth', 0.05))
-        months = int(request.args.get('months', 12))
+        schedule = schedule_key(json.loads(request.args['schedule'])) if request.args.get('schedule') else None
 
-        results = project_months(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months)
-        be_month = break_even_month(results)
+        if schedule:
+            return _project_scheduled(fixed_costs, price, variable_cost, initial_sales, monthly_growth, schedule)
+        if _flag('break_even_only'):
+            horizon = int(request.args['months']) if 'months' in request.args else None
+            params = (fixed_costs, price, variable_cost, initial_sales, monthly_growth, horizon)
+            return _cached_json('project_break_even', params, lambda: {
+                'break_even_month': solve_break_even_month(*params),
+                'months': horizon,
+            })
 
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'results': results,
-                'break_even_month': be_month,
-                'final_cumulative_profit': results[-1]['cumulative_profit'] if results else 0,
+        months = int(request.args.get('months', 12))
+        fmt = _stream_format()
+        if fmt:
+            return _stream_rows(iter_project_months(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months),
+                                ProjectionResult.fields, fmt)
+        layout = _result_layout()
+
+        def build():
+            results = project_months(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months)
+            return {
+                'results': _serialize_results(results, layout),
+                'break_even_month': break_even_month(results),
+                'final_cumulative_profit': results.column('cumulative_profit')[-1] if results else 0,
             }
+
+        return _cached_json('project', (fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, layout), build)
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+def _project_scheduled(fixed_costs, price, variable_cost, initial_sales, monthly_growth, schedule):
+    """/project with a schedule: always built as a series (the break-even solver and the
+    row streamer assume constant parameters), so ``months`` is required for break_even_only."""
+    months = int(request.args.get('months', 12))
+    params = (fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, schedule)
+    if _flag('break_even_only'):
+        if 'months' not in request.args:
+            raise ValueError("break_even_only with a schedule needs months")
+        return _cached_json('project_break_even', params, lambda: {
+            'break_even_month': break_even_month(project_months(*params)),
+            'months': months,
         })
+    fmt = _stream_format()
+    if fmt:
+        return _stream_rows(iter_rows(project_months(*params), ProjectionResult.fields), ProjectionResult.fields, fmt)
+    layout = _result_layout()
+
+    def build():
+        results = project_months(*params)
+        return {
+            'results': _serialize_results(results, layout),
+            'break_even_month': break_even_month(results),
+            'final_cumulative_profit': results.column('cumulative_profit')[-1] if results else 0,
+        }
+
+    return _cached_json('project', params + (layout,), build)
+
+
+@api.route('/project/patch', methods=['POST'])
+def api_project_patch():
+    """
+    Re-run a projection after changing some parameters, recomputing only what the
+    change affects (see incremental.py).
+
+    JSON Body:
+    {
+        "key": "<key from a previous response>",      (or)
+        "params": {"fixed_costs": 10000, "price": 50, "months": 1200},
+        "changes": {"price": 55},
+        "from_month": 1,
+        "layout": "records" | "columns",
+        "include_results": true
+    }
+
+    ``key`` continues from a projection this server returned recently; ``params``
+    starts from ``project_months`` with those parameters, and is also the fallback when
+    the key has expired. The response carries a new ``key`` for the next patch,
+    the full ``params`` and how many months were recomputed. Unknown keys without
+    ``params`` get a 404.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        changes = data.get('changes') or {}
+        from_month = int(data.get('from_month', 1))
+        layout = data.get('layout', 'records')
+        if layout not in RESULT_LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        if not isinstance(changes, dict):
+            raise ValueError('"changes" must be an object')
+
+        entry = patch_cache.get(data['key']) if data.get('key') else None
+        if entry is not None:
+            key = data['key']
+            results, params, segments = entry
+        elif isinstance(data.get('params'), dict):
+            params = merge_params(data['params'], {})
+            key = etag_for(make_key('project_patch', params))
+            results = project_months(*params.values())
+            segments = param_segments(params)
+            patch_cache.put(key, (results, params, segments), size=results.nbytes)
+        else:
+            return jsonify({'status': 'error',
+                            'message': 'Unknown or expired key; send "params" to start over'}), 404
+
+        with timed('api.compute'):
+            results, new_params, start = patch_projection(results, params, changes, from_month, segments)
+        recomputed = new_params['months'] - start
+        segments = patch_segments(segments, new_params, from_month)
+        key = etag_for(make_key('project_patch', (key, new_params, from_month)))
+        patch_cache.put(key, (results, new_params, segments), size=results.nbytes)
+
+        response = {
+            'key': key,
+            'params': new_params,
+            'recomputed_months': recomputed,
+            'break_even_month': break_even_month(results),
+            'final_cumulative_profit': results.column('cumulative_profit')[-1] if results else 0,
+        }
+        if data.get('include_results', True):
+            response['results'] = _serialize_results(results, layout)
+        return jsonify({'status': 'success', 'data': response})
     except (ValueError, TypeError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
@@ -52,22 +331,36 @@ def api_cohort():
     - monthly_margin (float): Monthly margin per customer
     - monthly_churn (float): Monthly churn rate (0-1)
     - months (int): Number of months to project
+    - retention (JSON): retention curve spec replacing monthly_churn, e.g.
+      {"type": "weibull", "shape": 0.8, "scale": 12} (see retention.py); months may
+      then be at most MAX_RETENTION_MONTHS
+    - layout (str): 'records' (default) or 'columns'
+    - format (str): 'json' (default), 'ndjson' or 'csv' (streamed, see /project)
     """
     try:
         initial_customers = int(request.args.get('initial_customers', 100))
         monthly_margin = float(request.args.get('monthly_margin', 5.0))
         monthly_churn = float(request.args.get('monthly_churn', 0.1))
         months = int(request.args.get('months', 12))
+        retention = curve_key(json.loads(request.args['retention'])) if request.args.get('retention') else None
+        max_months = current_app.config.get('MAX_RETENTION_MONTHS', MAX_RETENTION_MONTHS)
+        if retention is not None and months > max_months:
+            raise ValueError(f"months may not exceed {max_months} with a retention curve")
+        fmt = _stream_format()
+        if fmt:
+            return _stream_rows(iter_cohort_projection(initial_customers, monthly_margin, monthly_churn, months,
+                                                       retention), CohortResult.fields, fmt)
+        layout = _result_layout()
 
-        results = cohort_projection(initial_customers, monthly_margin, monthly_churn, months)
-
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'results': results,
-                'final_cumulative_margin': results[-1]['cumulative_margin'] if results else 0,
+        def build():
+            results = cohort_projection(initial_customers, monthly_margin, monthly_churn, months, retention)
+            return {
+                'results': _serialize_results(results, layout),
+                'final_cumulative_margin': results.column('cumulative_margin')[-1] if results else 0,
             }
-        })
+
+        return _cached_json('cohort', (initial_customers, monthly_margin, monthly_churn, months, retention, layout),
+                            build)
     except (ValueError, TypeError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
@@ -86,6 +379,7 @@ def api_sensitivity():
     - months (int): Number of months
     - parameter (str): Parameter to vary (price, variable_cost, initial_sales, monthly_growth, fixed_costs)
     - variation (float): Variation range (e.g., 0.2 for ±20%)
+    - break_even_only (bool): solve break-even months directly and omit final profits
     """
     try:
         fixed_costs = float(request.args.get('fixed_costs', 10000))
@@ -96,31 +390,418 @@ def api_sensitivity():
         months = int(request.args.get('months', 12))
         parameter = request.args.get('parameter', 'price')
         variation = float(request.args.get('variation', 0.2))
+        break_even_only = _flag('break_even_only')
+        params = (fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, parameter, variation)
 
-        results = sensitivity_analysis(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, parameter, variation)
-
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'parameter': parameter,
-                'variation_range': variation,
-                'results': results,
-            }
+        return _cached_json('sensitivity', params + (break_even_only,), lambda: {
+            'parameter': parameter,
+            'variation_range': variation,
+            'results': run_cpu_bound(_offload(), sensitivity_analysis, *params, break_even_only=break_even_only),
         })
     except (ValueError, TypeError) as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 
+@api.route('/solve', methods=['GET'])
+def api_solve():
+    """
+    Goal seek: find the boundary value of one parameter that meets a goal.
+
+    Query Parameters:
+    - solve_for (str): 'price', 'variable_cost', 'initial_sales' or 'monthly_growth'
+    - months (int): break even by this month, or the month target_profit is measured at
+    - target_profit (float, optional): cumulative profit to reach at ``months``; without
+      it the goal is break-even by ``months``
+    - tolerance (float, optional): bisection tolerance for float parameters (default 1e-6)
+    - fixed_costs, price, variable_cost, initial_sales, monthly_growth: the other inputs
+    """
+    try:
+        parameter = request.args.get('solve_for', '')
+        if parameter not in SOLVABLE_PARAMETERS:
+            return jsonify({'status': 'error',
+                            'message': f"solve_for must be one of {', '.join(SOLVABLE_PARAMETERS)}"}), 400
+        params = (
+            parameter,
+            float(request.args.get('fixed_costs', 10000)),
+            float(request.args.get('price', 50)),
+            float(request.args.get('variable_cost', 20)),
+            int(request.args.get('initial_sales', 200)),
+            float(request.args.get('monthly_growth', 0.05)),
+            int(request.args.get('months', 12)),
+        )
+        target = request.args.get('target_profit')
+        target_profit = float(target) if target not in (None, '') else None
+        tolerance = float(request.args.get('tolerance', 1e-6))
+        return _cached_json('solve', params + (target_profit, tolerance), lambda: solve_for(
+            *params, target_profit=target_profit, tolerance=tolerance))
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+@api.route('/chart/<chart_type>', methods=['GET'])
+def api_chart(chart_type):
+    """
+    Render a chart as an image.
+
+    Path: chart_type is 'projection', 'waterfall', 'cost_pie' (projection inputs) or
+    'cohort' (cohort inputs).
+
+    Query Parameters:
+    - format (str): 'png' (default) or 'svg'
+    - fixed_costs, price, variable_cost, initial_sales, monthly_growth, months: as /project
+    - initial_customers, monthly_margin, monthly_churn, months, retention: as /cohort
+
+    Rendered bytes are cached by a hash of the chart type, format and plotted series,
+    which is also the ETag; responses are cacheable by clients for CHART_MAX_AGE seconds.
+    """
+    try:
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"Unknown chart type: {chart_type}; choose one of {', '.join(CHART_TYPES)}")
+        fmt = request.args.get('format', 'png')
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"Unknown chart format: {fmt}; choose one of {', '.join(CHART_FORMATS)}")
+        months = int(request.args.get('months', 12))
+        max_months = current_app.config.get('MAX_CHART_MONTHS', MAX_CHART_MONTHS)
+        if not 1 <= months <= max_months:
+            raise ValueError(f"months must be between 1 and {max_months}")
+        if chart_type == 'cohort':
+            retention = curve_key(json.loads(request.args['retention'])) if request.args.get('retention') else None
+            results = cohort_projection(int(request.args.get('initial_customers', 100)),
+                                        float(request.args.get('monthly_margin', 5.0)),
+                                        float(request.args.get('monthly_churn', 0.1)), months, retention)
+            series = chart_series(chart_type, results)
+        else:
+            fixed_costs = float(request.args.get('fixed_costs', 10000))
+            results = project_months(fixed_costs, float(request.args.get('price', 50)),
+                                     float(request.args.get('variable_cost', 20)),
+                                     int(request.args.get('initial_sales', 200)),
+                                     float(request.args.get('monthly_growth', 0.05)), months)
+            series = chart_series(chart_type, results, fixed_costs)
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    key = chart_key(chart_type, series, fmt)
+    if request.if_none_match.contains(key):
+        response = Response(status=304)
+    else:
+        _, image = get_chart(chart_type, series, fmt, offload=_offload(), key=key)
+        response = Response(image, mimetype=CHART_FORMATS[fmt])
+    response.set_etag(key)
+    response.cache_control.public = True
+    response.cache_control.max_age = CHART_MAX_AGE
+    return response
+
+
+@api.route('/sensitivity/grid', methods=['POST'])
+def api_sensitivity_grid():
+    """
+    Run an N-dimensional grid sensitivity sweep.
+
+    JSON Body:
+    {
+        "fixed_costs": 10000, "price": 50, "variable_cost": 20,
+        "initial_sales": 200, "monthly_growth": 0.05, "months": 12,
+        "axes": {
+            "price": {"min": 40, "max": 60, "steps": 5},
+            "variable_cost": [15, 20, 25]
+        }
+    }
+
+    Query Parameters:
+    - format (str): 'json' (default), or 'ndjson' / 'csv' to stream one row per grid
+      point (flat index, axis values, break_even_month, final_cumulative_profit) as
+      each chunk completes
+
+    Returns break-even month and final cumulative profit for every grid point as
+    nested arrays in axis order, a tornado summary, and the compute time. Grids
+    larger than one chunk run on the shared process pool.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        base = {
+            'fixed_costs': float(data.get('fixed_costs', 10000)),
+            'price': float(data.get('price', 50)),
+            'variable_cost': float(data.get('variable_cost', 20)),
+            'initial_sales': int(data.get('initial_sales', 200)),
+            'monthly_growth': float(data.get('monthly_growth', 0.05)),
+        }
+        months = int(data.get('months', 12))
+        if months < 1:
+            raise ValueError("months must be >= 1")
+        fmt = _stream_format()
+        axes = normalize_axes(data.get('axes') or {},
+                              max_points=current_app.config.get('MAX_GRID_POINTS', MAX_GRID_POINTS))
+        points = grid_size(axes)
+        limit = current_app.config.get('MAX_GRID_CELLS', MAX_GRID_CELLS)
+        if points * months > limit:
+            raise ValueError(f'grid points * months may not exceed {limit}')
+        max_workers = current_app.config.get('GRID_WORKERS')
+
+        if fmt:
+            rows = iter_grid_rows(base, axes, months, max_workers=max_workers, executor=process_pool())
+            return _stream_rows(rows, grid_row_fields(axes), fmt)
+
+        started = time.perf_counter()
+        result = grid_sensitivity(base, axes, months, max_workers=max_workers, executor=process_pool())
+        result['points'] = points
+        result['compute_time_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        return jsonify({'status': 'success', 'data': result})
+    except (ValueError, TypeError, KeyError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+@api.route('/montecarlo', methods=['POST'])
+def api_montecarlo():
+    """
+    Run a Monte Carlo projection.
+
+    JSON Body (each parameter is a number or a distribution spec):
+    {
+        "fixed_costs": 10000,
+        "price": {"dist": "normal", "mean": 50, "std": 5},
+        "variable_cost": {"dist": "triangular", "left": 15, "mode": 20, "right": 30},
+        "initial_sales": {"dist": "lognormal", "median": 200, "sigma": 0.3},
+        "monthly_growth": {"dist": "uniform", "low": 0.0, "high": 0.1},
+        "months": 24,
+        "trials": 100000,
+        "seed": 42
+    }
+
+    Returns P5/P50/P95 cumulative profit per month and a break-even month histogram.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        months = int(data.get('months', 12))
+        trials = int(data.get('trials', 10000))
+        chunk_size = int(data.get('chunk_size', DEFAULT_CHUNK_SIZE))
+        limit = current_app.config.get('MAX_MONTE_CARLO_CELLS', MAX_MONTE_CARLO_CELLS)
+        if trials * months > limit:
+            return jsonify({'status': 'error', 'message': f'trials * months may not exceed {limit}'}), 400
+        max_months = current_app.config.get('MAX_MONTE_CARLO_MONTHS', MAX_MONTE_CARLO_MONTHS)
+        if months > max_months:
+            return jsonify({'status': 'error', 'message': f'months may not exceed {max_months}'}), 400
+        limit = current_app.config.get('MAX_MONTE_CARLO_CHUNK_CELLS', MAX_MONTE_CARLO_CHUNK_CELLS)
+        if chunk_size * months > limit:
+            return jsonify({'status': 'error', 'message': f'chunk_size * months may not exceed {limit}'}), 400
+        seed = data.get('seed')
+
+        started = time.perf_counter()
+        result = run_cpu_bound(
+            _offload(),
+            monte_carlo_projection,
+            data.get('fixed_costs', 10000),
+            data.get('price', 50),
+            data.get('variable_cost', 20),
+            data.get('initial_sales', 200),
+            data.get('monthly_growth', 0.05),
+            months,
+            trials=trials,
+            seed=int(seed) if seed is not None else None,
+            chunk_size=chunk_size,
+        )
+        result['compute_time_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        return jsonify({'status': 'success', 'data': result})
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+@api.route('/cohorts/layered', methods=['POST'])
+def api_cohorts_layered():
+    """
+    Project a layered acquisition model: a new cohort every month, each decaying by churn.
+
+    JSON Body (numeric fields may also be lists, to evaluate many configurations at once):
+    {
+        "months": 36,
+        "monthly_margin": 5.0,
+        "monthly_churn": 0.05,          # or "retention": [1.0, 0.8, 0.7, ...]
+        "new_customers": 100,           # or "marketing_budget": 4000 (requires cac)
+        "customer_growth": 0.02,        # or "budget_growth" with marketing_budget
+        "cac": 40,
+        "initial_customers": 0
+    }
+
+    A single configuration returns the monthly series (honouring ``layout``), a summary
+    and unit economics (LTV, CAC payback, LTV/CAC). Several configurations return one
+    summary and unit-economics entry per configuration.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        months = int(data.get('months', 12))
+        array_fields = ('monthly_margin', 'monthly_churn', 'new_customers', 'customer_growth',
+                        'marketing_budget', 'budget_growth', 'cac', 'initial_customers')
+        params = {name: data[name] for name in array_fields if data.get(name) is not None}
+        params.setdefault('monthly_margin', 5.0)
+        if 'new_customers' not in params and 'marketing_budget' not in params:
+            params['new_customers'] = 100
+        if 'monthly_churn' not in params and data.get('retention') is None:
+            params['monthly_churn'] = 0.1
+        retention = data.get('retention')
+        configs = max([len(v) for v in params.values() if isinstance(v, list)] or [1])
+        limit = current_app.config.get('MAX_LAYERED_CELLS', MAX_LAYERED_CELLS)
+        if configs * months > limit:
+            return jsonify({'status': 'error', 'message': f'configurations * months may not exceed {limit}'}), 400
+        layout = _result_layout()
+
+        started = time.perf_counter()
+        batch = layered_cohorts_batch(months, retention=retention, **params)
+        summary = summarize_layered(batch)
+
+        def config_value(name, i):
+            value = params.get(name)
+            value = value[i] if isinstance(value, list) else value
+            return float(value) if value is not None else None
+
+        def config_retention(i):
+            # A (length, configs) retention array holds one curve per configuration.
+            if not isinstance(retention, list) or not all(isinstance(row, list) for row in retention):
+                return retention
+            return [row[i] if len(row) > 1 else row[0] for row in retention]
+
+        def config_entry(i):
+            entry = {name: values[i].item() for name, values in summary.items()}
+            entry.update(unit_economics(config_value('monthly_margin', i), config_value('cac', i),
+                                        config_value('monthly_churn', i), config_retention(i)))
+            return entry
+
+        if any(isinstance(v, list) for v in params.values()):
+            result = {'months': months, 'configs': [config_entry(i) for i in range(configs)]}
+        else:
+            series = LayeredCohortResult({name: values if values.ndim == 1 else values[:, 0]
+                                          for name, values in batch.items()})
+            result = {'months': months, 'results': _serialize_results(series, layout), **config_entry(0)}
+        result['compute_time_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        return jsonify({'status': 'success', 'data': result})
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+@api.route('/portfolio', methods=['POST'])
+def api_portfolio():
+    """
+    Simulate several product lines against one shared fixed-cost base.
+
+    JSON Body:
+    {
+        "fixed_costs": 50000,             # shared, subtracted once
+        "months": 36,
+        "allocation": "revenue",          # or "units", "contribution", "equal"
+        "products": [
+            {"name": "basic", "price": 20, "variable_cost": 5, "initial_sales": 500},
+            {"name": "pro", "price": 90, "variable_cost": 30, "initial_sales": 40,
+             "monthly_growth": 0.05, "fixed_costs": 8000}
+        ],
+        "layout": "records",              # or "columns", for the totals series
+        "product_results": false          # also return each product's monthly columns
+    }
+
+    Product fields default like /project's parameters; a product's own ``fixed_costs``
+    (default 0) is a direct cost on top of its share of the shared base. Returns the
+    company-wide series and break-even, plus per-product contribution, allocated fixed
+    costs and break-even month (see portfolio.py).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        products = data.get('products')
+        months = int(data.get('months', 12))
+        if not isinstance(products, list) or not products:
+            return jsonify({'status': 'error', 'message': 'Body must contain a non-empty "products" array'}), 400
+        limit = current_app.config.get('MAX_PORTFOLIO_CELLS', MAX_PORTFOLIO_CELLS)
+        if len(products) * months > limit:
+            return jsonify({'status': 'error', 'message': f'products * months may not exceed {limit}'}), 400
+        layout = data.get('layout', 'records')
+        if layout not in RESULT_LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+
+        started = time.perf_counter()
+        portfolio = simulate_portfolio(products, float(data.get('fixed_costs', 10000)), months,
+                                       data.get('allocation', 'revenue'))
+        monthly = portfolio.pop('monthly')
+        portfolio['results'] = _serialize_results(portfolio['results'], layout)
+        if data.get('product_results'):
+            for i, product in enumerate(portfolio['products']):
+                product['results'] = {name: monthly[name][:, i].tolist()
+                                      for name in ('units', 'revenue', 'variable_costs', 'profit', 'contribution')}
+        portfolio['months'] = months
+        portfolio['compute_time_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        return jsonify({'status': 'success', 'data': portfolio})
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+
+@api.route('/batch', methods=['POST'])
+def api_batch():
+    """
+    Run many simulator jobs in one request.
+
+    JSON Body:
+    {
+        "jobs": [
+            {"id": "a", "type": "project", "params": {"price": 60, "months": 24}},
+            {"id": "b", "type": "cohort", "params": {"initial_customers": 500}},
+            {"id": "c", "type": "sensitivity", "params": {"parameter": "variable_cost"}},
+            {"id": "d", "type": "break_even", "params": {"fixed_costs": 1000000}}
+        ]
+    }
+
+    Job params use the same names and defaults as the single endpoints. Results come
+    back in input order, each with its own status and time_ms; a failing job does not
+    fail the batch.
+    """
+    data = request.get_json(silent=True) or {}
+    jobs = data.get('jobs')
+    if not isinstance(jobs, list) or not jobs:
+        return jsonify({'status': 'error', 'message': 'Body must contain a non-empty "jobs" array'}), 400
+    limit = current_app.config.get('MAX_BATCH_JOBS', MAX_BATCH_JOBS)
+    if len(jobs) > limit:
+        return jsonify({'status': 'error', 'message': f'A batch may contain at most {limit} jobs'}), 400
+    limit = current_app.config.get('MAX_BATCH_MONTHS', MAX_BATCH_MONTHS)
+    if sum(job_months(job) for job in jobs) > limit:
+        return jsonify({'status': 'error', 'message': f'A batch may evaluate at most {limit} months in total'}), 400
+
+    started = time.perf_counter()
+    results = run_jobs(jobs, max_workers=current_app.config.get('BATCH_WORKERS'), executor=process_pool())
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'results': results,
+            'count': len(results),
+            'failed': sum(1 for r in results if r['status'] == 'error'),
+            'total_time_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
+    })
+
+
 @api.route('/scenarios', methods=['GET'])
 def api_scenarios_list():
-    """List all saved scenarios."""
+    """
+    List saved scenarios, sorted by name.
+
+    Query Parameters:
+    - prefix: only names starting with this string
+    - tag: only scenarios carrying this tag
+    - limit: page size (default: all)
+    - offset: number of names to skip (default: 0)
+    """
     try:
-        scenario_names = list_scenarios()
+        prefix = request.args.get('prefix') or None
+        tag = request.args.get('tag') or None
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
+        if (limit is not None and limit < 0) or offset < 0:
+            return jsonify({'status': 'error', 'message': 'limit and offset must be >= 0'}), 400
+        scenario_names = list_scenarios(prefix=prefix, tag=tag, limit=limit, offset=offset)
         return jsonify({
             'status': 'success',
             'data': {
                 'scenarios': scenario_names,
                 'count': len(scenario_names),
+                'total': count_scenarios(prefix=prefix, tag=tag),
+                'offset': offset,
+                'limit': limit,
             }
         })
     except Exception as e:
@@ -140,7 +821,8 @@ def api_save_scenario():
         "variable_cost": 20,
         "initial_sales": 200,
         "monthly_growth": 0.05,
-        "months": 12
+        "months": 12,
+        "tags": ["optional", "labels"]
     }
     """
     try:
@@ -158,7 +840,12 @@ def api_save_scenario():
             'months': int(data.get('months', 12)),
         }
 
-        save_scenario(name, params)
+        tags = data.get('tags') or []
+        if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+            return jsonify({'status': 'error', 'message': 'tags must be a list of strings'}), 400
+
+        save_scenario(name, params, tags)
+        store_projection(name, params)
 
         return jsonify({
             'status': 'success',
@@ -171,15 +858,31 @@ def api_save_scenario():
 
 @api.route('/scenarios/<scenario_name>', methods=['GET'])
 def api_load_scenario(scenario_name):
-    """Load a saved scenario."""
+    """
+    Load a saved scenario.
+
+    Query Parameters:
+    - results (bool): also return the projection, read from the persisted copy
+      (recomputed only if the parameters or simulator version changed)
+    - layout (str): 'records' (default) or 'columns', for the results
+    """
     try:
         params = load_scenario(scenario_name)
+        data = {
+            'name': scenario_name,
+            'params': params,
+        }
+        if _flag('results'):
+            layout = _result_layout()
+            results = load_projection(scenario_name, params)
+            data.update({
+                'results': _serialize_results(results, layout),
+                'break_even_month': break_even_month(results),
+                'final_cumulative_profit': results.column('cumulative_profit')[-1] if results else 0,
+            })
         return jsonify({
             'status': 'success',
-            'data': {
-                'name': scenario_name,
-                'params': params,
-            }
+            'data': data,
         })
     except FileNotFoundError:
         return jsonify({'status': 'error', 'message': f'Scenario "{scenario_name}" not found'}), 404
@@ -187,6 +890,22 @@ def api_load_scenario(scenario_name):
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
 
+@api.route('/scenarios/warm', methods=['POST'])
+def api_warm_scenarios():
+    """
+    Recompute persisted projections for all saved scenarios in the background.
+
+    Query Parameters:
+    - force (bool): recompute even projections that are already current
+
+    Projections are computed on the shared process pool. Only one warm-up runs at
+    a time; a request made while one is running gets 409.
+    """
+    if warm_in_background(force=_flag('force'), executor=process_pool()) is None:
+        return jsonify({'status': 'error', 'message': 'Scenario warm-up already running'}), 409
+    return jsonify({'status': 'success', 'message': 'Scenario warm-up started'}), 202
+
+
 @api.route('/scenarios/<scenario_name>', methods=['DELETE'])
 def api_delete_scenario(scenario_name):
     """Delete a saved scenario."""
@@ -209,4 +928,7 @@ def api_health():
         'status': 'healthy',
         'service': 'Startup Simulator API',
         'version': '1.0.0',
+        'cache': result_cache.stats(),
+        'chart_cache': chart_cache.stats(),
+        'patch_cache': patch_cache.stats(),
     })
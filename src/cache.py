@@ -0,0 +1,134 @@
+"""Bounded, thread-safe LRU cache for computed API responses.
+
+Entries are keyed on a normalized parameter tuple (see :func:`make_key`) and hold
+already-serialized response bodies, so a hit skips both the simulation and JSON
+encoding. Eviction is least-recently-used, bounded by entry count and total bytes,
+and entries expire after a TTL.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from simulator import SIMULATOR_VERSION
+
+
+def _canonical(value):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        # 50 and 50.0 parse to the same float; -0.0 and 0.0 share a key.
+        return repr(value + 0.0)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    return repr(value)
+
+
+def make_key(endpoint: str, params: Dict) -> Tuple:
+    """Build a hashable cache key from an endpoint name and its parsed parameters."""
+    return (endpoint, _canonical(params))
+
+
+def etag_for(key: Tuple) -> str:
+    """Stable ETag derived from a cache key and the simulator version.
+
+    Same parameters give the same tag until ``SIMULATOR_VERSION`` changes, so clients
+    don't revalidate stale bodies after a simulator upgrade.
+    """
+    return hashlib.sha1(repr((SIMULATOR_VERSION, key)).encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """LRU cache with max entries, max total bytes and a time-to-live.
+
+    ``max_entries`` or ``max_bytes`` of 0 disables caching; ``ttl`` of 0 or None
+    means entries never expire. All methods are safe to call from multiple threads.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = 300.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls, prefix: str = 'SIM_CACHE_'):
+        """Create a cache configured by ``SIM_CACHE_MAX_ENTRIES``, ``_MAX_BYTES`` and ``_TTL``."""
+        return cls(
+            max_entries=int(os.environ.get(prefix + 'MAX_ENTRIES', 1024)),
+            max_bytes=int(os.environ.get(prefix + 'MAX_BYTES', 64 * 1024 * 1024)),
+            ttl=float(os.environ.get(prefix + 'TTL', 300.0)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: Hashable):
+        """Return the cached value for ``key`` or None, refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, stored_at = entry
+            if self.ttl and self._clock() - stored_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value, size: int = None) -> None:
+        """Store ``value``; ``size`` defaults to ``len(value)`` (e.g. bytes of a body)."""
+        if not self.enabled:
+            return
+        size = len(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, self._clock())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -0,0 +1,165 @@
+"""Layered (multi-cohort) acquisition model.
+
+``simulator.cohort_projection`` follows one cohort. Here a new cohort is acquired
+every month, either from a marketing budget spent at a fixed CAC or from a
+growth curve of new customers, and every cohort decays independently. With a
+constant churn rate the active base obeys the recurrence
+
+    active[t] = active[t - 1] * (1 - churn) + new[t]
+
+so the whole projection is O(months) instead of summing every cohort every month.
+An arbitrary retention curve ``S[k]`` (share of a cohort still active ``k`` months
+after acquisition) turns the sum into a convolution ``active = new * S``, which is
+evaluated with an FFT in O(months log months).
+
+Every parameter may be a scalar or a 1-D array of configurations; the month loop
+stays in Python and each step updates all configurations at once.
+"""
+from typing import Dict
+
+import numpy as np
+
+from results import LayeredCohortResult
+from retention import survival_table
+from simulator import cac_payback_months, calculate_ltv
+from vectorized import as_column, scenario_count, break_even_months_batch
+
+
+def acquisition_batch(months: int, n: int, new_customers=None, customer_growth=0.0,
+                      marketing_budget=None, budget_growth=0.0, cac=None):
+    """Return ``(new, spend)`` matrices of shape ``(months, n)``.
+
+    Either ``new_customers`` (first-month acquisitions, growing by ``customer_growth``
+    per month) or ``marketing_budget`` (first-month spend, growing by ``budget_growth``,
+    converted at ``cac``) must be given. Spend is ``new * cac`` in the first mode
+    (zero if ``cac`` is omitted).
+    """
+    if (new_customers is None) == (marketing_budget is None):
+        raise ValueError("Give exactly one of new_customers or marketing_budget")
+    steps = np.arange(months, dtype=np.float64)[:, None]
+    if marketing_budget is not None:
+        if cac is None:
+            raise ValueError("marketing_budget requires cac")
+        cac = as_column(cac, np.float64, n)
+        if np.any(cac <= 0):
+            raise ValueError("cac must be > 0")
+        spend = as_column(marketing_budget, np.float64, n) * (1 + as_column(budget_growth, np.float64, n)) ** steps
+        return spend / cac, spend
+    new = as_column(new_customers, np.float64, n) * (1 + as_column(customer_growth, np.float64, n)) ** steps
+    spend = new * as_column(cac, np.float64, n) if cac is not None else np.zeros_like(new)
+    return new, spend
+
+
+def _retention_matrix(retention, months: int, n: int) -> np.ndarray:
+    """Return the survival curve as a ``(months, 1 or n)`` array, zero-padded past its end."""
+    if isinstance(retention, dict):
+        retention = survival_table(retention, months)
+    curve = np.asarray(retention, dtype=np.float64)
+    if curve.ndim == 1:
+        curve = curve[:, None]
+    if curve.ndim != 2 or curve.shape[1] not in (1, n) or curve.shape[0] == 0:
+        raise ValueError("retention must be a 1-D curve or a (length, configs) array")
+    if np.any(curve < 0):
+        raise ValueError("retention values must be >= 0")
+    out = np.zeros((months, curve.shape[1]))
+    length = min(months, curve.shape[0])
+    out[:length] = curve[:length]
+    return out
+
+
+def convolve_retention(new: np.ndarray, retention: np.ndarray) -> np.ndarray:
+    """Active customers ``active[t] = sum_k new[t - k] * retention[k]`` via FFT, per column."""
+    months = new.shape[0]
+    size = 1 << max(2 * months - 1, 1).bit_length()
+    active = np.fft.irfft(np.fft.rfft(new, size, axis=0) * np.fft.rfft(retention, size, axis=0), size, axis=0)
+    # FFT round-off can leave tiny negatives where the exact sum is zero.
+    return np.maximum(active[:months], 0.0)
+
+
+def layered_cohorts_batch(months: int, monthly_margin, monthly_churn=None, new_customers=None,
+                          customer_growth=0.0, marketing_budget=None, budget_growth=0.0, cac=None,
+                          initial_customers=0, retention=None) -> Dict[str, np.ndarray]:
+    """Project many layered-acquisition configurations at once.
+
+    Give ``monthly_churn`` for constant churn (recurrence) or ``retention`` for an
+    arbitrary survival curve (FFT convolution; ``retention[0]`` applies in the month
+    of acquisition). ``retention`` is a list/array of survival values or a curve spec
+    from retention.py. ``initial_customers`` join in month 1 on top of the acquired cohort.
+
+    Returns ``month`` (shape ``(months,)``) and ``new_customers``, ``active_customers``,
+    ``monthly_margin``, ``acquisition_spend``, ``cumulative_margin`` and ``cumulative_net``
+    (margin minus acquisition spend), each of shape ``(months, configs)``.
+    """
+    if (monthly_churn is None) == (retention is None):
+        raise ValueError("Give exactly one of monthly_churn or retention")
+    n = scenario_count(monthly_margin, monthly_churn, new_customers, customer_growth, marketing_budget,
+                        budget_growth, cac, initial_customers)
+    months = max(int(months), 0)
+    new, spend = acquisition_batch(months, n, new_customers, customer_growth, marketing_budget,
+                                   budget_growth, cac)
+    joining = new.copy()
+    if months:
+        joining[0] += as_column(initial_customers, np.float64, n)
+
+    if retention is None:
+        keep = 1 - as_column(monthly_churn, np.float64, n)
+        if np.any(keep < 0) or np.any(keep > 1):
+            raise ValueError("monthly_churn must be between 0 and 1")
+        active = np.empty((months, n))
+        running = np.zeros(n)
+        for m in range(months):
+            running = running * keep + joining[m]
+            active[m] = running
+    else:
+        active = convolve_retention(joining, _retention_matrix(retention, months, n))
+
+    margin = active * as_column(monthly_margin, np.float64, n)
+    cumulative_margin = np.cumsum(margin, axis=0)
+    return {
+        "month": np.arange(1, months + 1, dtype=np.int64),
+        "new_customers": new,
+        "active_customers": active,
+        "monthly_margin": margin,
+        "acquisition_spend": spend,
+        "cumulative_margin": cumulative_margin,
+        "cumulative_net": cumulative_margin - np.cumsum(spend, axis=0),
+    }
+
+
+def unit_economics(monthly_margin: float, cac: float = None, monthly_churn: float = None,
+                   retention=None) -> Dict:
+    """Per-customer LTV, CAC payback and LTV/CAC for one configuration.
+
+    LTV comes from :func:`simulator.calculate_ltv`, using ``retention`` (a curve spec or
+    an empirical list) when given and the constant churn rate otherwise.
+    """
+    if isinstance(retention, np.ndarray):
+        retention = retention.tolist()
+    ltv = calculate_ltv(monthly_margin, monthly_churn, retention=retention)
+    economics = {'ltv': ltv, 'cac': cac, 'cac_payback_months': None, 'ltv_to_cac': None}
+    if cac is not None:
+        economics['cac_payback_months'] = cac_payback_months(cac, monthly_margin)
+        economics['ltv_to_cac'] = ltv / cac if cac > 0 else None
+    return economics
+
+
+def layered_cohort_projection(months: int, monthly_margin: float, monthly_churn: float = None, **kwargs):
+    """Single-configuration :func:`layered_cohorts_batch` as a ``LayeredCohortResult``."""
+    batch = layered_cohorts_batch(months, monthly_margin, monthly_churn, **kwargs)
+    return LayeredCohortResult({name: (values if values.ndim == 1 else values[:, 0])
+                                for name, values in batch.items()})
+
+
+def summarize_layered(batch: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Per-configuration totals: payback month of the whole programme (0 = not reached),
+    final active customers, final cumulative margin and final cumulative net."""
+    if batch['month'].size == 0:
+        zeros = np.zeros(batch['active_customers'].shape[1])
+        return {'payback_month': zeros.astype(np.int64), 'final_active_customers': zeros,
+                'final_cumulative_margin': zeros, 'final_cumulative_net': zeros}
+    return {
+        'payback_month': break_even_months_batch(batch['cumulative_net']),
+        'final_active_customers': batch['active_customers'][-1],
+        'final_cumulative_margin': batch['cumulative_margin'][-1],
+        'final_cumulative_net': batch['cumulative_net'][-1],
+    }
@@ -0,0 +1,187 @@
+"""Columnar file export for simulator results: CSV, NPZ, Arrow IPC and Parquet.
+
+CSV formats every float as text one row at a time, which dominates the cost of
+writing large sweep outputs and makes readers parse it all back. The binary
+formats write each column as one contiguous block instead:
+
+- ``.npz``: NumPy's zip of ``.npy`` arrays, always available. Written
+  uncompressed, so :func:`read_columns` can memory-map every column in place
+  (``mmap=True``) and nothing is read until it is touched.
+- ``.arrow`` / ``.feather``: Arrow IPC file, memory-mappable, zero-copy to NumPy.
+- ``.parquet``: compressed and widely readable, but always decoded on read.
+
+Arrow and Parquet need the optional ``pyarrow`` package (``pip install
+startup-profitability-simulator[arrow]``). NumPy and pyarrow are imported only
+when a binary format is used, so the CSV path stays standard library only.
+"""
+import os
+import struct
+from typing import Dict
+
+from results import ColumnarResult, ProjectionResult, iter_rows
+
+EXTENSION_FORMATS = {
+    '.csv': 'csv',
+    '.npz': 'npz',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.parquet': 'parquet',
+}
+EXPORT_FORMATS = ('csv', 'npz', 'arrow', 'parquet')
+
+# Size of the fixed part of a zip local file header, before the name and extra field.
+_ZIP_LOCAL_HEADER = struct.Struct('<4s5H3I2H')
+
+
+def format_for_path(path, fmt: str = None) -> str:
+    """Return ``fmt`` if given, else the format implied by the file extension."""
+    if fmt is None:
+        fmt = EXTENSION_FORMATS.get(os.path.splitext(str(path))[1].lower())
+        if fmt is None:
+            raise ValueError(f"Cannot infer export format from {path}; use one of "
+                             f"{', '.join(sorted(EXTENSION_FORMATS))}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}; choose one of {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Arrow and Parquet export need pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+# Largest magnitude a float64 holds exactly as an integer; beyond it (or for inf/nan)
+# whole-number columns stay float64 instead of overflowing int64.
+_EXACT_INTEGER = 2 ** 53
+
+
+def _numpy_columns(results: ColumnarResult) -> Dict:
+    """Zero-copy float64 views of each column; whole-number columns converted to int64
+    when every value fits."""
+    import numpy as np
+
+    columns = {}
+    for name in results.fields:
+        values = np.frombuffer(results.column(name), dtype=np.float64)
+        if name in results.int_fields and np.all(np.abs(values) <= _EXACT_INTEGER):
+            values = values.astype(np.int64)
+        columns[name] = values
+    return columns
+
+
+def write_csv(path, results: ColumnarResult) -> None:
+    """Write a projection as CSV, floats with two decimals (the historical format)."""
+    import csv
+
+    fields = ProjectionResult.fields
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for month, units, revenue, variable, profit, cumulative in iter_rows(results, fields):
+            writer.writerow([month, units, f"{revenue:.2f}", f"{variable:.2f}", f"{profit:.2f}", f"{cumulative:.2f}"])
+
+
+def export_result(path, results: ColumnarResult, fmt: str = None) -> str:
+    """Write ``results`` to ``path`` in ``fmt`` (default: from the extension); return the format.
+
+    ``csv`` is only defined for projections; the binary formats take any
+    :class:`~results.ColumnarResult`.
+    """
+    fmt = format_for_path(path, fmt)
+    if fmt == 'csv':
+        write_csv(path, results)
+    elif fmt == 'npz':
+        import numpy as np
+
+        # np.savez appends .npz to names without it; open the file ourselves to keep ``path``.
+        with open(path, 'wb') as f:
+            np.savez(f, **_numpy_columns(results))
+    else:
+        pa = _pyarrow()
+        table = pa.table(_numpy_columns(results))
+        if fmt == 'arrow':
+            with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            import pyarrow.parquet as pq
+            pq.write_table(table, str(path))
+    return fmt
+
+
+def _npz_memmap(path) -> Dict:
+    """Memory-map each array of an uncompressed ``.npz`` in place."""
+    import zipfile
+
+    import numpy as np
+    from numpy.lib import format as npy_format
+
+    columns = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as raw:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path} is compressed; memory mapping needs an uncompressed .npz")
+            raw.seek(info.header_offset)
+            header = _ZIP_LOCAL_HEADER.unpack(raw.read(_ZIP_LOCAL_HEADER.size))
+            name_length, extra_length = header[-2:]
+            raw.seek(info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length)
+            version = npy_format.read_magic(raw)
+            if version == (1, 0):
+                shape, fortran_order, dtype = npy_format.read_array_header_1_0(raw)
+            else:
+                shape, fortran_order, dtype = npy_format.read_array_header_2_0(raw)
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if 0 in shape:
+                columns[name] = np.empty(shape, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode='r', shape=shape, offset=raw.tell(),
+                                          order='F' if fortran_order else 'C')
+    return columns
+
+
+def read_columns(path, fmt: str = None, mmap: bool = False) -> Dict:
+    """Read an exported file back as ``{column: numpy array}``.
+
+    With ``mmap=True`` NPZ and Arrow columns are memory-mapped views of the file
+    rather than copies (Parquet is always decoded; CSV always parsed).
+    """
+    import numpy as np
+
+    fmt = format_for_path(path, fmt)
+    if fmt == 'csv':
+        import csv
+
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            values = np.array(list(reader), dtype=np.float64).reshape(-1, len(header))
+        return {name: values[:, i] for i, name in enumerate(header)}
+    if fmt == 'npz':
+        if mmap:
+            return _npz_memmap(path)
+        with np.load(path) as archive:
+            return {name: archive[name] for name in archive.files}
+    pa = _pyarrow()
+    if fmt == 'arrow':
+        source = pa.memory_map(str(path), 'r') if mmap else pa.OSFile(str(path), 'rb')
+        table = pa.ipc.open_file(source).read_all()
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(str(path), memory_map=mmap)
+    return {name: table.column(name).to_numpy() for name in table.column_names}
+
+
+def read_result(path, cls=ProjectionResult, fmt: str = None):
+    """Load an exported file into a ``cls`` result; raises ValueError if a column is missing."""
+    import numpy as np
+
+    columns = read_columns(path, fmt)
+    missing = [name for name in cls.fields if name not in columns]
+    if missing:
+        raise ValueError(f"{path} lacks columns: {', '.join(missing)}")
+    result = cls()
+    for name in cls.fields:
+        result.column(name).frombytes(np.ascontiguousarray(columns[name], dtype=np.float64).tobytes())
+    return result
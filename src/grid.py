@@ -0,0 +1,178 @@
+"""N-dimensional grid sensitivity sweeps.
+
+Where ``simulator.sensitivity_analysis`` varies one parameter across five points,
+a grid sweep takes any subset of the projection parameters, each with its own list
+of values, and evaluates every combination. Chunks of the grid are evaluated with
+the vectorized engine and fanned out to a process pool; ``iter_grid_sensitivity``
+yields chunks as they complete, ``iter_grid_rows`` flattens them into one row per
+grid point for streaming, and ``grid_sensitivity`` assembles them into a
+heatmap/tornado-ready structure.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from vectorized import summarize_batch
+
+GRID_PARAMETERS = ('fixed_costs', 'price', 'variable_cost', 'initial_sales', 'monthly_growth')
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def grid_axis(spec) -> List[float]:
+    """Expand an axis spec into its list of values.
+
+    ``spec`` is either an explicit list of values or a dict ``{"min", "max", "steps"}``
+    describing evenly spaced points (inclusive of both ends).
+    """
+    if isinstance(spec, dict):
+        steps = int(spec.get('steps', 5))
+        if steps < 1:
+            raise ValueError("Axis steps must be >= 1")
+        return np.linspace(float(spec['min']), float(spec['max']), steps).tolist()
+    values = [float(v) for v in spec]
+    if not values:
+        raise ValueError("Axis must contain at least one value")
+    return values
+
+
+def normalize_axes(axes: Dict, max_points: int = None) -> Dict[str, List[float]]:
+    """Validate parameter names and expand every axis spec (insertion order is kept).
+
+    If ``max_points`` is given, the grid size is checked before any axis is expanded.
+    """
+    if not axes:
+        raise ValueError("At least one axis is required")
+    points = 1
+    for name, spec in axes.items():
+        if name not in GRID_PARAMETERS:
+            raise ValueError(f"Unknown parameter: {name}")
+        points *= int(spec.get('steps', 5)) if isinstance(spec, dict) else len(spec)
+    if max_points is not None and points > max_points:
+        raise ValueError(f"Grid has {points} points; the limit is {max_points}")
+    return {name: grid_axis(spec) for name, spec in axes.items()}
+
+
+def grid_size(axes: Dict[str, Sequence[float]]) -> int:
+    """Number of grid points for already-normalized axes."""
+    size = 1
+    for values in axes.values():
+        size *= len(values)
+    return size
+
+
+def _evaluate_chunk(base: Dict, axes: Dict[str, List[float]], months: int, start: int,
+                    stop: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    shape = tuple(len(v) for v in axes.values())
+    index = np.unravel_index(np.arange(start, stop), shape)
+    params = {name: base[name] for name in GRID_PARAMETERS}
+    for (name, values), idx in zip(axes.items(), index):
+        params[name] = np.asarray(values)[idx]
+    if 'initial_sales' in axes:
+        params['initial_sales'] = params['initial_sales'].astype(np.int64)
+    bem, final = summarize_batch(params['fixed_costs'], params['price'], params['variable_cost'],
+                                 params['initial_sales'], params['monthly_growth'], months)
+    return start, bem, final
+
+
+def iter_grid_sensitivity(base: Dict, axes: Dict[str, List[float]], months: int, max_workers: int = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          executor=None) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """Yield ``(start, break_even_month, final_cumulative_profit)`` chunks as they complete.
+
+    ``start`` is the flat (C-order) grid index of the first point in the chunk. Grids
+    that fit in a single chunk are evaluated inline; larger grids go to ``executor``
+    if given, otherwise to a new ``ProcessPoolExecutor(max_workers)``. Chunks may
+    arrive out of order.
+    """
+    total = grid_size(axes)
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+    if len(bounds) <= 1 or max_workers == 1:
+        for start, stop in bounds:
+            yield _evaluate_chunk(base, axes, months, start, stop)
+        return
+
+    owned = executor is None
+    pool = ProcessPoolExecutor(max_workers=max_workers) if owned else executor
+    try:
+        futures = [pool.submit(_evaluate_chunk, base, axes, months, start, stop) for start, stop in bounds]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        if owned:
+            pool.shutdown(cancel_futures=True)
+
+
+def grid_row_fields(axes: Dict[str, Sequence[float]]) -> Tuple[str, ...]:
+    """Field names of the rows yielded by :func:`iter_grid_rows`."""
+    return ('index',) + tuple(axes) + ('break_even_month', 'final_cumulative_profit')
+
+
+def iter_grid_rows(base: Dict, axes: Dict[str, List[float]], months: int, max_workers: int = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, executor=None) -> Iterator[tuple]:
+    """Yield one row per grid point, in ``grid_row_fields(axes)`` order, as chunks complete.
+
+    ``index`` is the flat (C-order) grid index, so rows of different chunks may
+    arrive out of order.
+    """
+    shape = tuple(len(v) for v in axes.values())
+    values = [np.asarray(v) for v in axes.values()]
+    for start, bem, final in iter_grid_sensitivity(base, axes, months, max_workers, chunk_size, executor):
+        flat = np.arange(start, start + len(bem))
+        coords = [axis[idx].tolist() for axis, idx in zip(values, np.unravel_index(flat, shape))]
+        yield from zip(flat.tolist(), *coords, bem.tolist(), final.tolist())
+
+
+def _tornado(base: Dict, axes: Dict[str, List[float]], final: np.ndarray) -> List[Dict]:
+    """Swing of final profit along each axis with the other axes held nearest their base value."""
+    anchor = [int(np.argmin(np.abs(np.asarray(values) - base[name]))) for name, values in axes.items()]
+    bars = []
+    for dim, (name, values) in enumerate(axes.items()):
+        index = list(anchor)
+        index[dim] = slice(None)
+        line = final[tuple(index)]
+        bars.append({
+            'parameter': name,
+            'low_value': values[0],
+            'high_value': values[-1],
+            'final_profit_at_low': float(line[0]),
+            'final_profit_at_high': float(line[-1]),
+            'swing': float(line.max() - line.min()),
+        })
+    bars.sort(key=lambda bar: bar['swing'], reverse=True)
+    return bars
+
+
+def grid_sensitivity(base: Dict, axes: Dict, months: int, max_workers: int = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, executor=None) -> Dict:
+    """Evaluate every combination of ``axes`` around ``base`` parameters.
+
+    Parameters:
+    - base: dict with fixed_costs, price, variable_cost, initial_sales, monthly_growth
+    - axes: {parameter: [values] or {"min", "max", "steps"}}, one entry per grid dimension
+    - months: projection horizon for every point
+
+    Returns a dict with ``axes`` (expanded values), ``shape``, nested N-D lists
+    ``break_even_month`` and ``final_cumulative_profit`` indexed in axis order (ready
+    for a heatmap), and ``tornado``, the per-parameter swing of final profit sorted
+    largest first.
+    """
+    axes = normalize_axes(axes)
+    shape = tuple(len(v) for v in axes.values())
+    total = grid_size(axes)
+    break_even = np.zeros(total, dtype=np.int64)
+    final = np.zeros(total, dtype=np.float64)
+    for start, bem, profit in iter_grid_sensitivity(base, axes, months, max_workers, chunk_size, executor):
+        break_even[start:start + len(bem)] = bem
+        final[start:start + len(profit)] = profit
+
+    break_even = break_even.reshape(shape)
+    final = final.reshape(shape)
+    return {
+        'axes': axes,
+        'shape': list(shape),
+        'months': months,
+        'break_even_month': break_even.tolist(),
+        'final_cumulative_profit': final.tolist(),
+        'tornado': _tornado(base, axes, final),
+    }
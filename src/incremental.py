@@ -0,0 +1,174 @@
+"""Incremental re-simulation of a projection when a few parameters change.
+
+A user tweaking one field of the simulator form resubmits the other five
+unchanged, but ``project_months`` recomputes every month. :func:`patch_projection`
+takes the previous result and only recomputes the columns and months that
+depend on the change:
+
+- ``fixed_costs`` only shifts ``cumulative_profit``: units, revenue, costs and
+  profit are copied and the running sum is redone.
+- ``price`` / ``variable_cost`` leave units untouched, so the units column is
+  reused and only the money columns are recomputed.
+- ``monthly_growth`` / ``initial_sales`` change units, so those are stepped again.
+- ``months`` alone extends the projection from its last month or truncates it.
+
+With ``from_month=k`` the new values apply from month ``k`` on: months before
+``k`` are copied as they are and months from ``k`` continue from month ``k-1``
+(a fixed-cost change then moves cumulative profit from month ``k``).
+``initial_sales`` can only change from month 1. With ``from_month=1`` the patched
+result is identical, bit for bit, to ``project_months`` with the new parameters:
+it uses the same per-month arithmetic in the same order.
+
+After a patch from a later month the flat parameters no longer describe every
+month, so a chain of patches carries *segments* as well: for each parameter, the
+``(from_month, value)`` pairs in effect over the horizon (:func:`param_segments`,
+:func:`patch_segments`). A parameter counts as changed when any value it takes
+from ``from_month`` on differs from the new one, so repeating a value that so
+far only applied to later months still recomputes the earlier ones.
+"""
+from array import array
+from itertools import accumulate
+from typing import Dict, Optional, Tuple
+
+from precompute import PROJECTION_PARAMETERS, projection_args
+from results import ProjectionResult
+
+# Changes that alter the units column; anything else reuses it.
+_UNIT_PARAMETERS = frozenset({'initial_sales', 'monthly_growth'})
+# Changes that alter revenue, variable costs and profit.
+_FLOW_PARAMETERS = _UNIT_PARAMETERS | {'price', 'variable_cost'}
+# Per-month inputs; ``months`` is the horizon, not a value over it.
+_MONTHLY_PARAMETERS = tuple(name for name in PROJECTION_PARAMETERS if name != 'months')
+
+# Parameter name -> ((from_month, value), ...), sorted by month, starting at month 1.
+Segments = Dict[str, Tuple[Tuple[int, float], ...]]
+
+
+def merge_params(params: Dict, changes: Dict) -> Dict:
+    """Return ``params`` updated with ``changes``, normalized like ``project_months`` arguments.
+
+    Raises ValueError for unknown parameter names.
+    """
+    unknown = sorted(set(changes) - set(PROJECTION_PARAMETERS))
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(unknown)}; "
+                         f"choose from {', '.join(PROJECTION_PARAMETERS)}")
+    return dict(zip(PROJECTION_PARAMETERS, projection_args(dict(params, **changes))))
+
+
+def param_segments(params: Dict) -> Segments:
+    """Segments for a projection that uses ``params`` in every month."""
+    return {name: ((1, params[name]),) for name in _MONTHLY_PARAMETERS}
+
+
+def patch_segments(segments: Segments, new_params: Dict, from_month: int = 1) -> Segments:
+    """Return ``segments`` with ``new_params`` in effect from ``from_month`` on."""
+    patched = {}
+    for name in _MONTHLY_PARAMETERS:
+        kept = tuple(segment for segment in segments[name] if segment[0] < from_month)
+        if not kept or kept[-1][1] != new_params[name]:
+            kept += ((from_month, new_params[name]),)
+        patched[name] = kept
+    return patched
+
+
+def _value_at(segments, month: int):
+    return [value for start, value in segments if start <= month][-1]
+
+
+def _values_from(segments, month: int) -> set:
+    """Values a parameter takes in month ``month`` and later."""
+    return {_value_at(segments, month)} | {value for start, value in segments if start > month}
+
+
+def changed_parameters(params: Dict, new_params: Dict, segments: Optional[Segments] = None,
+                       from_month: int = 1) -> set:
+    """Names of the per-month inputs (everything but ``months``) that differ from month ``from_month`` on.
+
+    Without ``segments``, ``params`` is taken to hold in every month.
+    """
+    segments = segments or param_segments(params)
+    return {name for name in _MONTHLY_PARAMETERS
+            if _values_from(segments[name], from_month) != {new_params[name]}}
+
+
+def recompute_from(results: ProjectionResult, params: Dict, new_params: Dict, from_month: int = 1,
+                   segments: Optional[Segments] = None) -> int:
+    """Return the 0-based index of the first month :func:`patch_projection` recomputes.
+
+    Months before it are copied from ``results``; equals ``len(results)`` when only
+    ``months`` grows, and the new horizon when it shrinks.
+    """
+    if new_params['months'] < 0:
+        raise ValueError("months must be non-negative")
+    if not 1 <= from_month <= len(results) + 1:
+        raise ValueError(f"from_month must be between 1 and {len(results) + 1}")
+    changed = changed_parameters(params, new_params, segments, from_month)
+    if 'initial_sales' in changed and from_month != 1:
+        raise ValueError("initial_sales can only change from month 1")
+    start = from_month - 1 if changed else len(results)
+    return min(start, new_params['months'])
+
+
+def patch_projection(results: ProjectionResult, params: Dict, changes: Dict, from_month: int = 1,
+                     segments: Optional[Segments] = None) -> Tuple[ProjectionResult, Dict, int]:
+    """Apply ``changes`` to the projection ``results`` computed from ``params``.
+
+    ``params`` and ``changes`` are dicts keyed by ``project_months`` argument names
+    (``changes`` may name any subset). ``segments`` describes ``results`` when
+    earlier patches started after month 1 (see :func:`patch_segments`). Returns
+    ``(patched, new_params, start)`` where ``start`` is :func:`recompute_from`.
+    """
+    params = merge_params(params, {})
+    new_params = merge_params(params, changes)
+    if len(results) != params['months']:
+        raise ValueError(f"results has {len(results)} months but params say {params['months']}")
+    segments = segments or param_segments(params)
+    start = recompute_from(results, params, new_params, from_month, segments)
+    months = new_params['months']
+    changed = changed_parameters(params, new_params, segments, from_month)
+    previous = {name: results.column(name) for name in ProjectionResult.fields}
+
+    # Months [start, reused) exist in ``results``; [reused, months) are new.
+    reused = min(len(results), months)
+    price, variable_cost, growth = new_params['price'], new_params['variable_cost'], new_params['monthly_growth']
+
+    if changed & _UNIT_PARAMETERS:
+        units = array('d')
+    else:
+        units = previous['units'][start:reused]
+    unit = units[-1] if units else (previous['units'][start - 1] if start else None)
+    for m in range(start + len(units), months):
+        unit = new_params['initial_sales'] if m == 0 else int(unit * (1 + growth))
+        units.append(unit)
+
+    if changed & _FLOW_PARAMETERS:
+        tail_units = units
+        revenue, variable, profit = array('d'), array('d'), array('d')
+    else:
+        revenue = previous['revenue'][start:reused]
+        variable = previous['variable_costs'][start:reused]
+        profit = previous['profit'][start:reused]
+        tail_units = units[len(profit):]
+    tail_revenue = [u * price for u in tail_units]
+    tail_variable = [u * variable_cost for u in tail_units]
+    revenue.extend(tail_revenue)
+    variable.extend(tail_variable)
+    profit.extend([r - v for r, v in zip(tail_revenue, tail_variable)])
+
+    if start:
+        fixed_costs = _value_at(segments['fixed_costs'], start)
+        opening = previous['cumulative_profit'][start - 1] - (new_params['fixed_costs'] - fixed_costs)
+    else:
+        opening = -new_params['fixed_costs']
+    cumulative = accumulate(profit, initial=opening)
+    next(cumulative)
+
+    return ProjectionResult({
+        'month': previous['month'][:start] + array('d', range(start + 1, months + 1)),
+        'units': previous['units'][:start] + units,
+        'revenue': previous['revenue'][:start] + revenue,
+        'variable_costs': previous['variable_costs'][:start] + variable,
+        'profit': previous['profit'][:start] + profit,
+        'cumulative_profit': previous['cumulative_profit'][:start] + array('d', cumulative),
+    }), new_params, start
@@ -0,0 +1,216 @@
+"""Opt-in timing instrumentation and per-request profiling.
+
+Stages are timed with :func:`timed` (context manager) or :func:`instrument`
+(decorator) and aggregated into fixed-bucket histograms, which ``/metrics``
+exposes in the Prometheus text format. Web requests are timed per endpoint by
+the hooks :func:`init_app` installs.
+
+Everything is off unless ``SIM_METRICS=1`` is set or :func:`enable` is called;
+while disabled a decorated function costs one flag check and one extra call, and
+``timed`` returns a shared no-op context (see benchmarks/bench_instrumentation.py).
+
+``?profile=1`` on any request returns a cProfile summary of that request instead
+of its normal response. It is allowed when ``SIM_PROFILING=1`` is set or
+``app.config['ALLOW_PROFILING']`` is true.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Tuple
+
+# Upper bounds in seconds (Prometheus ``le`` labels); +Inf is implicit.
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_METRIC = 'simulator_stage_seconds'
+REQUEST_METRIC = 'simulator_request_seconds'
+PROFILE_LINES = 30
+
+_enabled = os.environ.get('SIM_METRICS', '').lower() in ('1', 'true', 'yes')
+_NOOP = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds (thread-safe)."""
+
+    __slots__ = ('counts', 'total', 'count', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self) -> Tuple[list, float, int]:
+        with self._lock:
+            return list(self.counts), self.total, self.count
+
+
+_histograms: Dict[Tuple[str, str, str], Histogram] = {}
+_registry_lock = threading.Lock()
+
+
+def enable(on: bool = True) -> None:
+    """Turn stage and request timing on or off for the whole process."""
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Drop every recorded observation."""
+    with _registry_lock:
+        _histograms.clear()
+
+
+def observe(metric: str, label: str, value: str, seconds: float) -> None:
+    """Record one duration for ``metric{label="value"}``."""
+    key = (metric, label, value)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.setdefault(key, Histogram())
+    histogram.observe(seconds)
+
+
+@contextmanager
+def _timing(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(STAGE_METRIC, 'stage', stage, time.perf_counter() - started)
+
+
+def timed(stage: str):
+    """Context manager timing the enclosed block as ``stage`` (no-op when disabled)."""
+    return _timing(stage) if _enabled else _NOOP
+
+
+def _timing_iter(stage: str, iterable):
+    elapsed = 0.0
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            break
+        finally:
+            elapsed += time.perf_counter() - started
+        yield item
+    observe(STAGE_METRIC, 'stage', stage, elapsed)
+
+
+def timed_iter(stage: str, iterable):
+    """Iterate ``iterable``, timing as ``stage`` only the time spent producing its items.
+
+    Unlike ``with timed(stage): yield from ...`` this leaves out the time the consumer
+    spends between items, e.g. a WSGI server writing a streamed chunk to the client.
+    """
+    return _timing_iter(stage, iterable) if _enabled else iterable
+
+
+def instrument(stage: str = None):
+    """Decorator timing every call of the function as ``stage`` (default: its name)."""
+    def decorate(fn):
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(STAGE_METRIC, 'stage', name, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def render_prometheus() -> str:
+    """Return all histograms in the Prometheus text exposition format (0.0.4)."""
+    help_text = {
+        STAGE_METRIC: 'Time spent in an instrumented simulator or handler stage.',
+        REQUEST_METRIC: 'Time to handle a web/API request, by endpoint.',
+    }
+    with _registry_lock:
+        items = sorted(_histograms.items())
+    lines = []
+    seen = set()
+    for (metric, label, value), histogram in items:
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f'# HELP {metric} {help_text.get(metric, metric)}')
+            lines.append(f'# TYPE {metric} histogram')
+        counts, total, count = histogram.snapshot()
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+        running = 0
+        for bound, bucket_count in zip(BUCKETS + (float('inf'),), counts):
+            running += bucket_count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{metric}_bucket{{{label}="{escaped}",le="{le}"}} {running}')
+        lines.append(f'{metric}_sum{{{label}="{escaped}"}} {total!r}')
+        lines.append(f'{metric}_count{{{label}="{escaped}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def profile_summary(profiler, limit: int = PROFILE_LINES) -> str:
+    """Top ``limit`` functions of a finished ``cProfile.Profile``, sorted by cumulative time."""
+    import io
+    import pstats
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+def init_app(app) -> None:
+    """Install request timing, ``?profile=1`` and the ``/metrics`` endpoint on a Flask app."""
+    import cProfile
+    from flask import Response, g, request
+
+    profiling_env = os.environ.get('SIM_PROFILING', '').lower() in ('1', 'true', 'yes')
+
+    @app.before_request
+    def _start_instrumentation():
+        if request.args.get('profile') == '1' and (profiling_env or app.config.get('ALLOW_PROFILING')):
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+        if _enabled:
+            g._request_started = time.perf_counter()
+
+    @app.after_request
+    def _finish_instrumentation(response):
+        started = g.pop('_request_started', None)
+        if started is not None:
+            endpoint = request.endpoint or 'unknown'
+            if response.is_streamed:
+                # Count the time to generate the body, which happens after this hook.
+                response.call_on_close(
+                    lambda: observe(REQUEST_METRIC, 'endpoint', endpoint, time.perf_counter() - started))
+            else:
+                observe(REQUEST_METRIC, 'endpoint', endpoint, time.perf_counter() - started)
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return response
+        # Streamed bodies are generated after this hook; drain them so they are profiled too.
+        response.get_data()
+        profiler.disable()
+        return Response(profile_summary(profiler), mimetype='text/plain')
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
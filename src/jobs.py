@@ -0,0 +1,153 @@
+"""Run heterogeneous simulator jobs in one call.
+
+Each job is a dict ``{"id": ..., "type": ..., "params": {...}}`` where ``type`` is
+one of :data:`JOB_TYPES`. Parameters use the same names and defaults as the
+matching ``/api`` endpoint. Jobs run on a process pool, since the simulations are
+pure Python and CPU-bound; a failing job produces an error entry instead of failing
+the batch, and every entry reports its own timing.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List
+
+from precompute import projection_args
+from simulator import (break_even_month, cohort_projection, project_months, sensitivity_analysis,
+                       solve_break_even_month)
+
+FLAG_TRUE = ('1', 'true', 'yes')
+
+
+def parse_flag(value) -> bool:
+    """Read a boolean parameter: JSON true, or 1/true/yes in any case, as the API query flags."""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in FLAG_TRUE
+
+
+def run_project(params: Dict) -> Dict:
+    results = project_months(*projection_args(params))
+    return {
+        'results': results.to_records(),
+        'break_even_month': break_even_month(results),
+        'final_cumulative_profit': results.column('cumulative_profit')[-1] if results else 0,
+    }
+
+
+def run_cohort(params: Dict) -> Dict:
+    results = cohort_projection(
+        int(params.get('initial_customers', 100)),
+        float(params.get('monthly_margin', 5.0)),
+        float(params.get('monthly_churn', 0.1)),
+        int(params.get('months', 12)),
+    )
+    return {
+        'results': results.to_records(),
+        'final_cumulative_margin': results.column('cumulative_margin')[-1] if results else 0,
+    }
+
+
+def run_sensitivity(params: Dict) -> Dict:
+    parameter = params.get('parameter', 'price')
+    variation = float(params.get('variation', 0.2))
+    return {
+        'parameter': parameter,
+        'variation_range': variation,
+        'results': sensitivity_analysis(*projection_args(params), parameter, variation,
+                                        break_even_only=parse_flag(params.get('break_even_only', False))),
+    }
+
+
+def run_break_even(params: Dict) -> Dict:
+    horizon = int(params['months']) if params.get('months') is not None else None
+    return {
+        'break_even_month': solve_break_even_month(*projection_args(params)[:5], horizon),
+        'months': horizon,
+    }
+
+
+JOB_TYPES = {
+    'project': run_project,
+    'cohort': run_cohort,
+    'sensitivity': run_sensitivity,
+    'break_even': run_break_even,
+}
+
+
+def job_months(job) -> int:
+    """Months of projection ``job`` evaluates (a sensitivity job runs five), 0 if unknown.
+
+    Used to bound a batch before it runs; break-even jobs are solved without a series.
+    """
+    if not isinstance(job, dict) or not isinstance(job.get('params') or {}, dict):
+        return 0
+    if job.get('type') not in ('project', 'cohort', 'sensitivity'):
+        return 0
+    try:
+        months = max(int((job.get('params') or {}).get('months', 12)), 0)
+    except (TypeError, ValueError):
+        return 0
+    return months * 5 if job['type'] == 'sensitivity' else months
+
+
+def _error_entry(job, index: int, message: str) -> Dict:
+    entry = {'id': job.get('id', index) if isinstance(job, dict) else index}
+    if isinstance(job, dict):
+        entry['type'] = job.get('type')
+    entry.update(status='error', message=message, time_ms=0.0)
+    return entry
+
+
+def run_job(job: Dict, index: int = 0) -> Dict:
+    """Run one job and return its result entry; never raises for bad input."""
+    started = time.perf_counter()
+    job_id = job.get('id', index) if isinstance(job, dict) else index
+    entry = {'id': job_id}
+    try:
+        if not isinstance(job, dict):
+            raise ValueError("Job must be an object")
+        job_type = job.get('type')
+        entry['type'] = job_type
+        runner = JOB_TYPES.get(job_type)
+        if runner is None:
+            raise ValueError(f"Unknown job type: {job_type}")
+        params = job.get('params') or {}
+        if not isinstance(params, dict):
+            raise ValueError("Job params must be an object")
+        entry['data'] = runner(params)
+        entry['status'] = 'success'
+    except Exception as e:  # isolate every job: one bad entry must not fail the batch
+        entry['status'] = 'error'
+        entry['message'] = str(e)
+    entry['time_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return entry
+
+
+def _map_jobs(pool, jobs: List[Dict], workers: int) -> List[Dict]:
+    # About four chunks per worker: small jobs amortize the round trip, and a slow
+    # chunk still leaves the others to balance the load.
+    chunksize = max(1, len(jobs) // (workers * 4))
+    entries = []
+    try:
+        for entry in pool.map(run_job, jobs, range(len(jobs)), chunksize=chunksize):
+            entries.append(entry)
+    except BrokenProcessPool as e:
+        message = f"Worker process died: {e}"
+        entries.extend([_error_entry(job, i, message) for i, job in enumerate(jobs)][len(entries):])
+    return entries
+
+
+def run_jobs(jobs: List[Dict], max_workers: int = None, executor=None) -> List[Dict]:
+    """Run ``jobs`` on a process pool and return their entries in input order.
+
+    Uses ``executor`` if given (e.g. ``workers.process_pool()``), otherwise a temporary
+    ``ProcessPoolExecutor(max_workers)``. A single job runs inline. Jobs are sent to
+    the workers in chunks; if a worker dies, the jobs without a result get error entries.
+    """
+    if len(jobs) <= 1 or max_workers == 1:
+        return [run_job(job, i) for i, job in enumerate(jobs)]
+    if executor is not None:
+        return _map_jobs(executor, jobs, getattr(executor, '_max_workers', None) or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return _map_jobs(pool, jobs, pool._max_workers)
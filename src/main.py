@@ -1,18 +1,55 @@
-"""CLI entry point for the Startup Profitability & Break-Even Simulator."""
+"""CLI entry point for the Startup Profitability & Break-Even Simulator.
+
+Startup time matters here (batch jobs call the CLI in shell loops), so only the
+standard-library projection path is imported up front. Feature modules that pull
+in NumPy (``--monte-carlo``) or the solver are imported when selected, and Flask
+and matplotlib are never imported. ``benchmarks/bench_startup.py`` and
+``tests/test_startup.py`` hold the import-time budget.
+"""
+import time
+
+_STARTED = time.perf_counter()
+
 import argparse
-import csv
-from pathlib import Path
+import os
 import sys
+from contextlib import contextmanager
 
 # make sure relative imports work when running from project root
-ROOT = Path(__file__).resolve().parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+ROOT = os.path.dirname(os.path.abspath(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 from simulator import break_even_units, project_months, break_even_month
+from results import ProjectionResult
+from export import EXTENSION_FORMATS, export_result, write_csv
+
+CSV_FIELDS = ProjectionResult.fields
+
+_IMPORTED = time.perf_counter()
+
+
+@contextmanager
+def _phase(timings, name):
+    """Add the time spent in the block to ``timings[name]`` (no-op if ``timings`` is None)."""
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def print_timings(timings):
+    """Report phase durations on stderr, so stdout stays parseable."""
+    parts = ', '.join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items())
+    total = time.perf_counter() - _STARTED
+    print(f"timings: {parts}, total {total * 1000:.1f} ms (excluding interpreter startup)", file=sys.stderr)
 
 
-def parse_args():
+def parse_args(argv=None):
     p = argparse.ArgumentParser(description="Startup profitability & break-even simulator")
     p.add_argument("--fixed-costs", type=float, required=True, help="Total fixed costs (e.g., monthly)")
     p.add_argument("--price", type=float, required=True, help="Price per unit")
@@ -21,7 +58,26 @@ def parse_args():
     p.add_argument("--monthly-growth", type=float, default=0.0, help="Monthly sales growth rate (e.g., 0.05)")
     p.add_argument("--months", type=int, default=12, help="Number of months to project")
     p.add_argument("--export-csv", type=str, default="", help="Optional path to export the projection CSV")
-    return p.parse_args()
+    p.add_argument("--export", type=str, default="",
+                   help="Optional path to export the projection; format from the extension "
+                        f"({', '.join(sorted(EXTENSION_FORMATS))}). Arrow/Parquet need pyarrow")
+    p.add_argument("--monte-carlo", type=int, default=0, metavar="N",
+                   help="Run N stochastic trials and report P5/P50/P95 cumulative profit bands")
+    p.add_argument("--seed", type=int, default=None, help="Random seed for --monte-carlo")
+    p.add_argument("--mc-spread", type=float, default=0.1,
+                   help="Relative std of the normal distributions used for price, variable cost, "
+                        "initial sales and growth in --monte-carlo (default 0.1)")
+    p.add_argument("--mc-config", type=str, default="",
+                   help="JSON file of distribution specs per parameter, overriding --mc-spread")
+    p.add_argument("--solve-for", type=str, default="",
+                   choices=["", "price", "variable_cost", "initial_sales", "monthly_growth"],
+                   help="Goal seek: find the price/initial sales/growth needed (or the highest variable cost "
+                        "allowed) to break even by --months, or to reach --target-profit")
+    p.add_argument("--target-profit", type=float, default=None,
+                   help="With --solve-for: cumulative profit to reach at --months instead of break-even")
+    p.add_argument("--timings", action="store_true",
+                   help="Report import, compute and output time on stderr")
+    return p.parse_args(argv)
 
 
 def print_summary(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, results):
@@ -45,18 +101,70 @@ def print_summary(fixed_costs, price, variable_cost, initial_sales, monthly_grow
         print("No break-even within projection window")
 
 
+def run_monte_carlo(args, timings=None):
+    with _phase(timings, "feature imports"):
+        import json
+        from montecarlo import monte_carlo_projection
+
+    specs = {"fixed_costs": args.fixed_costs}
+    for name in ("price", "variable_cost", "initial_sales", "monthly_growth"):
+        value = getattr(args, name)
+        specs[name] = {"dist": "normal", "mean": value, "std": abs(value) * args.mc_spread}
+    if args.mc_config:
+        with open(args.mc_config) as f:
+            specs.update(json.load(f))
+    with _phase(timings, "compute"):
+        summary = monte_carlo_projection(specs["fixed_costs"], specs["price"], specs["variable_cost"],
+                                         specs["initial_sales"], specs["monthly_growth"], args.months,
+                                         trials=args.monte_carlo, seed=args.seed)
+    histogram = summary["break_even_histogram"]
+    print(f"\n--- Monte Carlo ({summary['trials']} trials, seed {summary['seed']}) ---")
+    print(f"Probability of break-even within {args.months} months: {summary['break_even_probability']:.1%}")
+    reached = sum(histogram[1:])
+    if reached:
+        running = 0
+        for month, count in enumerate(histogram[1:], start=1):
+            running += count
+            if running * 2 >= reached:
+                print(f"Median break-even month (trials that break even): {month}")
+                break
+    print(f"Mean final cumulative profit: {summary['mean_final_cumulative_profit']:.2f}")
+    bands = summary["percentiles"]
+    print("\nMonth | P5 cumulative | P50 cumulative | P95 cumulative")
+    for m in range(args.months):
+        print(f"{m + 1:>5} | {bands['p5'][m]:>13.2f} | {bands['p50'][m]:>14.2f} | {bands['p95'][m]:>14.2f}")
+
+
+def run_solver(args, timings=None):
+    with _phase(timings, "feature imports"):
+        from solver import solve_for
+
+    with _phase(timings, "compute"):
+        result = solve_for(args.solve_for, args.fixed_costs, args.price, args.variable_cost, args.initial_sales,
+                           args.monthly_growth, args.months, target_profit=args.target_profit)
+    goal = (f"break even by month {args.months}" if args.target_profit is None
+            else f"reach {args.target_profit:.2f} cumulative profit by month {args.months}")
+    bound = "Highest" if args.solve_for == "variable_cost" else "Lowest"
+    print(f"\n--- Solve for {args.solve_for} ({goal}) ---")
+    if result["unbounded"]:
+        print(f"Any {args.solve_for} meets the goal")
+    elif not result["feasible"]:
+        print(f"No {args.solve_for} meets the goal with the other inputs unchanged")
+    else:
+        print(f"{bound} {args.solve_for}: {result['value']:.6g}")
+        print(f"Break-even month: {result['break_even_month'] or 'not reached'}")
+        print(f"Final cumulative profit: {result['final_cumulative_profit']:.2f}")
+    print(f"Evaluations: {result['evaluations']}")
+
+
 def export_csv(path: str, results):
-    path_obj = Path(path)
-    with path_obj.open("w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["month", "units", "revenue", "variable_costs", "profit", "cumulative_profit"])
-        for r in results:
-            writer.writerow([r["month"], r["units"], f"{r['revenue']:.2f}", f"{r['variable_costs']:.2f}", f"{r['profit']:.2f}", f"{r['cumulative_profit']:.2f}"])
+    write_csv(path, results)
     print(f"Exported projection to {path}")
 
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
+    timings = {"imports": _IMPORTED - _STARTED} if args.timings else None
     # Basic input validation
     if args.fixed_costs < 0:
         print("fixed-costs must be non-negative")
@@ -70,14 +178,33 @@ def main():
     if args.monthly_growth < -1:
         print("monthly-growth must be >= -1")
         raise SystemExit(2)
-    results = project_months(args.fixed_costs, args.price, args.variable_cost, args.initial_sales,
-                             args.monthly_growth, args.months)
-    print_summary(args.fixed_costs, args.price, args.variable_cost, args.initial_sales, args.monthly_growth, args.months, results)
-    print("\nMonth | Units | Revenue | Variable | Profit | Cumulative")
-    for r in results:
-        print(f"{r['month']:>3} | {r['units']:>5} | {r['revenue']:>7.2f} | {r['variable_costs']:>8.2f} | {r['profit']:>7.2f} | {r['cumulative_profit']:>10.2f}")
-    if args.export_csv:
-        export_csv(args.export_csv, results)
+    if args.monte_carlo < 0:
+        print("monte-carlo must be a positive number of trials")
+        raise SystemExit(2)
+    if args.monte_carlo:
+        run_monte_carlo(args, timings)
+    elif args.solve_for:
+        run_solver(args, timings)
+    else:
+        with _phase(timings, "compute"):
+            results = project_months(args.fixed_costs, args.price, args.variable_cost, args.initial_sales,
+                                     args.monthly_growth, args.months)
+        with _phase(timings, "output"):
+            print_summary(args.fixed_costs, args.price, args.variable_cost, args.initial_sales, args.monthly_growth, args.months, results)
+            print("\nMonth | Units | Revenue | Variable | Profit | Cumulative")
+            for r in results:
+                print(f"{r['month']:>3} | {r['units']:>5} | {r['revenue']:>7.2f} | {r['variable_costs']:>8.2f} | {r['profit']:>7.2f} | {r['cumulative_profit']:>10.2f}")
+            if args.export_csv:
+                export_csv(args.export_csv, results)
+            if args.export:
+                try:
+                    fmt = export_result(args.export, results)
+                except (ImportError, ValueError) as e:
+                    print(f"Could not export: {e}")
+                    raise SystemExit(2)
+                print(f"Exported projection to {args.export} ({fmt})")
+    if timings is not None:
+        print_timings(timings)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+"""Monte Carlo mode for the projection model.
+
+Any of price, variable_cost, initial_sales and monthly_growth (and fixed_costs) can
+be given as a distribution instead of a number. Trials are evaluated in chunks with
+the vectorized engine; each chunk draws from its own child of one ``SeedSequence``,
+so results are reproducible for a given seed and chunk size and memory is bounded
+by ``chunk_size * months`` regardless of the number of trials.
+
+Distribution specs (plain numbers are constants):
+
+- ``{"dist": "normal", "mean": m, "std": s}``
+- ``{"dist": "lognormal", "median": m, "sigma": s}`` (sigma of the underlying normal)
+- ``{"dist": "triangular", "left": a, "mode": b, "right": c}``
+- ``{"dist": "uniform", "low": a, "high": b}``
+"""
+import numbers
+from typing import Dict, Sequence
+
+import numpy as np
+
+from vectorized import break_even_months_batch, cumulative_profit_batch
+
+DISTRIBUTIONS = ('normal', 'lognormal', 'triangular', 'uniform')
+STOCHASTIC_PARAMETERS = ('fixed_costs', 'price', 'variable_cost', 'initial_sales', 'monthly_growth')
+DEFAULT_PERCENTILES = (5, 50, 95)
+DEFAULT_CHUNK_SIZE = 2000
+
+# Up to this many trial-months all cumulative profits are kept and percentiles are
+# exact; above it a second pass bins each month into HISTOGRAM_BINS buckets.
+EXACT_PERCENTILE_CELLS = 5_000_000
+HISTOGRAM_BINS = 2048
+
+
+def validate_spec(spec) -> None:
+    """Raise ValueError if ``spec`` is neither a number nor a known distribution."""
+    if isinstance(spec, numbers.Real):
+        return
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid distribution spec: {spec!r}")
+    dist = spec.get('dist')
+    required = {
+        'normal': ('mean', 'std'),
+        'lognormal': ('median', 'sigma'),
+        'triangular': ('left', 'mode', 'right'),
+        'uniform': ('low', 'high'),
+    }.get(dist)
+    if required is None:
+        raise ValueError(f"Unknown distribution: {dist}")
+    missing = [key for key in required if key not in spec]
+    if missing:
+        raise ValueError(f"{dist} distribution requires {', '.join(missing)}")
+
+
+def sample(spec, rng: np.random.Generator, size: int) -> np.ndarray:
+    """Draw ``size`` values from a distribution spec (or repeat a constant)."""
+    validate_spec(spec)
+    if isinstance(spec, numbers.Real):
+        return np.full(size, float(spec))
+    dist = spec['dist']
+    if dist == 'normal':
+        return rng.normal(float(spec['mean']), float(spec['std']), size)
+    if dist == 'lognormal':
+        return rng.lognormal(np.log(float(spec['median'])), float(spec['sigma']), size)
+    if dist == 'triangular':
+        return rng.triangular(float(spec['left']), float(spec['mode']), float(spec['right']), size)
+    return rng.uniform(float(spec['low']), float(spec['high']), size)
+
+
+def _sample_parameters(specs: Dict, rng: np.random.Generator, size: int) -> Dict[str, np.ndarray]:
+    params = {name: sample(specs[name], rng, size) for name in STOCHASTIC_PARAMETERS}
+    # Keep draws inside the domain the CLI accepts: non-negative money and units,
+    # growth no lower than -100%.
+    for name in ('fixed_costs', 'price', 'variable_cost'):
+        np.maximum(params[name], 0, out=params[name])
+    params['initial_sales'] = np.maximum(np.rint(params['initial_sales']), 0).astype(np.int64)
+    np.maximum(params['monthly_growth'], -1, out=params['monthly_growth'])
+    return params
+
+
+def _iter_chunks(specs: Dict, months: int, trials: int, seed, chunk_size: int):
+    """Yield the ``(months, n)`` cumulative profit matrix of each chunk, in order."""
+    starts = range(0, trials, chunk_size)
+    children = np.random.SeedSequence(seed).spawn(len(starts))
+    for start, child in zip(starts, children):
+        n = min(chunk_size, trials - start)
+        params = _sample_parameters(specs, np.random.default_rng(child), n)
+        yield cumulative_profit_batch(params['fixed_costs'], params['price'], params['variable_cost'],
+                                      params['initial_sales'], params['monthly_growth'], months)
+
+
+def _histogram_percentiles(specs, months, trials, seed, chunk_size, percentiles, lo, hi):
+    """Approximate percentiles from a second pass of per-month binned counts.
+
+    The pass regenerates identical chunks from the seed, so memory stays at one chunk
+    plus ``months * HISTOGRAM_BINS`` counters; each chunk adds its counts in place
+    rather than through a full-size ``bincount`` per chunk. Bins are spaced evenly in asinh(profit),
+    which behaves like a log scale for both gains and losses, so accuracy is about
+    ``1 / HISTOGRAM_BINS`` of the log-range (roughly 1-2% relative) rather than a fixed
+    absolute width that long right tails would blow up.
+    """
+    lo = np.arcsinh(lo)
+    hi = np.arcsinh(hi)
+    width = np.where(hi > lo, (hi - lo) / HISTOGRAM_BINS, 1.0)
+    offsets = (np.arange(months) * HISTOGRAM_BINS)[:, None]
+    counts = np.zeros(months * HISTOGRAM_BINS, dtype=np.int32 if trials < 2**31 else np.int64)
+    for cumulative in _iter_chunks(specs, months, trials, seed, chunk_size):
+        scaled = (np.arcsinh(cumulative) - lo[:, None]) / width[:, None]
+        bins = np.clip(scaled.astype(np.int64), 0, HISTOGRAM_BINS - 1)
+        bins += offsets
+        np.add.at(counts, bins.ravel(), 1)
+
+    cdf = np.cumsum(counts.reshape(months, HISTOGRAM_BINS), axis=1, dtype=np.int64)
+    rows = np.arange(months)
+    bands = {}
+    for q in percentiles:
+        rank = q / 100.0 * trials
+        idx = np.minimum((cdf < rank).sum(axis=1), HISTOGRAM_BINS - 1)
+        below = np.where(idx > 0, cdf[rows, idx - 1], 0)
+        in_bin = np.maximum(cdf[rows, idx] - below, 1)
+        fraction = np.clip((rank - below) / in_bin, 0, 1)
+        bands[q] = np.sinh(lo + (idx + fraction) * width)
+    return bands
+
+
+def monte_carlo_projection(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months: int,
+                           trials: int = 10000, seed: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                           percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict:
+    """Run ``trials`` stochastic projections and summarize them.
+
+    Each parameter is a number or a distribution spec (see module docstring).
+
+    Returns a dict with:
+    - ``percentiles``: {"p5": [...], "p50": [...], ...} cumulative profit per month
+    - ``break_even_histogram``: trial counts indexed by break-even month (index 0 = never)
+    - ``break_even_probability``: share of trials that break even within ``months``
+    - ``mean_final_cumulative_profit``, ``trials``, ``months``, ``seed``, ``exact``
+
+    With ``seed=None`` fresh entropy is drawn and returned as ``seed``.
+    """
+    specs = {
+        'fixed_costs': fixed_costs,
+        'price': price,
+        'variable_cost': variable_cost,
+        'initial_sales': initial_sales,
+        'monthly_growth': monthly_growth,
+    }
+    for spec in specs.values():
+        validate_spec(spec)
+    trials = int(trials)
+    months = int(months)
+    chunk_size = int(chunk_size)
+    if trials < 1 or months < 1 or chunk_size < 1:
+        raise ValueError("trials, months and chunk_size must be >= 1")
+    # Resolve a missing seed once so both passes draw the same sample and the run
+    # can be repeated from the returned seed.
+    seed = np.random.SeedSequence(seed).entropy
+
+    exact = trials * months <= EXACT_PERCENTILE_CELLS
+    kept = []
+    histogram = np.zeros(months + 1, dtype=np.int64)
+    final_total = 0.0
+    lo = np.full(months, np.inf)
+    hi = np.full(months, -np.inf)
+    for cumulative in _iter_chunks(specs, months, trials, seed, chunk_size):
+        histogram += np.bincount(break_even_months_batch(cumulative), minlength=months + 1)
+        final_total += float(cumulative[-1].sum())
+        if exact:
+            kept.append(cumulative)
+        else:
+            np.minimum(lo, cumulative.min(axis=1), out=lo)
+            np.maximum(hi, cumulative.max(axis=1), out=hi)
+
+    if exact:
+        everything = np.concatenate(kept, axis=1)
+        bands = dict(zip(percentiles, np.percentile(everything, list(percentiles), axis=1)))
+    else:
+        bands = _histogram_percentiles(specs, months, trials, seed, chunk_size, percentiles, lo, hi)
+
+    return {
+        'months': months,
+        'trials': trials,
+        'seed': seed,
+        'exact': exact,
+        'percentiles': {f'p{q:g}': bands[q].tolist() for q in percentiles},
+        'break_even_histogram': histogram.tolist(),
+        'break_even_probability': float(histogram[1:].sum()) / trials,
+        'mean_final_cumulative_profit': final_total / trials,
+    }
@@ -1,12 +1,34 @@
 """Generate and save projection plots using the simulator.
 
+Charts are drawn with matplotlib's object-oriented ``Figure`` API and rendered by
+the Agg (PNG) or SVG backend, so no global pyplot state is touched and rendering
+is safe from any thread or worker process. :func:`render_chart` takes plain
+column lists, which keeps it cheap to send to the process pool, and
+:func:`get_chart` memoizes rendered bytes in ``chart_cache`` keyed by a hash of
+the chart type, format and series (see ``/api/chart/<type>``).
+
 This script will prompt to install `matplotlib` if it's not available.
 """
 import argparse
-import sys
+import hashlib
+import json
+from io import BytesIO
 from pathlib import Path
+from typing import Dict, Tuple
 
+from cache import ResultCache
 from simulator import project_months
+from results import column
+from workers import run_cpu_bound
+
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+# Series at most this long get point markers / one bar per month; longer ones are
+# drawn as plain lines / filled steps, which render in time independent of tick count.
+MARKER_LIMIT = 60
+WATERFALL_BAR_LIMIT = 240
+
+# Rendered chart bytes, sized by SIM_CHART_CACHE_MAX_ENTRIES / _MAX_BYTES / _TTL.
+chart_cache = ResultCache.from_env('SIM_CHART_CACHE_')
 
 
 def parse_args():
@@ -31,118 +53,158 @@ def main():
     print(f"Saved plot to {out_path}")
 
 
-def make_projection_plot_bytes(results):
-    try:
-        import matplotlib.pyplot as plt
-    except Exception:
-        raise
-    months = [r["month"] for r in results]
-    cum = [r["cumulative_profit"] for r in results]
-    units = [r["units"] for r in results]
-    revenue = [r["revenue"] for r in results]
+def _new_figure(figsize):
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
 
-    fig, ax1 = plt.subplots(figsize=(8, 5))
-    ax1.plot(months, cum, label="Cumulative Profit", color="tab:green", marker="o")
+def _draw_projection(fig, series):
+    months = series['month']
+    marker = 'o' if len(months) <= MARKER_LIMIT else None
+    ax1 = fig.subplots()
+    ax1.plot(months, series['cumulative_profit'], label="Cumulative Profit", color="tab:green", marker=marker)
     ax1.set_xlabel("Month")
     ax1.set_ylabel("Cumulative Profit", color="tab:green")
     ax1.tick_params(axis='y', labelcolor='tab:green')
 
     ax2 = ax1.twinx()
-    ax2.plot(months, units, label="Units", color="tab:blue", linestyle='--')
-    ax2.plot(months, revenue, label="Revenue", color="tab:orange", linestyle=':')
+    ax2.plot(months, series['units'], label="Units", color="tab:blue", linestyle='--')
+    ax2.plot(months, series['revenue'], label="Revenue", color="tab:orange", linestyle=':')
     ax2.set_ylabel("Units / Revenue", color="tab:blue")
     ax2.tick_params(axis='y', labelcolor='tab:blue')
 
-    fig.tight_layout()
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    buf.seek(0)
-    plt.close(fig)
-    return buf
-
-
-def make_cohort_plot_bytes(cohort_results):
-    try:
-        import matplotlib.pyplot as plt
-    except Exception:
-        raise
-    months = [r['month'] for r in cohort_results]
-    customers = [r['customers'] for r in cohort_results]
-    cum = [r['cumulative_margin'] for r in cohort_results]
-    fig, ax1 = plt.subplots(figsize=(8, 5))
-    ax1.plot(months, customers, label='Customers', color='tab:blue', marker='o')
+
+def _draw_cohort(fig, series):
+    months = series['month']
+    marker = 'o' if len(months) <= MARKER_LIMIT else None
+    ax1 = fig.subplots()
+    ax1.plot(months, series['customers'], label='Customers', color='tab:blue', marker=marker)
     ax1.set_xlabel('Month')
     ax1.set_ylabel('Active Customers', color='tab:blue')
     ax1.tick_params(axis='y', labelcolor='tab:blue')
 
     ax2 = ax1.twinx()
-    ax2.plot(months, cum, label='Cumulative Margin', color='tab:green', linestyle='--')
+    ax2.plot(months, series['cumulative_margin'], label='Cumulative Margin', color='tab:green', linestyle='--')
     ax2.set_ylabel('Cumulative Margin', color='tab:green')
     ax2.tick_params(axis='y', labelcolor='tab:green')
 
-    fig.tight_layout()
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    buf.seek(0)
-    plt.close(fig)
-    return buf
-
 
-def make_cost_pie_chart_bytes(results, fixed_costs):
-    """Create a pie chart showing fixed costs vs total variable costs breakdown."""
-    try:
-        import matplotlib.pyplot as plt
-    except Exception:
-        raise
-    
-    total_variable = sum(r['variable_costs'] for r in results)
-    fig, ax = plt.subplots(figsize=(7, 5))
+def _draw_cost_pie(fig, series):
+    fixed_costs = series['fixed_costs']
+    total_variable = series['total_variable_costs']
+    ax = fig.subplots()
     sizes = [fixed_costs, total_variable]
     labels = [f'Fixed Costs\n${fixed_costs:,.0f}', f'Total Variable Costs\n${total_variable:,.0f}']
     colors = ['#ff9999', '#66b3ff']
     ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
     ax.set_title('Cost Breakdown')
-    fig.tight_layout()
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    buf.seek(0)
-    plt.close(fig)
-    return buf
-
-
-def make_waterfall_chart_bytes(results):
-    """Create a waterfall chart showing cumulative profit growth month-by-month."""
-    try:
-        import matplotlib.pyplot as plt
-        import numpy as np
-    except Exception:
-        raise
-    
-    months = [r['month'] for r in results]
-    profits = [r['profit'] for r in results]
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Calculate cumulative for waterfall
-    cumulative = 0
-    x_pos = np.arange(len(months))
-    colors = ['green' if p >= 0 else 'red' for p in profits]
-    
-    ax.bar(x_pos, profits, color=colors, alpha=0.7, edgecolor='black')
+
+
+def _draw_waterfall(fig, series):
+    from matplotlib.ticker import MaxNLocator
+
+    months = series['month']
+    profits = series['profit']
+    ax = fig.subplots()
+    if len(months) <= WATERFALL_BAR_LIMIT:
+        colors = ['green' if p >= 0 else 'red' for p in profits]
+        ax.bar(months, profits, color=colors, alpha=0.7, edgecolor='black')
+    else:
+        # Thousands of bar patches (and one tick label per bar) dominate render
+        # time; a filled step outline looks the same at this density.
+        ax.fill_between(months, profits, 0, where=[p >= 0 for p in profits], step='mid',
+                        color='green', alpha=0.7, linewidth=0)
+        ax.fill_between(months, profits, 0, where=[p < 0 for p in profits], step='mid',
+                        color='red', alpha=0.7, linewidth=0)
     ax.set_xlabel('Month')
     ax.set_ylabel('Monthly Profit')
     ax.set_title('Monthly Profit Waterfall')
-    ax.set_xticks(x_pos)
-    ax.set_xticklabels(months)
+    ax.xaxis.set_major_locator(MaxNLocator(integer=True))
     ax.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
     ax.grid(axis='y', alpha=0.3)
-    
+
+
+# chart type -> (draw function, figure size)
+CHART_TYPES = {
+    'projection': (_draw_projection, (8, 5)),
+    'cohort': (_draw_cohort, (8, 5)),
+    'cost_pie': (_draw_cost_pie, (7, 5)),
+    'waterfall': (_draw_waterfall, (10, 6)),
+}
+
+
+def chart_series(chart_type: str, results, fixed_costs: float = None) -> Dict:
+    """Extract the plain columns ``chart_type`` needs from a simulator result."""
+    if chart_type == 'projection':
+        names = ('month', 'cumulative_profit', 'units', 'revenue')
+    elif chart_type == 'cohort':
+        names = ('month', 'customers', 'cumulative_margin')
+    elif chart_type == 'waterfall':
+        names = ('month', 'profit')
+    elif chart_type == 'cost_pie':
+        series = {'fixed_costs': float(fixed_costs), 'total_variable_costs': float(sum(column(results, 'variable_costs')))}
+        # Pie wedges must be non-negative and not all zero.
+        if min(series.values()) < 0:
+            raise ValueError("cost_pie needs non-negative fixed costs and total variable costs")
+        if sum(series.values()) <= 0:
+            raise ValueError("cost_pie needs fixed costs or variable costs above zero")
+        return series
+    else:
+        raise ValueError(f"Unknown chart type: {chart_type}; choose one of {', '.join(CHART_TYPES)}")
+    return {name: list(column(results, name)) for name in names}
+
+
+def render_chart(chart_type: str, series: Dict, fmt: str = 'png') -> bytes:
+    """Draw ``chart_type`` from ``series`` and return the encoded image bytes."""
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unknown chart type: {chart_type}; choose one of {', '.join(CHART_TYPES)}")
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"Unknown chart format: {fmt}; choose one of {', '.join(CHART_FORMATS)}")
+    draw, figsize = CHART_TYPES[chart_type]
+    fig = _new_figure(figsize)
+    draw(fig, series)
     fig.tight_layout()
     buf = BytesIO()
-    fig.savefig(buf, format='png')
-    buf.seek(0)
-    plt.close(fig)
-    return buf
+    fig.savefig(buf, format=fmt)
+    return buf.getvalue()
+
+
+def chart_key(chart_type: str, series: Dict, fmt: str = 'png') -> str:
+    """Content hash identifying a rendered chart (also used as its ETag)."""
+    payload = json.dumps([chart_type, fmt, series], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_chart(chart_type: str, series: Dict, fmt: str = 'png', offload: bool = False,
+              key: str = None) -> Tuple[str, bytes]:
+    """Return ``(key, image bytes)``, rendering (in the process pool if ``offload``) on a cache miss.
+
+    ``key`` may be passed if the caller already computed :func:`chart_key`.
+    """
+    key = key or chart_key(chart_type, series, fmt)
+    data = chart_cache.get(key)
+    if data is None:
+        data = run_cpu_bound(offload, render_chart, chart_type, series, fmt)
+        chart_cache.put(key, data)
+    return key, data
+
+
+def make_projection_plot_bytes(results, fmt='png'):
+    return BytesIO(render_chart('projection', chart_series('projection', results), fmt))
+
+
+def make_cohort_plot_bytes(cohort_results, fmt='png'):
+    return BytesIO(render_chart('cohort', chart_series('cohort', cohort_results), fmt))
+
+
+def make_cost_pie_chart_bytes(results, fixed_costs, fmt='png'):
+    """Create a pie chart showing fixed costs vs total variable costs breakdown."""
+    return BytesIO(render_chart('cost_pie', chart_series('cost_pie', results, fixed_costs), fmt))
+
+
+def make_waterfall_chart_bytes(results, fmt='png'):
+    """Create a waterfall chart showing monthly profit, month by month."""
+    return BytesIO(render_chart('waterfall', chart_series('waterfall', results), fmt))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,162 @@
+"""Multi-product portfolio simulation against one shared fixed-cost base.
+
+Running ``project_months`` once per product line and adding the results
+subtracts ``fixed_costs`` once per product. Here every product contributes
+``units * (price - variable_cost)`` each month and the company's fixed costs are
+subtracted once, from the total:
+
+    cumulative_profit[t] = -fixed_costs - sum(product fixed_costs) + sum over months <= t, products of profit
+
+All products are projected together with :func:`vectorized.project_months_batch`,
+which produces ``(months, products)`` matrices (one column per product). The
+aggregate is then a row sum.
+
+A product may carry its own direct ``fixed_costs``. Its break-even month is the
+first month its cumulative contribution covers its direct fixed costs plus its
+share of the shared base. Shares follow ``allocation``: ``revenue`` (default),
+``units`` or ``contribution`` over the horizon, or ``equal``.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from results import ProjectionResult
+from vectorized import break_even_months_batch, project_months_batch
+
+PRODUCT_PARAMETERS = ('price', 'variable_cost', 'initial_sales', 'monthly_growth', 'fixed_costs')
+# Product defaults, the same as /api/project's (fixed_costs here is the product's direct cost).
+PRODUCT_DEFAULTS = {'price': 50.0, 'variable_cost': 20.0, 'initial_sales': 200, 'monthly_growth': 0.05,
+                    'fixed_costs': 0.0}
+ALLOCATIONS = ('revenue', 'units', 'contribution', 'equal')
+
+
+def normalize_products(products: Sequence[Dict]) -> List[Dict]:
+    """Validate product specs and fill defaults; products are named ``product-<n>`` if unnamed.
+
+    Raises ValueError for an empty list, unknown fields, duplicate names or
+    negative prices and costs.
+    """
+    if not isinstance(products, (list, tuple)) or not products:
+        raise ValueError("products must be a non-empty list")
+    normalized, names = [], set()
+    for i, spec in enumerate(products, start=1):
+        if not isinstance(spec, dict):
+            raise ValueError(f"Product {i} must be an object")
+        unknown = sorted(set(spec) - set(PRODUCT_PARAMETERS) - {'name'})
+        if unknown:
+            raise ValueError(f"Unknown product fields: {', '.join(unknown)}")
+        product = dict(PRODUCT_DEFAULTS, **{k: v for k, v in spec.items() if v is not None})
+        product = {
+            'name': str(product.get('name', f'product-{i}')),
+            'price': float(product['price']),
+            'variable_cost': float(product['variable_cost']),
+            'initial_sales': int(product['initial_sales']),
+            'monthly_growth': float(product['monthly_growth']),
+            'fixed_costs': float(product['fixed_costs']),
+        }
+        if min(product['price'], product['variable_cost'], product['fixed_costs']) < 0:
+            raise ValueError(f"Product {product['name']}: prices and costs must be non-negative")
+        if product['name'] in names:
+            raise ValueError(f"Duplicate product name: {product['name']}")
+        names.add(product['name'])
+        normalized.append(product)
+    return normalized
+
+
+def project_portfolio(products: Sequence[Dict], months: int) -> Dict[str, np.ndarray]:
+    """Per-product monthly matrices, shape ``(months, products)``, before any fixed costs.
+
+    Returns ``month`` and ``units``, ``revenue``, ``variable_costs``, ``profit`` (the
+    monthly contribution) and ``contribution`` (its running sum).
+    """
+    products = normalize_products(products)
+    batch = project_months_batch(
+        0.0,
+        [p['price'] for p in products],
+        [p['variable_cost'] for p in products],
+        [p['initial_sales'] for p in products],
+        [p['monthly_growth'] for p in products],
+        months,
+    )
+    batch['contribution'] = batch.pop('cumulative_profit')
+    return batch
+
+
+def _allocation_shares(batch: Dict[str, np.ndarray], allocation: str) -> np.ndarray:
+    n = batch['units'].shape[1]
+    if allocation not in ALLOCATIONS:
+        raise ValueError(f"Unknown allocation: {allocation}; choose one of {', '.join(ALLOCATIONS)}")
+    if allocation == 'equal' or batch['month'].size == 0:
+        return np.full(n, 1 / n)
+    basis = {'revenue': batch['revenue'], 'units': batch['units'], 'contribution': batch['profit']}[allocation]
+    totals = np.clip(basis.sum(axis=0, dtype=np.float64), 0, None)
+    if totals.sum() <= 0:
+        return np.full(n, 1 / n)
+    return totals / totals.sum()
+
+
+def simulate_portfolio(products: Sequence[Dict], fixed_costs: float, months: int,
+                       allocation: str = 'revenue') -> Dict:
+    """Simulate ``products`` against ``fixed_costs`` shared by all of them.
+
+    Returns a dict with:
+
+    - ``results``: the company-wide ProjectionResult (units, revenue, costs and
+      profit summed over products; cumulative profit net of every fixed cost once)
+    - ``break_even_month`` and ``final_cumulative_profit`` of the portfolio
+    - ``products``: per product, its total ``contribution``, ``contribution_share``,
+      ``allocated_fixed_costs`` (direct plus its share of the shared base),
+      ``final_profit`` (contribution minus allocated costs) and ``break_even_month``
+      (0 if its contribution never covers its allocated costs within ``months``)
+    - ``monthly``: the per-product matrices from :func:`project_portfolio`
+    """
+    fixed_costs = float(fixed_costs)
+    if fixed_costs < 0:
+        raise ValueError("fixed_costs must be non-negative")
+    products = normalize_products(products)
+    months = max(int(months), 0)
+    batch = project_portfolio(products, months)
+    direct = np.array([p['fixed_costs'] for p in products], dtype=np.float64)
+    shares = _allocation_shares(batch, allocation)
+    allocated = direct + fixed_costs * shares
+
+    profit = batch['profit'].sum(axis=1)
+    # Start the running sum at the fixed costs, as project_months does, so a one-product
+    # portfolio matches it exactly.
+    cumulative = np.cumsum(np.concatenate(([-(fixed_costs + direct.sum())], profit)))[1:]
+    results = ProjectionResult({
+        'month': batch['month'],
+        'units': batch['units'].sum(axis=1),
+        'revenue': batch['revenue'].sum(axis=1),
+        'variable_costs': batch['variable_costs'].sum(axis=1),
+        'profit': profit,
+        'cumulative_profit': cumulative,
+    })
+
+    if months:
+        contribution = batch['contribution'][-1]
+        break_even = break_even_months_batch(batch['contribution'] - allocated)
+        portfolio_break_even = int(break_even_months_batch(cumulative[:, None])[0])
+    else:
+        contribution = np.zeros(len(products))
+        break_even = np.zeros(len(products), dtype=np.int64)
+        portfolio_break_even = 0
+    total_contribution = float(contribution.sum())
+    product_rows = [{
+        'name': product['name'],
+        'contribution': float(contribution[i]),
+        'contribution_share': float(contribution[i] / total_contribution) if total_contribution else 0.0,
+        'allocated_fixed_costs': float(allocated[i]),
+        'final_profit': float(contribution[i] - allocated[i]),
+        'break_even_month': int(break_even[i]),
+    } for i, product in enumerate(products)]
+
+    return {
+        'results': results,
+        'break_even_month': portfolio_break_even,
+        'final_cumulative_profit': float(cumulative[-1]) if months else -(fixed_costs + float(direct.sum())),
+        'total_contribution': total_contribution,
+        'allocation': allocation,
+        'products': product_rows,
+        'monthly': batch,
+    }
@@ -0,0 +1,159 @@
+"""Persisted projection results for saved scenarios.
+
+Each saved scenario can carry its projection in the binary columnar format of
+:meth:`results.ColumnarResult.to_bytes`. The stored copy is stamped with a key
+derived from the projection parameters and :data:`simulator.SIMULATOR_VERSION`;
+a stamp mismatch (edited parameters or a simulator upgrade) makes the copy stale
+and it is recomputed on the next load. ``python src/precompute.py warm`` rebuilds
+every scenario up front, e.g. after bumping the simulator version.
+"""
+import argparse
+import hashlib
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Optional
+
+from results import ProjectionResult
+from scenarios import ScenarioStore, get_store
+from simulator import SIMULATOR_VERSION, project_months
+
+_warm_lock = threading.Lock()
+_warm_thread: Optional[threading.Thread] = None
+
+PROJECTION_PARAMETERS = ('fixed_costs', 'price', 'variable_cost', 'initial_sales', 'monthly_growth', 'months')
+
+
+def projection_args(params: Dict) -> tuple:
+    """Positional ``project_months`` arguments for scenario ``params`` (API defaults for gaps)."""
+    return (
+        float(params.get('fixed_costs', 10000)),
+        float(params.get('price', 50)),
+        float(params.get('variable_cost', 20)),
+        int(params.get('initial_sales', 200)),
+        float(params.get('monthly_growth', 0.05)),
+        int(params.get('months', 12)),
+    )
+
+
+def projection_key(params: Dict) -> str:
+    """Content hash of the projection inputs plus the simulator version."""
+    payload = json.dumps([SIMULATOR_VERSION, dict(zip(PROJECTION_PARAMETERS, projection_args(params)))],
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _compute(params: Dict) -> bytes:
+    return project_months(*projection_args(params)).to_bytes()
+
+
+def store_projection(name: str, params: Dict, store: ScenarioStore = None) -> ProjectionResult:
+    """Compute and persist the projection of ``params`` under scenario ``name``."""
+    store = store or get_store()
+    data = _compute(params)
+    store.save_results(name, projection_key(params), data)
+    return ProjectionResult.from_bytes(data)
+
+
+def load_projection(name: str, params: Dict = None, store: ScenarioStore = None) -> ProjectionResult:
+    """Return the projection for a saved scenario, reading the persisted copy when current.
+
+    ``params`` may be passed if the caller already loaded them. A missing, stale
+    or unreadable copy is recomputed and written back.
+    """
+    store = store or get_store()
+    if params is None:
+        params = store.load(name)
+    cached = store.load_results(name)
+    if cached is not None and cached[0] == projection_key(params):
+        try:
+            return ProjectionResult.from_bytes(cached[1])
+        except ValueError:
+            pass
+    return store_projection(name, params, store)
+
+
+def warm_scenarios(store: ScenarioStore = None, names: Iterable[str] = None, force: bool = False,
+                   max_workers: int = None, executor=None) -> Dict[str, int]:
+    """Recompute persisted projections that are missing or stale (all of them if ``force``).
+
+    Projections are computed on ``executor`` if given, otherwise on a new process
+    pool; reads and writes stay in this process. Each scenario is handled on its
+    own: one that fails to load, compute or save is counted and the rest still
+    run. Returns counts of ``computed``, ``fresh`` (already current) and ``failed``.
+    """
+    store = store or get_store()
+    names = list(store.list() if names is None else names)
+    pending = []
+    counts = {'computed': 0, 'fresh': 0, 'failed': 0}
+    for name in names:
+        try:
+            params = store.load(name)
+            key = projection_key(params)
+        except (FileNotFoundError, ValueError, TypeError):
+            counts['failed'] += 1
+            continue
+        cached = None if force else store.load_results(name)
+        if cached is not None and cached[0] == key:
+            counts['fresh'] += 1
+        else:
+            pending.append((name, key, params))
+    if not pending:
+        return counts
+
+    def write(item, compute):
+        try:
+            store.save_results(item[0], item[1], compute())
+        except Exception:
+            counts['failed'] += 1
+        else:
+            counts['computed'] += 1
+
+    if executor is None and (len(pending) == 1 or max_workers == 1):
+        for item in pending:
+            write(item, lambda: _compute(item[2]))
+        return counts
+    pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(_compute, item[2]): item for item in pending}
+        for future in as_completed(futures):
+            write(futures[future], future.result)
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return counts
+
+
+def warm_in_background(store: ScenarioStore = None, force: bool = False,
+                       executor=None) -> Optional[threading.Thread]:
+    """Start :func:`warm_scenarios` on a daemon thread and return the thread.
+
+    Only one background warm-up runs at a time: while one is still running this
+    returns None and starts nothing.
+    """
+    global _warm_thread
+    with _warm_lock:
+        if _warm_thread is not None and _warm_thread.is_alive():
+            return None
+        _warm_thread = threading.Thread(target=warm_scenarios, kwargs={'store': store, 'force': force,
+                                                                      'executor': executor},
+                                        name='scenario-warm', daemon=True)
+        _warm_thread.start()
+        return _warm_thread
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Precompute persisted projections for saved scenarios")
+    sub = p.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm", help="Recompute missing or stale projections for all scenarios")
+    warm.add_argument("--force", action="store_true", help="Recompute even if the stored copy is current")
+    warm.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = p.parse_args(argv)
+
+    if args.command == "warm":
+        counts = warm_scenarios(force=args.force, max_workers=args.workers)
+        print(f"Computed {counts['computed']}, already current {counts['fresh']}, failed {counts['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Compact columnar containers for simulator output.
+
+A projection used to be a list of dicts, one per month, each holding six string
+keys. These classes keep one contiguous ``array.array`` per column instead and
+only build per-month dicts when a caller asks for them, so long horizons stay
+cheap to hold and to serialize. Standard library only.
+"""
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+
+# Binary layout written by ColumnarResult.to_bytes: a fixed header followed by each
+# column's float64 values, little-endian, in ``fields`` order.
+_BINARY_MAGIC = b"SIMC"
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<4sHHQ")  # magic, format version, column count, rows
+
+
+class ColumnarResult:
+    """Base class: one ``array('d')`` per column plus sequence-of-records access.
+
+    Subclasses set ``fields`` (column order) and ``int_fields`` (columns that are
+    whole numbers and are returned as ``int`` in records). Indexing, iteration
+    and ``len()`` behave like the old list of dicts, so existing callers keep
+    working; new code should read columns directly via :meth:`column`.
+    """
+
+    __slots__ = ("_columns",)
+    fields: tuple = ()
+    int_fields: frozenset = frozenset()
+
+    def __init__(self, columns: Dict[str, Iterable] = None):
+        columns = columns or {}
+        self._columns = {name: array("d", columns.get(name, ())) for name in self.fields}
+        lengths = {len(col) for col in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]):
+        """Build a result from an iterable of per-month dicts."""
+        result = cls()
+        for r in records:
+            result.append(*(r[name] for name in cls.fields))
+        return result
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]):
+        """Build a result from an iterable of row tuples in ``fields`` order."""
+        result = cls()
+        # Fill the columns row by row: ``zip(*rows)`` would hold every row tuple at once.
+        cols = tuple(result._columns.values())
+        for row in rows:
+            for col, value in zip(cols, row):
+                col.append(value)
+        return result
+
+    def append(self, *values) -> None:
+        """Append one row, given in ``fields`` order."""
+        for col, value in zip(self._columns.values(), values):
+            col.append(value)
+
+    def column(self, name: str) -> array:
+        """Return the backing array for ``name`` (not a copy)."""
+        return self._columns[name]
+
+    @property
+    def columns(self) -> Dict[str, array]:
+        return dict(self._columns)
+
+    def _record(self, i: int) -> Dict:
+        return {name: (int(col[i]) if name in self.int_fields else col[i])
+                for name, col in self._columns.items()}
+
+    def __len__(self) -> int:
+        return len(self._columns[self.fields[0]])
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self._record(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("result index out of range")
+        return self._record(index)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ColumnarResult):
+            return type(self) is type(other) and self._columns == other._columns
+        if isinstance(other, list):
+            return self.to_records() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(months={len(self)})"
+
+    def to_records(self) -> List[Dict]:
+        """Materialize the legacy list-of-dicts representation (JSON-ready)."""
+        return list(self)
+
+    def to_columns(self) -> Dict[str, List]:
+        """Return plain lists per column, e.g. for a columnar JSON payload."""
+        return {name: ([int(v) for v in col] if name in self.int_fields else col.tolist())
+                for name, col in self._columns.items()}
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the compact binary columnar format (header + raw float64 columns)."""
+        parts = [_BINARY_HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, len(self.fields), len(self))]
+        for col in self._columns.values():
+            if sys.byteorder != "little":
+                col = array("d", col)
+                col.byteswap()
+            parts.append(col.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Inverse of :meth:`to_bytes`; raises ValueError on a malformed or foreign buffer."""
+        data = memoryview(data)
+        if len(data) < _BINARY_HEADER.size:
+            raise ValueError("Truncated result buffer")
+        magic, version, ncols, rows = _BINARY_HEADER.unpack_from(data)
+        if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+            raise ValueError("Not a serialized result (bad magic or version)")
+        if ncols != len(cls.fields):
+            raise ValueError(f"Buffer has {ncols} columns, {cls.__name__} expects {len(cls.fields)}")
+        width = rows * 8
+        if len(data) != _BINARY_HEADER.size + ncols * width:
+            raise ValueError("Result buffer length does not match its header")
+        result = cls()
+        offset = _BINARY_HEADER.size
+        for col in result._columns.values():
+            col.frombytes(data[offset:offset + width])
+            if sys.byteorder != "little":
+                col.byteswap()
+            offset += width
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers."""
+        return sum(col.itemsize * len(col) for col in self._columns.values())
+
+
+class ProjectionResult(ColumnarResult):
+    """Output of :func:`simulator.project_months`."""
+
+    __slots__ = ()
+    fields = ("month", "units", "revenue", "variable_costs", "profit", "cumulative_profit")
+    int_fields = frozenset({"month", "units"})
+
+
+class CohortResult(ColumnarResult):
+    """Output of :func:`simulator.cohort_projection`."""
+
+    __slots__ = ()
+    fields = ("month", "customers", "monthly_margin", "cumulative_margin")
+    int_fields = frozenset({"month", "customers"})
+
+
+class LayeredCohortResult(ColumnarResult):
+    """Output of :func:`cohorts.layered_cohort_projection` (customer counts are expected values)."""
+
+    __slots__ = ()
+    fields = ("month", "new_customers", "active_customers", "monthly_margin", "acquisition_spend",
+              "cumulative_margin", "cumulative_net")
+    int_fields = frozenset({"month"})
+
+
+def column(results, name: str) -> Sequence:
+    """Return column ``name`` from a columnar result or a legacy list of dicts."""
+    if isinstance(results, ColumnarResult):
+        return results.column(name)
+    return [r[name] for r in results]
+
+
+def iter_rows(results, fields: Sequence[str]) -> Iterator[tuple]:
+    """Yield row tuples of ``fields`` without building per-month dicts when possible."""
+    if isinstance(results, ColumnarResult):
+        cols = [results.column(name) for name in fields]
+        casts = [int if name in results.int_fields else float for name in fields]
+        for row in zip(*cols):
+            yield tuple(cast(v) for cast, v in zip(casts, row))
+    else:
+        for r in results:
+            yield tuple(r[name] for name in fields)
@@ -0,0 +1,156 @@
+"""Retention curves and cached survival tables.
+
+A retention curve gives ``S(k)``, the share of a cohort still active ``k`` months
+after acquisition (``S(0) = 1``). Curves are described by plain specs:
+
+- ``{"type": "shifted_geometric", "churn": c}``: ``S(k) = (1 - c) ** k`` (constant churn)
+- ``{"type": "weibull", "shape": k, "scale": lam}``: ``S(t) = exp(-(t / lam) ** k)``;
+  shape < 1 means churn falls with tenure, > 1 means it rises
+- ``{"type": "empirical", "values": [1.0, 0.8, 0.7, ...]}`` (or just the list):
+  observed survival, zero after the last value
+
+Survival and cumulative-survival tables are built once per distinct curve and
+horizon bucket and kept in an LRU cache bounded by the total months it holds
+(:data:`MAX_CACHED_MONTHS`), so LTV for many segments sharing a curve is a table
+lookup rather than a month-by-month loop. Standard library only.
+"""
+import math
+import threading
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, Tuple
+
+CURVE_TYPES = ('shifted_geometric', 'weibull', 'empirical')
+
+# Longest table built for an unbounded horizon; matches the break-even search cap.
+MAX_TABLE_MONTHS = 120_000
+# Survival below this is treated as zero when summing an unbounded horizon.
+SURVIVAL_EPSILON = 1e-12
+_MIN_TABLE_MONTHS = 64
+# Total table length the cache may hold across all curves (each month costs two
+# floats in tuples, roughly 64 bytes, so about 64 MB).
+MAX_CACHED_MONTHS = 1 << 20
+
+_tables_cache: "OrderedDict[Tuple, Tuple]" = OrderedDict()
+_tables_lock = threading.Lock()
+_tables_stats = {'hits': 0, 'misses': 0, 'months': 0}
+
+
+def curve_key(spec) -> Tuple:
+    """Normalize a retention spec into a hashable ``(type, params...)`` key.
+
+    Raises ValueError for unknown types, missing or out-of-range parameters.
+    """
+    if isinstance(spec, tuple) and spec and spec[0] in CURVE_TYPES:
+        return spec
+    if isinstance(spec, (list, tuple)):
+        spec = {'type': 'empirical', 'values': spec}
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid retention spec: {spec!r}")
+    kind = spec.get('type')
+    if kind == 'shifted_geometric':
+        churn = float(spec['churn']) if 'churn' in spec else None
+        if churn is None or not 0 <= churn <= 1:
+            raise ValueError("shifted_geometric retention requires churn between 0 and 1")
+        return (kind, churn)
+    if kind == 'weibull':
+        if 'shape' not in spec or 'scale' not in spec:
+            raise ValueError("weibull retention requires shape and scale")
+        shape, scale = float(spec['shape']), float(spec['scale'])
+        if shape <= 0 or scale <= 0:
+            raise ValueError("weibull shape and scale must be > 0")
+        return (kind, shape, scale)
+    if kind == 'empirical':
+        values = tuple(float(v) for v in spec.get('values') or ())
+        if not values or any(v < 0 for v in values):
+            raise ValueError("empirical retention requires a non-empty list of values >= 0")
+        return (kind, values)
+    raise ValueError(f"Unknown retention curve: {kind}")
+
+
+def _survival_at(key: Tuple, k: int) -> float:
+    kind = key[0]
+    if kind == 'shifted_geometric':
+        return (1.0 - key[1]) ** k
+    if kind == 'weibull':
+        return math.exp(-((k / key[2]) ** key[1]))
+    values = key[1]
+    return values[k] if k < len(values) else 0.0
+
+
+def _bucket(months: int) -> int:
+    """Round a horizon up to a power of two so nearby horizons share one table."""
+    return max(_MIN_TABLE_MONTHS, 1 << (max(int(months), 1) - 1).bit_length())
+
+
+def _tables(key: Tuple, length: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """``(survival, cumulative survival)`` of ``length`` months, from the LRU cache when present."""
+    with _tables_lock:
+        tables = _tables_cache.get((key, length))
+        if tables is not None:
+            _tables_cache.move_to_end((key, length))
+            _tables_stats['hits'] += 1
+            return tables
+        _tables_stats['misses'] += 1
+    survival = tuple(_survival_at(key, k) for k in range(length))
+    tables = survival, tuple(accumulate(survival))
+    if length > MAX_CACHED_MONTHS:
+        return tables
+    with _tables_lock:
+        if (key, length) not in _tables_cache:
+            _tables_cache[(key, length)] = tables
+            _tables_stats['months'] += length
+            while _tables_stats['months'] > MAX_CACHED_MONTHS:
+                (_, evicted), _ = _tables_cache.popitem(last=False)
+                _tables_stats['months'] -= evicted
+    return tables
+
+
+def survival_table(spec, months: int) -> Tuple[float, ...]:
+    """Return ``(S(0), ..., S(months - 1))`` from the cached table."""
+    months = int(months)
+    if months <= 0:
+        return ()
+    return _tables(curve_key(spec), _bucket(months))[0][:months]
+
+
+def survival(spec, k: int) -> float:
+    """Return ``S(k)``; O(1) once the table covering ``k`` is cached."""
+    key = curve_key(spec)
+    return _tables(key, _bucket(k + 1))[0][k]
+
+
+def expected_lifetime(spec, months: int = None) -> float:
+    """Expected active months per customer: ``sum(S(k) for k < months)``.
+
+    With ``months=None`` the horizon is unbounded: closed form for constant churn
+    (``inf`` at zero churn), otherwise the sum until survival drops below
+    :data:`SURVIVAL_EPSILON` (capped at :data:`MAX_TABLE_MONTHS`).
+    """
+    key = curve_key(spec)
+    if months is not None:
+        months = int(months)
+        return _tables(key, _bucket(months))[1][months - 1] if months > 0 else 0.0
+    kind = key[0]
+    if kind == 'shifted_geometric':
+        return math.inf if key[1] == 0 else 1.0 / key[1]
+    if kind == 'empirical':
+        return _tables(key, _bucket(len(key[1])))[1][len(key[1]) - 1]
+    length = _MIN_TABLE_MONTHS
+    while True:
+        survival_values, cumulative = _tables(key, length)
+        if survival_values[-1] < SURVIVAL_EPSILON or length >= MAX_TABLE_MONTHS:
+            return cumulative[-1]
+        length *= 2
+
+
+def cache_info() -> Dict:
+    """Hit/miss statistics and size of the survival-table cache."""
+    with _tables_lock:
+        return dict(_tables_stats, tables=len(_tables_cache), max_months=MAX_CACHED_MONTHS)
+
+
+def clear_cache() -> None:
+    with _tables_lock:
+        _tables_cache.clear()
+        _tables_stats.update(hits=0, misses=0, months=0)
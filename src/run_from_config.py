@@ -1,61 +1,372 @@
-"""Run projection from a JSON config and export CSV and optional plot."""
+"""Run projection from a JSON config and export CSV and optional plot.
+
+Single config (the config's ``export_csv``, ``export`` (any export.py format) and
+``export_plot`` paths are used)::
+
+    python src/run_from_config.py sample_config.json
+
+Batch mode runs a directory of ``*.json`` files, a glob, or a JSON-lines file
+(one config per line, named by its ``name`` key or line number) across a
+process pool, writes ``<out-dir>/<name>.csv`` per config (or ``.npz`` /
+``.arrow`` / ``.parquet`` with ``--format``, see export.py) and prints a summary
+of break-even month and final profit::
+
+    python src/run_from_config.py --batch configs/ --out-dir out/ --combined out/all.csv
+
+``<out-dir>/manifest.json`` records a content hash of each config's inputs and
+the simulator version; configs whose hash matches and whose outputs exist are
+skipped, so reruns only compute what changed (``--force`` recomputes all).
+
+A config with a ``products`` list is a portfolio: the products share the
+config's ``fixed_costs`` (see portfolio.py), and the exported series is the
+company-wide total::
+
+    {"fixed_costs": 50000, "months": 36, "allocation": "revenue",
+     "products": [{"name": "basic", "price": 20, "variable_cost": 5, "initial_sales": 500},
+                  {"name": "pro", "price": 90, "variable_cost": 30, "initial_sales": 40,
+                   "monthly_growth": 0.05, "fixed_costs": 8000}]}
+
+Imports are kept to the standard-library projection path for fast startup;
+NumPy is only loaded for portfolio configs and matplotlib when a plot is requested.
+"""
 import json
-import csv
+import os
 import sys
-from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(ROOT / 'src'))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
 
-from simulator import project_months
+from simulator import SIMULATOR_VERSION, break_even_month, project_months
+from results import ProjectionResult
+from export import EXPORT_FORMATS, export_result, write_csv
 
+CSV_FIELDS = ProjectionResult.fields
+CONFIG_PARAMETERS = ('fixed_costs', 'price', 'variable_cost', 'initial_sales', 'monthly_growth', 'months')
+MANIFEST_NAME = 'manifest.json'
+SUMMARY_FIELDS = ('name', 'status', 'break_even_month', 'final_cumulative_profit', 'error')
 
-def load_config(path: Path):
-    with path.open() as f:
+
+def load_config(path):
+    with open(path) as f:
         return json.load(f)
 
 
-def export_csv(path: Path, results):
-    with path.open('w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(["month", "units", "revenue", "variable_costs", "profit", "cumulative_profit"])
-        for r in results:
-            writer.writerow([r["month"], r["units"], f"{r['revenue']:.2f}", f"{r['variable_costs']:.2f}", f"{r['profit']:.2f}", f"{r['cumulative_profit']:.2f}"])
+def config_args(cfg) -> tuple:
+    """Positional ``project_months`` arguments for a config (CLI defaults for gaps)."""
+    return (
+        float(cfg['fixed_costs']),
+        float(cfg['price']),
+        float(cfg['variable_cost']),
+        int(cfg.get('initial_sales', 100)),
+        float(cfg.get('monthly_growth', 0.0)),
+        int(cfg.get('months', 12)),
+    )
+
+
+def validate_config(cfg) -> tuple:
+    """Return :func:`config_args` for ``cfg``; raise ValueError if it is incomplete or invalid."""
+    missing = [name for name in ('fixed_costs', 'price', 'variable_cost') if name not in cfg]
+    if missing:
+        raise ValueError(f"Missing config values: {', '.join(missing)}")
+    args = config_args(cfg)
+    if args[0] < 0 or args[1] < 0 or args[2] < 0:
+        raise ValueError('Config values must be non-negative')
+    if args[5] < 1:
+        raise ValueError('months must be >= 1')
+    return args
+
+
+def portfolio_config(cfg) -> dict:
+    """``portfolio.simulate_portfolio`` arguments for a portfolio config (one with ``products``).
+
+    Raises ValueError if it is incomplete or invalid.
+    """
+    from portfolio import normalize_products
+
+    if 'fixed_costs' not in cfg:
+        raise ValueError('Missing config values: fixed_costs')
+    args = {
+        'products': normalize_products(cfg['products']),
+        'fixed_costs': float(cfg['fixed_costs']),
+        'months': int(cfg.get('months', 12)),
+        'allocation': cfg.get('allocation', 'revenue'),
+    }
+    if args['fixed_costs'] < 0:
+        raise ValueError('Config values must be non-negative')
+    if args['months'] < 1:
+        raise ValueError('months must be >= 1')
+    return args
+
+
+def project_config(cfg):
+    """Project a config; return ``(results, portfolio)``.
+
+    ``portfolio`` is the ``simulate_portfolio`` summary for portfolio configs
+    (results are then the company-wide totals) and None otherwise.
+    """
+    if 'products' in cfg:
+        from portfolio import simulate_portfolio
+
+        portfolio = simulate_portfolio(**portfolio_config(cfg))
+        return portfolio['results'], portfolio
+    return project_months(*validate_config(cfg)), None
+
+
+def config_key(cfg, plot: bool = False, fmt: str = 'csv') -> str:
+    """Content hash of a config's projection inputs, outputs and the simulator version."""
+    import hashlib
+
+    inputs = portfolio_config(cfg) if 'products' in cfg else dict(zip(CONFIG_PARAMETERS, config_args(cfg)))
+    payload = json.dumps([SIMULATOR_VERSION, inputs, bool(plot), fmt], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def export_csv(path, results):
+    write_csv(path, results)
+
+
+def export_plot(path, results):
+    from plot import make_projection_plot_bytes
+
+    with open(path, 'wb') as f:
+        f.write(make_projection_plot_bytes(results).getvalue())
+
+
+def iter_batch_configs(source):
+    """Yield ``(name, config)`` from a directory of ``*.json``, a glob, or a ``.jsonl`` file."""
+    import glob
+
+    if os.path.isdir(source):
+        paths = sorted(glob.glob(os.path.join(source, '*.json')))
+    elif source.endswith('.jsonl'):
+        stem = os.path.splitext(os.path.basename(source))[0]
+        with open(source) as f:
+            for lineno, line in enumerate(f, start=1):
+                if line.strip():
+                    cfg = json.loads(line)
+                    yield str(cfg.get('name', f'{stem}-{lineno}')), cfg
+        return
+    else:
+        paths = sorted(glob.glob(source))
+    for path in paths:
+        if os.path.basename(path) == MANIFEST_NAME:
+            continue
+        yield os.path.splitext(os.path.basename(path))[0], load_config(path)
+
 
+def run_one(job):
+    """Project one batch config and write its outputs; return its summary row.
 
-def main():
-    cfg_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path('sample_config.json')
-    if not cfg_path.exists():
+    ``job`` is ``(name, config, out_dir, plot, fmt)``. Runs in a pool worker, so
+    failures are reported in the row instead of raised.
+    """
+    name, cfg, out_dir, plot, fmt = job
+    row = {'name': name, 'status': 'computed', 'break_even_month': None, 'final_cumulative_profit': None,
+           'error': ''}
+    try:
+        results, _ = project_config(cfg)
+        export_result(os.path.join(out_dir, f'{name}.{fmt}'), results, fmt)
+        if plot:
+            export_plot(os.path.join(out_dir, f'{name}.png'), results)
+    except Exception as e:  # reported per config; one bad config must not stop the batch
+        row.update(status='failed', error=str(e))
+        return row
+    row['break_even_month'] = break_even_month(results)
+    row['final_cumulative_profit'] = round(results.column('cumulative_profit')[-1], 2)
+    return row
+
+
+def _outputs_exist(out_dir, name, plot, fmt):
+    return (os.path.exists(os.path.join(out_dir, f'{name}.{fmt}'))
+            and (not plot or os.path.exists(os.path.join(out_dir, f'{name}.png'))))
+
+
+def _write_json_atomic(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def run_batch(source, out_dir, max_workers: int = None, force: bool = False, plot: bool = False,
+              combined: str = None, fmt: str = 'csv'):
+    """Run every config from ``source`` into ``out_dir``; return the summary rows in input order.
+
+    Configs whose content hash matches the manifest and whose outputs exist are
+    reported with status ``fresh`` from the manifest instead of being recomputed.
+    ``combined`` (a CSV of every row) requires ``fmt='csv'``. Raises ValueError if
+    two configs share a name or the options conflict.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}; choose one of {', '.join(EXPORT_FORMATS)}")
+    if combined and fmt != 'csv':
+        raise ValueError("A combined output is only written for --format csv")
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = {} if force or not os.path.exists(manifest_path) else load_config(manifest_path)
+
+    rows = {}
+    order = []
+    pending = []
+    keys = {}
+    for name, cfg in iter_batch_configs(source):
+        if name in rows or name in keys:
+            raise ValueError(f"Duplicate config name: {name}")
+        order.append(name)
+        try:
+            if name in ('', '.', '..') or os.path.basename(name) != name:
+                raise ValueError(f"name must be a plain file name, got {name!r}")
+            keys[name] = config_key(cfg, plot, fmt)
+        except (KeyError, ValueError, TypeError) as e:
+            rows[name] = {'name': name, 'status': 'failed', 'break_even_month': None,
+                          'final_cumulative_profit': None, 'error': f'Invalid config: {e}'}
+            continue
+        entry = manifest.get(name)
+        if entry and entry['key'] == keys[name] and _outputs_exist(out_dir, name, plot, fmt):
+            rows[name] = dict(entry['summary'], status='fresh')
+        else:
+            pending.append((name, cfg, out_dir, plot, fmt))
+
+    if len(pending) <= 1 or max_workers == 1:
+        computed = [run_one(job) for job in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            # A few chunks per worker: amortizes pickling over many small configs
+            # while still balancing uneven horizons.
+            chunksize = max(1, len(pending) // (pool._max_workers * 4))
+            computed = list(pool.map(run_one, pending, chunksize=chunksize))
+    for row in computed:
+        rows[row['name']] = row
+
+    manifest = {name: {'key': keys[name], 'summary': {k: v for k, v in rows[name].items() if k != 'status'}}
+                for name in order if rows[name]['status'] != 'failed'}
+    _write_json_atomic(manifest_path, manifest)
+    summary = [rows[name] for name in order]
+    if combined:
+        write_combined(combined, out_dir, [row['name'] for row in summary if row['status'] != 'failed'])
+    return summary
+
+
+def write_combined(path, out_dir, names):
+    """Concatenate per-config CSVs into one file with a leading ``config`` column."""
+    with open(path, 'w', newline='') as out:
+        out.write(','.join(('config',) + tuple(CSV_FIELDS)) + '\n')
+        for name in names:
+            with open(os.path.join(out_dir, f'{name}.csv')) as f:
+                next(f)
+                for line in f:
+                    out.write(f'{name},{line}')
+
+
+def write_summary(path, rows):
+    import csv
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_summary(rows):
+    width = max([len('config')] + [len(row['name']) for row in rows])
+    print(f"{'config':<{width}} | {'status':<8} | {'break-even':>10} | {'final profit':>14}")
+    for row in rows:
+        if row['status'] == 'failed':
+            print(f"{row['name']:<{width}} | {'failed':<8} | {row['error']}")
+            continue
+        month = row['break_even_month'] or 'never'
+        print(f"{row['name']:<{width}} | {row['status']:<8} | {month:>10} | {row['final_cumulative_profit']:>14,.2f}")
+    counts = {status: sum(row['status'] == status for row in rows) for status in ('computed', 'fresh', 'failed')}
+    print(f"\nComputed {counts['computed']}, up to date {counts['fresh']}, failed {counts['failed']}")
+
+
+def print_portfolio(portfolio):
+    """Print per-product contribution and break-even, then the portfolio totals."""
+    width = max([len('Product')] + [len(p['name']) for p in portfolio['products']])
+    print(f"{'Product':<{width}} | {'Contribution':>14} | {'Allocated fixed':>15} | {'Break-even':>10}")
+    for product in portfolio['products']:
+        month = product['break_even_month'] or 'never'
+        print(f"{product['name']:<{width}} | {product['contribution']:>14,.2f} | "
+              f"{product['allocated_fixed_costs']:>15,.2f} | {month:>10}")
+    month = portfolio['break_even_month'] or 'never'
+    print(f"Portfolio break-even month: {month}; final cumulative profit: "
+          f"{portfolio['final_cumulative_profit']:,.2f} ({portfolio['allocation']} allocation)\n")
+
+
+def run_single(cfg_path):
+    if not os.path.exists(cfg_path):
         print(f"Config not found: {cfg_path}")
         sys.exit(2)
     cfg = load_config(cfg_path)
-    # Basic validation
-    if cfg.get('fixed_costs', 0) < 0 or cfg.get('price', 0) < 0 or cfg.get('variable_cost', 0) < 0:
-        print('Config values must be non-negative')
+    try:
+        results, portfolio = project_config(cfg)
+    except ValueError as e:
+        print(e)
         sys.exit(2)
-    results = project_months(cfg['fixed_costs'], cfg['price'], cfg['variable_cost'], cfg.get('initial_sales', 100), cfg.get('monthly_growth', 0.0), cfg.get('months', 12))
+    if portfolio:
+        print_portfolio(portfolio)
 
-    out_csv = Path(cfg.get('export_csv', 'from_config_projection.csv'))
+    out_csv = cfg.get('export_csv', 'from_config_projection.csv')
     export_csv(out_csv, results)
     print(f"Exported CSV to {out_csv}")
 
+    out_export = cfg.get('export')
+    if out_export:
+        try:
+            fmt = export_result(out_export, results)
+            print(f"Exported {fmt} to {out_export}")
+        except (ImportError, ValueError) as e:
+            print(f"Could not export {out_export}: {e}")
+
     out_plot = cfg.get('export_plot')
     if out_plot:
-        # call plot.py to create a PNG if matplotlib is available
         try:
-            from plot import main as plot_main
-            # temporary adjust argv for plot module
-            import sys as _sys
-            _sys_argv_backup = _sys.argv
-            _sys.argv = ['plot.py', '--fixed-costs', str(cfg['fixed_costs']), '--price', str(cfg['price']), '--variable-cost', str(cfg['variable_cost']), '--initial-sales', str(cfg.get('initial_sales', 100)), '--monthly-growth', str(cfg.get('monthly_growth', 0.0)), '--months', str(cfg.get('months', 12)), '--out', out_plot]
-            try:
-                plot_main()
-            finally:
-                _sys.argv = _sys_argv_backup
+            export_plot(out_plot, results)
             print(f"Saved plot to {out_plot}")
         except Exception as e:
             print(f"Could not create plot: {e}")
 
 
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) <= 1 and not any(arg.startswith('-') for arg in argv):
+        # Plain single-config call: skip building the parser (argparse is most of our startup).
+        run_single(argv[0] if argv else 'sample_config.json')
+        return
+    import argparse
+
+    p = argparse.ArgumentParser(description="Run projections from JSON config files")
+    p.add_argument("config", nargs="?", default="sample_config.json", help="Single config file")
+    p.add_argument("--batch", default="", help="Directory of *.json configs, a glob, or a .jsonl file")
+    p.add_argument("--out-dir", default="batch_output", help="Batch: directory for per-config outputs")
+    p.add_argument("--workers", type=int, default=None, help="Batch: process pool size (default: CPU count)")
+    p.add_argument("--force", action="store_true", help="Batch: recompute configs that are up to date")
+    p.add_argument("--plots", action="store_true", help="Batch: also write <name>.png per config")
+    p.add_argument("--format", default="csv", choices=EXPORT_FORMATS,
+                   help="Batch: per-config output format (arrow/parquet need pyarrow)")
+    p.add_argument("--combined", default="", help="Batch: also write all rows to this CSV with a config column")
+    p.add_argument("--summary", default="", help="Batch: write the summary table to this CSV")
+    args = p.parse_args(argv)
+
+    if not args.batch:
+        run_single(args.config)
+        return
+    try:
+        rows = run_batch(args.batch, args.out_dir, max_workers=args.workers, force=args.force, plot=args.plots,
+                         fmt=args.format,
+                         combined=args.combined or None)
+    except (OSError, ValueError) as e:
+        print(f"Batch failed: {e}")
+        sys.exit(2)
+    print_summary(rows)
+    if args.summary:
+        write_summary(args.summary, rows)
+    if any(row['status'] == 'failed' for row in rows):
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     main()
@@ -1,11 +1,34 @@
-"""Scenario management: save and load simulation scenarios to/from JSON files."""
+"""Scenario management: save and load simulation scenarios.
+
+Scenarios are stored through a pluggable backend:
+
+- ``FileScenarioStore`` (default): one JSON file per scenario under ``SCENARIOS_DIR``.
+- ``SQLiteScenarioStore``: a single SQLite database in WAL mode, indexed by name and
+  tag, for stores with tens of thousands of scenarios.
+
+Select the backend with ``SCENARIO_STORE=file|sqlite`` (and ``SCENARIO_DB`` for the
+database path) or call ``set_store``. Existing JSON files are imported with
+``python src/scenarios.py migrate``.
+"""
+import argparse
+import bisect
 import json
 import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 SCENARIOS_DIR = Path(__file__).parent.parent / "scenarios"
+SCENARIO_DB = SCENARIOS_DIR / "scenarios.db"
+
+# Key under which the file backend keeps tags inside a scenario's JSON document.
+_TAGS_KEY = "_tags"
+# Coarsest directory mtime resolution we allow for (FAT has 2 s); see FileScenarioStore.
+MTIME_GRANULARITY_NS = 2_000_000_000
 
 
 def ensure_scenarios_dir():
@@ -13,36 +36,377 @@ def ensure_scenarios_dir():
     SCENARIOS_DIR.mkdir(exist_ok=True)
 
 
-def save_scenario(name: str, params: Dict) -> str:
-    """Save a scenario to disk. Returns the file path."""
-    ensure_scenarios_dir()
-    filepath = SCENARIOS_DIR / f"{name}.json"
-    with open(filepath, 'w') as f:
-        json.dump(params, f, indent=2)
-    return str(filepath)
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class ScenarioStore(ABC):
+    """Interface shared by the scenario storage backends."""
+
+    @abstractmethod
+    def save(self, name: str, params: Dict, tags: Optional[Iterable[str]] = None) -> str:
+        """Save a scenario and return where it was stored."""
+
+    @abstractmethod
+    def load(self, name: str) -> Dict:
+        """Return a scenario's params; raises FileNotFoundError if it does not exist."""
+
+    @abstractmethod
+    def list(self, prefix: str = None, tag: str = None, limit: int = None, offset: int = 0) -> List[str]:
+        """Return scenario names sorted by name, optionally filtered and paginated."""
+
+    @abstractmethod
+    def count(self, prefix: str = None, tag: str = None) -> int:
+        """Return how many scenarios match the filters."""
+
+    @abstractmethod
+    def delete(self, name: str) -> bool:
+        """Delete a scenario. Returns True if deleted, False if not found."""
+
+    @abstractmethod
+    def tags(self, name: str) -> List[str]:
+        """Return the tags of a scenario (empty if untagged)."""
+
+    @abstractmethod
+    def save_results(self, name: str, key: str, data: bytes) -> None:
+        """Persist precomputed results for a scenario, stamped with ``key``."""
+
+    @abstractmethod
+    def load_results(self, name: str) -> Optional[Tuple[str, bytes]]:
+        """Return ``(key, data)`` of the persisted results, or None if there are none."""
+
+
+class FileScenarioStore(ScenarioStore):
+    """One ``<name>.json`` file per scenario.
+
+    The sorted name list is cached and only rebuilt when the directory's mtime or
+    size changes, so listing and prefix filtering do not glob the directory on every
+    call. A listing taken within :data:`MTIME_GRANULARITY_NS` of the directory's
+    mtime is not trusted, since another process could change the directory again
+    without moving a coarse mtime.
+    """
+
+    def __init__(self, directory: Path = None):
+        self.directory = Path(directory) if directory is not None else SCENARIOS_DIR
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._names_stamp = None
+        self._dir_ready = False
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+
+    def _results_path(self, name: str) -> Path:
+        return self.directory / f"{name}.proj"
+
+    def _ensure_dir(self):
+        if not self._dir_ready:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._dir_ready = True
+
+    def _invalidate_names(self):
+        with self._lock:
+            self._names_stamp = None
+
+    def _sorted_names(self) -> List[str]:
+        try:
+            stat = self.directory.stat()
+        except FileNotFoundError:
+            return []
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamp != self._names_stamp:
+                scanned_at = time.time_ns()
+                with os.scandir(self.directory) as entries:
+                    self._names = sorted(e.name[:-5] for e in entries
+                                         if e.name.endswith(".json") and e.is_file())
+                # Keep the stamp only once the mtime is safely older than the scan.
+                racy = scanned_at - stat.st_mtime_ns < MTIME_GRANULARITY_NS
+                self._names_stamp = None if racy else stamp
+            return self._names
+
+    def _matching(self, prefix: str = None, tag: str = None) -> List[str]:
+        names = self._sorted_names()
+        if prefix:
+            names = names[bisect.bisect_left(names, prefix):bisect.bisect_left(names, _prefix_upper_bound(prefix))]
+        if tag is not None:
+            names = [n for n in names if tag in self.tags(n)]
+        return names
+
+    def save(self, name: str, params: Dict, tags: Optional[Iterable[str]] = None) -> str:
+        self._ensure_dir()
+        document = dict(params)
+        if tags:
+            document[_TAGS_KEY] = sorted(set(tags))
+        filepath = self._path(name)
+        with open(filepath, 'w') as f:
+            json.dump(document, f, indent=2)
+        self._invalidate_names()
+        return str(filepath)
+
+    def _read(self, name: str) -> Dict:
+        filepath = self._path(name)
+        if not filepath.exists():
+            raise FileNotFoundError(f"Scenario '{name}' not found")
+        with open(filepath, 'r') as f:
+            return json.load(f)
+
+    def load(self, name: str) -> Dict:
+        document = self._read(name)
+        document.pop(_TAGS_KEY, None)
+        return document
+
+    def tags(self, name: str) -> List[str]:
+        return list(self._read(name).get(_TAGS_KEY, []))
+
+    def list(self, prefix: str = None, tag: str = None, limit: int = None, offset: int = 0) -> List[str]:
+        names = self._matching(prefix, tag)
+        end = None if limit is None else offset + limit
+        return list(names[offset:end])
+
+    def count(self, prefix: str = None, tag: str = None) -> int:
+        return len(self._matching(prefix, tag))
+
+    def delete(self, name: str) -> bool:
+        filepath = self._path(name)
+        if filepath.exists():
+            filepath.unlink()
+            self._results_path(name).unlink(missing_ok=True)
+            self._invalidate_names()
+            return True
+        return False
+
+    def save_results(self, name: str, key: str, data: bytes) -> None:
+        # Written beside the scenario as "<key>\n<data>"; the rename keeps readers
+        # from ever seeing a half-written file.
+        self._ensure_dir()
+        target = self._results_path(name)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(key.encode('ascii') + b"\n")
+            f.write(data)
+        os.replace(tmp, target)
+
+    def load_results(self, name: str) -> Optional[Tuple[str, bytes]]:
+        try:
+            with open(self._results_path(name), 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        key, sep, data = raw.partition(b"\n")
+        if not sep:
+            return None
+        return key.decode('ascii'), data
+
+
+class SQLiteScenarioStore(ScenarioStore):
+    """Scenarios in one SQLite database (WAL mode), indexed by name and tag.
+
+    Listing uses the primary-key index for prefix ranges and LIMIT/OFFSET for
+    pagination. Each thread gets its own connection.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scenarios (
+            name TEXT PRIMARY KEY,
+            params TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS scenario_tags (
+            tag TEXT NOT NULL,
+            name TEXT NOT NULL REFERENCES scenarios(name) ON DELETE CASCADE,
+            PRIMARY KEY (tag, name)
+        );
+        CREATE INDEX IF NOT EXISTS scenario_tags_name ON scenario_tags(name);
+        CREATE TABLE IF NOT EXISTS scenario_results (
+            name TEXT PRIMARY KEY REFERENCES scenarios(name) ON DELETE CASCADE,
+            key TEXT NOT NULL,
+            data BLOB NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path is not None else SCENARIO_DB
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(self.SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _where(self, prefix: str = None, tag: str = None):
+        clauses, args = [], []
+        if prefix:
+            clauses.append("s.name >= ? AND s.name < ?")
+            args += [prefix, _prefix_upper_bound(prefix)]
+        if tag is not None:
+            clauses.append("s.name IN (SELECT name FROM scenario_tags WHERE tag = ?)")
+            args.append(tag)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def save(self, name: str, params: Dict, tags: Optional[Iterable[str]] = None) -> str:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO scenarios (name, params, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET params = excluded.params, updated_at = excluded.updated_at",
+                (name, json.dumps(params), time.time()),
+            )
+            conn.execute("DELETE FROM scenario_tags WHERE name = ?", (name,))
+            conn.executemany("INSERT INTO scenario_tags (tag, name) VALUES (?, ?)",
+                             [(tag, name) for tag in sorted(set(tags or ()))])
+        return f"{self.path}#{name}"
+
+    def save_many(self, scenarios: Iterable[tuple]) -> int:
+        """Insert ``(name, params, tags)`` tuples in a single transaction; returns the count."""
+        conn = self._connect()
+        count = 0
+        now = time.time()
+        with conn:
+            for name, params, tags in scenarios:
+                conn.execute(
+                    "INSERT INTO scenarios (name, params, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET params = excluded.params, updated_at = excluded.updated_at",
+                    (name, json.dumps(params), now),
+                )
+                conn.execute("DELETE FROM scenario_tags WHERE name = ?", (name,))
+                conn.executemany("INSERT INTO scenario_tags (tag, name) VALUES (?, ?)",
+                                 [(tag, name) for tag in sorted(set(tags or ()))])
+                count += 1
+        return count
+
+    def load(self, name: str) -> Dict:
+        row = self._connect().execute("SELECT params FROM scenarios WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Scenario '{name}' not found")
+        return json.loads(row[0])
+
+    def tags(self, name: str) -> List[str]:
+        rows = self._connect().execute("SELECT tag FROM scenario_tags WHERE name = ? ORDER BY tag", (name,))
+        return [r[0] for r in rows]
+
+    def list(self, prefix: str = None, tag: str = None, limit: int = None, offset: int = 0) -> List[str]:
+        where, args = self._where(prefix, tag)
+        sql = f"SELECT s.name FROM scenarios s{where} ORDER BY s.name LIMIT ? OFFSET ?"
+        rows = self._connect().execute(sql, args + [-1 if limit is None else limit, offset])
+        return [r[0] for r in rows]
+
+    def count(self, prefix: str = None, tag: str = None) -> int:
+        where, args = self._where(prefix, tag)
+        return self._connect().execute(f"SELECT COUNT(*) FROM scenarios s{where}", args).fetchone()[0]
+
+    def delete(self, name: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM scenarios WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def save_results(self, name: str, key: str, data: bytes) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO scenario_results (name, key, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET key = excluded.key, data = excluded.data",
+                (name, key, sqlite3.Binary(data)),
+            )
+
+    def load_results(self, name: str) -> Optional[Tuple[str, bytes]]:
+        row = self._connect().execute("SELECT key, data FROM scenario_results WHERE name = ?", (name,)).fetchone()
+        return None if row is None else (row[0], bytes(row[1]))
+
+
+_store: Optional[ScenarioStore] = None
+_store_lock = threading.Lock()
+
+
+def create_store(kind: str = None) -> ScenarioStore:
+    """Create the backend named by ``kind`` or the ``SCENARIO_STORE`` environment variable."""
+    kind = kind or os.environ.get("SCENARIO_STORE", "file")
+    if kind == "file":
+        return FileScenarioStore(os.environ.get("SCENARIOS_DIR") or SCENARIOS_DIR)
+    if kind == "sqlite":
+        return SQLiteScenarioStore(os.environ.get("SCENARIO_DB") or SCENARIO_DB)
+    raise ValueError(f"Unknown scenario store: {kind}")
+
+
+def get_store() -> ScenarioStore:
+    """Return the process-wide scenario store, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_store()
+    return _store
+
+
+def set_store(store: Optional[ScenarioStore]) -> None:
+    """Replace the process-wide store (None resets to the environment default)."""
+    global _store
+    _store = store
+
+
+def save_scenario(name: str, params: Dict, tags: Optional[Iterable[str]] = None) -> str:
+    """Save a scenario. Returns where it was stored."""
+    return get_store().save(name, params, tags)
 
 
 def load_scenario(name: str) -> Dict:
-    """Load a scenario from disk by name."""
-    ensure_scenarios_dir()
-    filepath = SCENARIOS_DIR / f"{name}.json"
-    if not filepath.exists():
-        raise FileNotFoundError(f"Scenario '{name}' not found")
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    """Load a scenario by name."""
+    return get_store().load(name)
+
 
+def list_scenarios(prefix: str = None, tag: str = None, limit: int = None, offset: int = 0) -> List[str]:
+    """Return saved scenario names sorted by name, optionally filtered by prefix/tag and paginated."""
+    return get_store().list(prefix=prefix, tag=tag, limit=limit, offset=offset)
 
-def list_scenarios() -> List[str]:
-    """Return list of saved scenario names (without .json extension)."""
-    ensure_scenarios_dir()
-    return [f.stem for f in SCENARIOS_DIR.glob("*.json")]
+
+def count_scenarios(prefix: str = None, tag: str = None) -> int:
+    """Return the number of saved scenarios matching the filters."""
+    return get_store().count(prefix=prefix, tag=tag)
 
 
 def delete_scenario(name: str) -> bool:
-    """Delete a scenario file. Returns True if deleted, False if not found."""
-    ensure_scenarios_dir()
-    filepath = SCENARIOS_DIR / f"{name}.json"
-    if filepath.exists():
-        filepath.unlink()
-        return True
-    return False
+    """Delete a scenario. Returns True if deleted, False if not found."""
+    return get_store().delete(name)
+
+
+def migrate_file_store(source: FileScenarioStore, target: SQLiteScenarioStore, batch_size: int = 1000) -> int:
+    """Copy every scenario from a file store into a SQLite store; returns the number copied."""
+    copied = 0
+    batch = []
+    for name in source.list():
+        document = source._read(name)
+        tags = document.pop(_TAGS_KEY, [])
+        batch.append((name, document, tags))
+        if len(batch) >= batch_size:
+            copied += target.save_many(batch)
+            batch = []
+    if batch:
+        copied += target.save_many(batch)
+    return copied
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Scenario store maintenance")
+    sub = p.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Import scenarios/*.json into the SQLite store")
+    migrate.add_argument("--dir", type=str, default=str(SCENARIOS_DIR), help="Directory of JSON scenarios")
+    migrate.add_argument("--db", type=str, default=str(SCENARIO_DB), help="SQLite database to create/update")
+    args = p.parse_args(argv)
+
+    if args.command == "migrate":
+        copied = migrate_file_store(FileScenarioStore(Path(args.dir)), SQLiteScenarioStore(Path(args.db)))
+        print(f"Imported {copied} scenarios into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Time-varying parameter schedules for ``project_months``.
+
+A schedule changes parameters over the horizon without listing a value per
+month. It is a plain spec naming any of ``price``, ``variable_cost``,
+``monthly_growth`` and ``monthly_fixed_costs``, plus optional ``seasonality``::
+
+    {
+        "price": [{"from": 13, "value": 55},                           # step up in year 2
+                  {"from": 25, "value": 55, "to": 70, "until": 36}],   # ramp over year 3
+        "monthly_fixed_costs": 2000,                                   # every month
+        "seasonality": [0.8, 0.9, 1.0, 1.0, 1.0, 1.1, 1.2, 1.2, 1.0, 1.0, 1.1, 1.5]
+    }
+
+Each parameter is a number (constant) or a list of segments. A segment holds
+``value`` from month ``from`` until the next segment starts. With ``to`` and
+``until`` it ramps linearly to reach ``to`` at month ``until`` and then holds
+``to``. Months before the first segment use the plain ``project_months``
+argument. ``monthly_fixed_costs`` (default 0) is subtracted from profit every
+month, on top of the one-off ``fixed_costs``. ``seasonality`` multipliers are
+cycled from month 1 and scale the units sold in each month, truncated to whole
+units; the growth trend itself is unaffected.
+
+Specs normalize to hashable keys (:func:`schedule_key`), so they can be part of a
+cache key. The evaluator works per segment rather than per month: each
+parameter is filled one segment at a time, and the money columns are computed as
+whole NumPy columns. Only the units recurrence steps month by month, because
+``int(units * (1 + growth))`` truncates. It jumps ahead once units stop changing
+within a segment. An all-constant schedule gives exactly the same result as
+``project_months``. NumPy is imported only when a schedule is evaluated, so plain
+projections stay standard library only.
+"""
+from itertools import repeat
+from typing import Dict, Iterator, List, Tuple
+
+from results import ProjectionResult
+
+SCHEDULED_PARAMETERS = ('price', 'variable_cost', 'monthly_growth', 'monthly_fixed_costs')
+
+# A parameter schedule: ((start_month, value, slope per month), ...), sorted by start.
+Segments = Tuple[Tuple[int, float, float], ...]
+
+
+def segments_key(spec) -> Segments:
+    """Normalize one parameter's schedule (a number or a list of segments) into segments.
+
+    Raises ValueError for months below 1, duplicate starts or a ramp that ends
+    before it starts.
+    """
+    if isinstance(spec, tuple) and all(isinstance(s, tuple) for s in spec):
+        return spec
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return ((1, float(spec), 0.0),)
+    if not isinstance(spec, list) or not spec:
+        raise ValueError(f"Invalid schedule: {spec!r}; use a number or a list of segments")
+    raw = []
+    for segment in spec:
+        if not isinstance(segment, dict) or 'value' not in segment:
+            raise ValueError(f"Invalid schedule segment: {segment!r}; expected {{'from', 'value'}}")
+        start = int(segment.get('from', 1))
+        if start < 1:
+            raise ValueError("Schedule segments start at month 1 or later")
+        raw.append((start, float(segment['value']), segment))
+    raw.sort(key=lambda item: item[0])
+    starts = [start for start, _, _ in raw]
+    if len(set(starts)) != len(starts):
+        raise ValueError("Schedule segments must start in different months")
+
+    segments = []
+    for i, (start, value, segment) in enumerate(raw):
+        next_start = starts[i + 1] if i + 1 < len(raw) else None
+        if 'to' not in segment and 'until' not in segment:
+            segments.append((start, value, 0.0))
+            continue
+        if 'to' not in segment or 'until' not in segment:
+            raise ValueError("A ramp needs both 'to' and 'until'")
+        until, target = int(segment['until']), float(segment['to'])
+        if until <= start:
+            raise ValueError("A ramp's 'until' must be after its 'from'")
+        segments.append((start, value, (target - value) / (until - start)))
+        if next_start is None or next_start > until + 1:
+            segments.append((until + 1, target, 0.0))
+    return tuple(segments)
+
+
+def schedule_key(spec) -> Tuple:
+    """Normalize a whole schedule spec into a hashable ``((name, segments or values), ...)`` key."""
+    if isinstance(spec, tuple):
+        return spec
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid schedule: {spec!r}")
+    unknown = sorted(set(spec) - set(SCHEDULED_PARAMETERS) - {'seasonality'})
+    if unknown:
+        raise ValueError(f"Unknown scheduled parameters: {', '.join(unknown)}; "
+                         f"choose from {', '.join(SCHEDULED_PARAMETERS + ('seasonality',))}")
+    key = [(name, segments_key(spec[name])) for name in SCHEDULED_PARAMETERS if name in spec]
+    if spec.get('seasonality') is not None:
+        factors = tuple(float(v) for v in spec['seasonality'])
+        if not factors or any(v < 0 for v in factors):
+            raise ValueError("seasonality must be a non-empty list of multipliers >= 0")
+        key.append(('seasonality', factors))
+    return tuple(key)
+
+
+def runs(segments: Segments, base: float, months: int) -> Iterator[Tuple[int, int, float, float]]:
+    """Yield ``(start, end, value, slope)`` runs covering months ``1..months`` (``end`` exclusive).
+
+    Months before the first segment take ``base``.
+    """
+    if not segments or segments[0][0] > 1:
+        segments = ((1, float(base), 0.0),) + tuple(segments)
+    for i, (start, value, slope) in enumerate(segments):
+        end = min(segments[i + 1][0] if i + 1 < len(segments) else months + 1, months + 1)
+        if start < end:
+            yield start, end, value, slope
+
+
+def expand(segments: Segments, base: float, months: int):
+    """Per-month values of a schedule, as a float64 NumPy array of length ``months``."""
+    import numpy as np
+
+    values = np.empty(months, dtype=np.float64)
+    for start, end, value, slope in runs(segments, base, months):
+        if slope:
+            values[start - 1:end - 1] = value + slope * np.arange(end - start, dtype=np.float64)
+        else:
+            values[start - 1:end - 1] = value
+    return values
+
+
+def _trend_units(initial_sales, growth: Segments, base_growth: float, months: int) -> List:
+    """Units before seasonality: ``int(units * (1 + growth))`` stepped per month.
+
+    The truncation has no closed form, so this is the one per-month loop; a run of
+    constant growth is cut short once units reach a fixed point.
+    """
+    units = []
+    append = units.append
+    unit = initial_sales
+    for start, end, value, slope in runs(growth, base_growth, months):
+        if slope:
+            for i in range(end - start):
+                append(unit)
+                unit = int(unit * (1 + (value + slope * i)))
+            continue
+        factor = 1 + value
+        for m in range(start, end):
+            append(unit)
+            following = int(unit * factor)
+            if following == unit:
+                units.extend(repeat(unit, end - m - 1))
+                break
+            unit = following
+    return units
+
+
+def project_scheduled(fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
+                      monthly_growth: float, months: int, schedule) -> ProjectionResult:
+    """``project_months`` with the parameters named in ``schedule`` varying over time.
+
+    ``schedule`` is a spec or :func:`schedule_key`; the plain arguments give the
+    values before each parameter's first segment.
+    """
+    import numpy as np
+
+    plan: Dict = dict(schedule_key(schedule))
+    months = max(int(months), 0)
+    # float64 holds every truncated unit count exactly, as in vectorized.py.
+    units = np.array(_trend_units(initial_sales, plan.get('monthly_growth', ()), monthly_growth, months),
+                     dtype=np.float64)
+    if 'seasonality' in plan:
+        units = np.trunc(units * np.resize(np.array(plan['seasonality'], dtype=np.float64), months))
+
+    revenue = units * expand(plan.get('price', ()), price, months)
+    variable = units * expand(plan.get('variable_cost', ()), variable_cost, months)
+    profit = revenue - variable
+    if 'monthly_fixed_costs' in plan:
+        profit -= expand(plan['monthly_fixed_costs'], 0.0, months)
+    # cumsum adds left to right, so this matches the scalar running sum exactly.
+    cumulative = np.cumsum(np.concatenate(([-float(fixed_costs)], profit)))[1:]
+
+    result = ProjectionResult()
+    for name, values in (('month', np.arange(1, months + 1, dtype=np.float64)), ('units', units),
+                         ('revenue', revenue), ('variable_costs', variable), ('profit', profit),
+                         ('cumulative_profit', cumulative)):
+        result.column(name).frombytes(values.tobytes())
+    return result
@@ -0,0 +1,69 @@
+"""Production server for the web app and API.
+
+Serves ``webapp.app`` from a multi-threaded WSGI server instead of the Flask
+development server, and turns on process-pool offload for the CPU-heavy
+endpoints (sensitivity, grid, Monte Carlo, batch) so request threads stay
+responsive while a long computation runs. See workers.py.
+
+Uses waitress when it is installed and otherwise falls back to werkzeug's
+threaded server. ``wsgi.py`` exposes the same configured app for external
+servers such as gunicorn::
+
+    python src/server.py --host 0.0.0.0 --port 5000 --threads 16 --process-workers 4
+    gunicorn --chdir src -w 2 --threads 8 wsgi:application
+"""
+import argparse
+import os
+
+from webapp import app
+from workers import process_pool, warm_pool
+
+DEFAULT_THREADS = 16
+
+
+def configure(offload: bool = True, process_workers: int = None):
+    """Return ``app`` set up for production (offload on, debug off)."""
+    app.config['OFFLOAD_CPU'] = offload
+    app.config['DEBUG'] = False
+    if offload:
+        process_pool(process_workers)
+    return app
+
+
+def serve(host: str = '127.0.0.1', port: int = 5000, threads: int = DEFAULT_THREADS,
+          process_workers: int = None, offload: bool = True) -> None:
+    """Run the configured app until interrupted."""
+    application = configure(offload, process_workers)
+    if offload:
+        warm_pool()
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        waitress_serve = None
+    if waitress_serve is not None:
+        print(f"Serving on http://{host}:{port} with waitress ({threads} threads)")
+        waitress_serve(application, host=host, port=port, threads=threads)
+        return
+
+    # werkzeug's threaded server spawns a thread per request; fine for modest load.
+    from werkzeug.serving import make_server
+    print(f"Serving on http://{host}:{port} with werkzeug (thread per request; install waitress for a bounded pool)")
+    make_server(host, port, application, threaded=True).serve_forever()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Run the simulator web app and API with a production server")
+    p.add_argument("--host", default=os.environ.get("SIM_HOST", "127.0.0.1"))
+    p.add_argument("--port", type=int, default=int(os.environ.get("SIM_PORT", 5000)))
+    p.add_argument("--threads", type=int, default=int(os.environ.get("SIM_THREADS", DEFAULT_THREADS)),
+                   help="Request worker threads")
+    p.add_argument("--process-workers", type=int,
+                   default=int(os.environ["SIM_PROCESS_WORKERS"]) if os.environ.get("SIM_PROCESS_WORKERS") else None,
+                   help="Processes for CPU-heavy endpoints (default: CPU count)")
+    p.add_argument("--no-offload", action="store_true", help="Run CPU-heavy endpoints in the request thread")
+    args = p.parse_args(argv)
+    serve(args.host, args.port, args.threads, args.process_workers, offload=not args.no_offload)
+
+
+if __name__ == "__main__":
+    main()
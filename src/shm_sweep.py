@@ -0,0 +1,200 @@
+"""Process-pool sweeps that return their results through shared memory.
+
+Fanning a large sweep out with ``ProcessPoolExecutor.map`` sends every result
+back to the parent as a pickle: each worker serializes it, the parent
+deserializes it into new objects, and for a moment both copies are alive. For
+short projections that transfer costs more than the simulation.
+
+:func:`shm_sweep` allocates one ``multiprocessing.shared_memory`` block up front,
+a float64 array of shape ``(fields, scenarios, rows)``, where ``rows`` is the
+months of a projection or the five points of a sensitivity analysis. Each worker
+attaches to the block by name and writes its chunk of scenarios in place. Only the
+chunk's arguments go through the pool, and workers return nothing but a count.
+The parent then reads the block through NumPy views, without copying or
+unpickling anything.
+
+Supported functions are the ``simulator`` functions named in
+``SWEEP_FUNCTIONS``. Scenarios are positional argument tuples for that function
+and must all produce the same number of rows. Values are stored as float64, like
+the columnar results, and a field missing from a row (``final_cumulative_profit``
+with ``break_even_only``) is NaN.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+import simulator
+from results import CohortResult, ProjectionResult
+
+SENSITIVITY_FIELDS = ('change_percent', 'break_even_month', 'final_cumulative_profit')
+# Function name -> (fields, index of the ``months`` argument, or None for a fixed row count).
+SWEEP_FUNCTIONS = {
+    'project_months': (ProjectionResult.fields, 5),
+    'cohort_projection': (CohortResult.fields, 3),
+    'sensitivity_analysis': (SENSITIVITY_FIELDS, None),
+}
+# Points per sensitivity_analysis call: -r, -r/2, 0, +r/2, +r.
+SENSITIVITY_POINTS = 5
+
+
+class SweepResult:
+    """Results of :func:`shm_sweep`, one ``(scenarios, rows)`` float64 matrix per field.
+
+    When the sweep ran in worker processes the matrices are views of the shared
+    block. Every view keeps the block mapped, so views stay valid after
+    :meth:`close` or after the result itself is garbage-collected; the memory is
+    released when the last of them goes.
+    """
+
+    def __init__(self, function: str, data: np.ndarray):
+        self.function = function
+        self.fields = SWEEP_FUNCTIONS[function][0]
+        self._data = data
+
+    @property
+    def shape(self) -> tuple:
+        """``(scenarios, rows)``."""
+        return self._data.shape[1:]
+
+    def __len__(self) -> int:
+        return self._data.shape[1]
+
+    def column(self, name: str) -> np.ndarray:
+        """The ``(scenarios, rows)`` matrix of one field."""
+        return self._data[self.fields.index(name)]
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: self._data[i] for i, name in enumerate(self.fields)}
+
+    def result(self, index: int):
+        """Scenario ``index`` in the shape the simulator function returns (a copy)."""
+        rows = self._data[:, index, :]
+        if self.function == 'sensitivity_analysis':
+            return [{name: (value if name == 'final_cumulative_profit' else int(value))
+                     for name, value in zip(self.fields, point) if not np.isnan(value)}
+                    for point in rows.T.tolist()]
+        cls = ProjectionResult if self.function == 'project_months' else CohortResult
+        return cls(dict(zip(self.fields, rows.tolist())))
+
+    def close(self) -> None:
+        """Drop this result's reference to the data. Views already taken stay valid."""
+        self._data = np.empty((len(self.fields), 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SharedBlock:
+    """Array base that keeps a ``SharedMemory`` mapped for as long as any view of it exists.
+
+    ``SharedMemory`` unmaps its block when closed or garbage-collected, which would
+    leave views built on ``shm.buf`` pointing at freed memory. Views of an array
+    created from this object hold it as their ``base``, and it holds the block.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: tuple):
+        self._shm = shm
+        self._array = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        self.__array_interface__ = self._array.__array_interface__
+
+
+def _row_count(function: str, scenarios: List[tuple]) -> int:
+    if function not in SWEEP_FUNCTIONS:
+        raise ValueError(f"Unknown sweep function: {function}; choose from {', '.join(SWEEP_FUNCTIONS)}")
+    months_index = SWEEP_FUNCTIONS[function][1]
+    if months_index is None:
+        return SENSITIVITY_POINTS
+    counts = {max(int(args[months_index]), 0) for args in scenarios}
+    if len(counts) > 1:
+        raise ValueError("All scenarios in a sweep must have the same months")
+    return counts.pop() if counts else 0
+
+
+def _write(function: str, out: np.ndarray, start: int, chunk: Sequence[tuple]) -> None:
+    """Run ``function`` for each scenario in ``chunk`` and store it at ``out[:, start + i]``."""
+    fn = getattr(simulator, function)
+    fields = SWEEP_FUNCTIONS[function][0]
+    if function == 'sensitivity_analysis':
+        nan = float('nan')
+        for i, args in enumerate(chunk, start):
+            points = fn(*args)
+            for f, name in enumerate(fields):
+                out[f, i] = [point.get(name, nan) for point in points]
+        return
+    for i, args in enumerate(chunk, start):
+        result = fn(*args)
+        for f, name in enumerate(fields):
+            out[f, i] = np.frombuffer(result.column(name), dtype=np.float64)
+
+
+def _fill(name: str, shape: tuple, function: str, start: int, chunk: Sequence[tuple]) -> int:
+    """Worker side: attach to the shared block ``name`` and write one chunk into it."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        _write(function, out, start, chunk)
+        del out
+    finally:
+        shm.close()
+    return len(chunk)
+
+
+def shm_sweep(function: str, scenarios: Sequence[Sequence], max_workers: int = None, chunk_size: int = None,
+              executor=None) -> SweepResult:
+    """Evaluate ``simulator.<function>(*args)`` for every ``args`` in ``scenarios``.
+
+    ``function`` is ``project_months``, ``cohort_projection`` or
+    ``sensitivity_analysis``. Chunks of ``chunk_size`` scenarios (default: about four
+    per worker) go to ``executor`` if given, otherwise to a new
+    ``ProcessPoolExecutor(max_workers)``. A sweep that fits in one chunk, or
+    ``max_workers=1``, runs inline into a private array.
+
+    Row ``sweep.column('cumulative_profit')[i]`` equals the ``cumulative_profit``
+    column of ``project_months(*scenarios[i])``. Raises ValueError for an unknown
+    function or scenarios with different ``months``.
+    """
+    scenarios = [tuple(args) for args in scenarios]
+    rows = _row_count(function, scenarios)
+    shape = (len(SWEEP_FUNCTIONS[function][0]), len(scenarios), rows)
+
+    if chunk_size is None:
+        workers = max_workers or getattr(executor, '_max_workers', None) or os.cpu_count() or 1
+        chunk_size = max(1, len(scenarios) // (workers * 4))
+    if len(scenarios) <= chunk_size or max_workers == 1:
+        data = np.empty(shape, dtype=np.float64)
+        _write(function, data, 0, scenarios)
+        return SweepResult(function, data)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    owned = executor is None
+    pool = ProcessPoolExecutor(max_workers=max_workers) if owned else executor
+    futures = []
+    try:
+        for start in range(0, len(scenarios), chunk_size):
+            futures.append(pool.submit(_fill, shm.name, shape, function, start,
+                                       scenarios[start:start + chunk_size]))
+        for future in futures:
+            future.result()
+    except BaseException:
+        # Workers still writing must detach before the block goes; queued chunks are
+        # dropped. A caller's executor keeps running, so this can't wait on shutdown.
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        shm.close()
+        shm.unlink()
+        raise
+    finally:
+        if owned:
+            pool.shutdown(cancel_futures=True)
+    # Every worker has detached, so the name can go now; the parent's mapping stays
+    # valid while any view of it is alive.
+    shm.unlink()
+    return SweepResult(function, np.asarray(_SharedBlock(shm, shape)))
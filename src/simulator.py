@@ -1,8 +1,22 @@
 """Core simulation utilities for startup profitability and break-even analysis.
 
-Uses only standard library so it runs without extra dependencies.
+Besides the standard library it only uses sibling modules of this package
+(instrumentation, results, retention and schedules), so plain projections run
+without extra dependencies. NumPy is needed only when ``project_months`` is given
+a ``schedule``: schedules.py imports it lazily to evaluate one.
 """
-from typing import List, Dict
+import math
+import sys
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from instrumentation import instrument
+from results import CohortResult, ColumnarResult, ProjectionResult
+from retention import expected_lifetime, survival_table
+from schedules import project_scheduled
+
+# Bump whenever projection output can change for the same inputs; persisted
+# results stamped with an older version are recomputed (see precompute.py).
+SIMULATOR_VERSION = "1"
 
 
 def break_even_units(fixed_costs: float, price: float, variable_cost: float) -> float:
@@ -16,13 +30,13 @@ def break_even_units(fixed_costs: float, price: float, variable_cost: float) ->
     return fixed_costs / margin
 
 
-def project_months(fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
-                   monthly_growth: float, months: int) -> List[Dict]:
-    """Simulate monthly revenue/costs/profit and cumulative profit.
+def iter_project_months(fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
+                        monthly_growth: float, months: int) -> Iterator[Tuple]:
+    """Yield one projection row per month as it is computed.
 
-    Returns a list of dicts with keys: month (1-based), units, revenue, costs, profit, cumulative_profit
+    Rows are tuples in ProjectionResult.fields order: (month, units, revenue, variable_costs,
+    profit, cumulative_profit). Memory use is constant regardless of ``months``.
     """
-    results = []
     cumulative_profit = -fixed_costs
     units = initial_sales
     for m in range(1, months + 1):
@@ -30,32 +44,158 @@ def project_months(fixed_costs: float, price: float, variable_cost: float, initi
         variable = units * variable_cost
         profit = revenue - variable
         cumulative_profit += profit
-        results.append({
-            "month": m,
-            "units": units,
-            "revenue": revenue,
-            "variable_costs": variable,
-            "profit": profit,
-            "cumulative_profit": cumulative_profit,
-        })
+        yield m, units, revenue, variable, profit, cumulative_profit
         units = int(units * (1 + monthly_growth))
-    return results
+
+
+@instrument('simulator.project_months')
+def project_months(fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
+                   monthly_growth: float, months: int, schedule=None) -> ProjectionResult:
+    """Simulate monthly revenue/costs/profit and cumulative profit.
+
+    Returns a columnar ProjectionResult with columns: month (1-based), units, revenue,
+    variable_costs, profit, cumulative_profit. It also behaves as a sequence of per-month
+    dicts with those keys; use ``.to_records()`` for a plain list.
+
+    ``schedule`` optionally varies price, variable_cost, monthly_growth, recurring monthly
+    fixed costs and seasonality over the horizon (see schedules.py); the arguments then
+    give the values before each scheduled change.
+    """
+    if schedule:
+        return project_scheduled(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months,
+                                 schedule)
+    return ProjectionResult.from_rows(
+        iter_project_months(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months))
 
 
 def break_even_month(results: List[Dict]) -> int:
     """Return the month number when cumulative_profit >= 0, or 0 if never in the provided results."""
+    if isinstance(results, ColumnarResult):
+        for i, value in enumerate(results.column("cumulative_profit")):
+            if value >= 0:
+                return i + 1
+        return 0
     for r in results:
         if r["cumulative_profit"] >= 0:
             return r["month"]
     return 0
 
 
-def calculate_ltv(monthly_margin_per_customer: float, monthly_churn_rate: float) -> float:
+# Upper bound on months the exact solver will step through when no horizon is given
+# (10,000 years); only reached by degenerate inputs such as negative initial sales.
+BREAK_EVEN_SEARCH_LIMIT = 120_000
+
+# Relative slack applied to each month of a skipped constant-profit stretch when deciding
+# whether project_months' month-by-month float sum could land on the other side of zero.
+_SUM_ERROR = 4 * sys.float_info.epsilon
+
+
+def _tail_side(cumulative_profit: float, profit: float, months: int) -> int:
+    """Sign of the running sum ``months`` constant-profit additions from now: +1, -1, or 0 if
+    float rounding of the month-by-month sum could put it on either side of zero."""
+    value = cumulative_profit + months * profit
+    error = (months + 1) * _SUM_ERROR * (abs(cumulative_profit) + months * abs(profit))
+    if value > error:
+        return 1
+    if value < -error:
+        return -1
+    return 0
+
+
+def break_even_month_continuous(fixed_costs: float, price: float, variable_cost: float, initial_sales: float,
+                                monthly_growth: float) -> float:
+    """Return the real-valued break-even month of the untruncated geometric model.
+
+    Solves -fixed_costs + margin * initial_sales * ((1+g)^m - 1) / g = 0 for m. Returns 0.0 if
+    already at break-even before month 1 and float('inf') if the crossing never happens.
+    """
+    margin = price - variable_cost
+    if fixed_costs <= 0:
+        return 0.0
+    first_month = margin * initial_sales
+    if first_month <= 0:
+        return math.inf
+    if monthly_growth <= -1:
+        # Sales vanish after month 1.
+        return fixed_costs / first_month if fixed_costs <= first_month else math.inf
+    if monthly_growth == 0:
+        return fixed_costs / first_month
+    arg = 1 + fixed_costs * monthly_growth / first_month
+    if arg <= 0:
+        # Shrinking sales converge to first_month / -g in total, which never covers fixed costs.
+        return math.inf
+    return math.log(arg) / math.log1p(monthly_growth)
+
+
+def solve_break_even_month(fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
+                           monthly_growth: float, months: Optional[int] = None) -> int:
+    """Return the break-even month of ``project_months`` without building the projection.
+
+    Gives the same answer as ``break_even_month(project_months(..., months))``. With
+    ``months=None`` the horizon is unbounded, so this answers "when do we break even" even if
+    that is decades out; 0 still means never.
+
+    The continuous closed form (:func:`break_even_month_continuous`) is a lower bound on the
+    truncated model, which rules out unreachable or out-of-horizon cases immediately. Otherwise
+    units are stepped exactly with the same ``int(units * (1 + monthly_growth))`` truncation,
+    without per-month allocation. Once units reach a fixed point, the closed-form crossing of the
+    remaining constant-profit stretch is returned when the months on either side of it are
+    clearly negative and clearly non-negative despite float rounding; near-zero crossings are
+    stepped month by month with the same additions as the projection.
+    """
+    limit = BREAK_EVEN_SEARCH_LIMIT if months is None else months
+    if limit <= 0:
+        return 0
+
+    if initial_sales >= 0 and monthly_growth >= -1 and price > variable_cost:
+        estimate = break_even_month_continuous(fixed_costs, price, variable_cost, initial_sales, monthly_growth)
+        # One month of slack absorbs float rounding between the two formulations.
+        if estimate == math.inf or estimate > limit + 1:
+            return 0
+
+    cumulative_profit = -fixed_costs
+    units = initial_sales
+    try_closed_form = True
+    m = 0
+    while m < limit:
+        m += 1
+        profit = units * price - units * variable_cost
+        cumulative_profit += profit
+        if cumulative_profit >= 0:
+            return m
+        next_units = int(units * (1 + monthly_growth))
+        if next_units == units and try_closed_form:
+            if profit <= 0:
+                return 0
+            # Candidate: months from now until the running sum reaches zero.
+            ahead = math.ceil(-cumulative_profit / profit)
+            if ahead > limit - m:
+                if _tail_side(cumulative_profit, profit, limit - m) < 0:
+                    return 0
+            elif (_tail_side(cumulative_profit, profit, ahead) > 0
+                  and (ahead == 1 or _tail_side(cumulative_profit, profit, ahead - 1) < 0)):
+                return m + ahead
+            # Too close to call: step the rest exactly.
+            try_closed_form = False
+        units = next_units
+    return 0
+
+
+def calculate_ltv(monthly_margin_per_customer: float, monthly_churn_rate: Optional[float] = None,
+                  retention=None, months: Optional[int] = None) -> float:
     """Estimate customer lifetime value (LTV) given monthly margin per customer and monthly churn rate.
 
     LTV approximation: LTV = monthly_margin / monthly_churn_rate
     Returns float('inf') if churn rate is zero.
+
+    With ``retention`` (a curve spec, see retention.py) the churn rate is ignored and
+    LTV = monthly_margin * expected active months, read from a cached cumulative
+    survival table; ``months`` limits the horizon (default: unbounded).
     """
+    if retention is not None:
+        return monthly_margin_per_customer * expected_lifetime(retention, months)
+    if monthly_churn_rate is None:
+        raise ValueError("calculate_ltv requires monthly_churn_rate or retention")
     if monthly_churn_rate <= 0:
         return float('inf')
     return monthly_margin_per_customer / monthly_churn_rate
@@ -72,35 +212,57 @@ def cac_payback_months(cac: float, monthly_margin_per_customer: float) -> int:
     return int(ceil(cac / monthly_margin_per_customer))
 
 
-def cohort_projection(initial_customers: int, monthly_margin_per_customer: float, monthly_churn_rate: float, months: int):
-    """Return monthly cohort projection for a single acquisition cohort.
+def iter_cohort_projection(initial_customers: int, monthly_margin_per_customer: float,
+                           monthly_churn_rate: Optional[float], months: int, retention=None) -> Iterator[Tuple]:
+    """Yield one cohort row per month: (month, customers, monthly_margin, cumulative_margin).
 
-    Each month returns dict: month, customers, monthly_margin, cumulative_margin
+    With ``retention`` (a curve spec) month m has ``initial_customers * S(m - 1)``
+    customers and ``monthly_churn_rate`` is ignored.
     """
-    results = []
-    customers = float(initial_customers)
     cumulative = 0.0
+    if retention is not None:
+        for m, share in enumerate(survival_table(retention, months), start=1):
+            customers = initial_customers * share
+            monthly_margin = customers * monthly_margin_per_customer
+            cumulative += monthly_margin
+            yield m, int(customers), monthly_margin, cumulative
+        return
+    customers = float(initial_customers)
     for m in range(1, months + 1):
         monthly_margin = customers * monthly_margin_per_customer
         cumulative += monthly_margin
-        results.append({
-            "month": m,
-            "customers": int(customers),
-            "monthly_margin": monthly_margin,
-            "cumulative_margin": cumulative,
-        })
+        yield m, int(customers), monthly_margin, cumulative
         customers = customers * (1.0 - monthly_churn_rate)
-    return results
 
 
+@instrument('simulator.cohort_projection')
+def cohort_projection(initial_customers: int, monthly_margin_per_customer: float, monthly_churn_rate: Optional[float],
+                      months: int, retention=None):
+    """Return monthly cohort projection for a single acquisition cohort.
+
+    Pass ``retention`` (a curve spec, see retention.py) instead of a constant churn rate
+    for Weibull, shifted-geometric or empirical decay.
+
+    Returns a columnar CohortResult; each month reads as dict: month, customers, monthly_margin,
+    cumulative_margin
+    """
+    return CohortResult.from_rows(
+        iter_cohort_projection(initial_customers, monthly_margin_per_customer, monthly_churn_rate, months, retention))
+
+
+@instrument('simulator.sensitivity_analysis')
 def sensitivity_analysis(fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
-                        monthly_growth: float, months: int, parameter: str, variation_range: float = 0.2) -> List[Dict]:
+                        monthly_growth: float, months: int, parameter: str, variation_range: float = 0.2,
+                        break_even_only: bool = False) -> List[Dict]:
     """Analyze sensitivity: vary one parameter ±variation_range and return break-even month and final profit for each.
 
     Parameters:
     - parameter: one of 'price', 'variable_cost', 'initial_sales', 'monthly_growth', 'fixed_costs'
     - variation_range: float like 0.2 for ±20% variation (5 data points: -20%, -10%, 0%, +10%, +20%)
 
+    - break_even_only: if True, solve each break-even month directly with solve_break_even_month
+      instead of projecting the full series; final_cumulative_profit is then omitted
+
     Returns list of dicts: {change_percent, break_even_month, final_cumulative_profit}
     """
     changes = [-variation_range, -variation_range/2, 0, variation_range/2, variation_range]
@@ -130,6 +292,20 @@ def sensitivity_analysis(fixed_costs: float, price: float, variable_cost: float,
         else:
             raise ValueError(f"Unknown parameter: {parameter}")
 
+        if break_even_only:
+            results.append({
+                'change_percent': int(change * 100),
+                'break_even_month': solve_break_even_month(
+                    params['fixed_costs'],
+                    params['price'],
+                    params['variable_cost'],
+                    params['initial_sales'],
+                    params['monthly_growth'],
+                    params['months'],
+                ),
+            })
+            continue
+
         projection = project_months(
             params['fixed_costs'],
             params['price'],
@@ -140,7 +316,7 @@ def sensitivity_analysis(fixed_costs: float, price: float, variable_cost: float,
         )
 
         bem = break_even_month(projection)
-        final_profit = projection[-1]['cumulative_profit'] if projection else 0
+        final_profit = projection.column('cumulative_profit')[-1] if projection else 0
 
         results.append({
             'change_percent': int(change * 100),
@@ -0,0 +1,161 @@
+"""Goal seek over the projection model.
+
+Answers inverse questions such as "what is the lowest price that breaks even by
+month 12?" or "how much monthly growth do we need for 50,000 cumulative profit
+after 24 months?". Each solvable parameter moves the outcome in one direction
+(price, initial_sales and monthly_growth help; variable_cost hurts), so the
+boundary is found by expanding a bracket from the current value and bisecting
+it, which takes a few dozen evaluations instead of a sweep.
+"""
+from collections import deque
+from typing import Dict, Optional
+
+from simulator import break_even_month, iter_project_months, project_months, solve_break_even_month
+
+# parameter -> (direction, lower bound of its domain, integer?)
+# direction +1: larger values help the goal, so we look for the minimum that works;
+# direction -1: larger values hurt, so we look for the maximum that still works.
+SOLVABLE_PARAMETERS = {
+    'price': (1, 0.0, False),
+    'variable_cost': (-1, 0.0, False),
+    'initial_sales': (1, 0, True),
+    'monthly_growth': (1, -1.0, False),
+}
+DEFAULT_TOLERANCE = 1e-6
+# Bracket doublings before a goal is declared unreachable (2**60 times the start step).
+MAX_BRACKET_STEPS = 60
+
+
+def final_cumulative_profit(fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
+                            monthly_growth: float, months: int) -> float:
+    """Cumulative profit after ``months``, with project_months arithmetic but O(1) memory."""
+    last = deque(iter_project_months(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months),
+                 maxlen=1)
+    return last[0][5] if last else -fixed_costs
+
+
+def _goal_check(params: Dict, months: int, target_profit: Optional[float]):
+    """Return a predicate ``ok(params)`` for the goal."""
+    if target_profit is None:
+        def ok(p):
+            return solve_break_even_month(p['fixed_costs'], p['price'], p['variable_cost'], p['initial_sales'],
+                                          p['monthly_growth'], months) > 0
+    else:
+        def ok(p):
+            return final_cumulative_profit(p['fixed_costs'], p['price'], p['variable_cost'], p['initial_sales'],
+                                           p['monthly_growth'], months) >= target_profit
+    return ok
+
+
+def solve_for(parameter: str, fixed_costs: float, price: float, variable_cost: float, initial_sales: int,
+              monthly_growth: float, months: int, target_profit: Optional[float] = None,
+              tolerance: float = DEFAULT_TOLERANCE) -> Dict:
+    """Find the boundary value of ``parameter`` that meets the goal.
+
+    Goal: break even by month ``months`` (default), or reach ``target_profit``
+    cumulative profit at month ``months``. The other parameters stay fixed.
+
+    Returns a dict with ``parameter``, ``goal``, ``months``, ``target_profit``,
+    ``feasible``, ``value`` (minimum for price/initial_sales/monthly_growth, maximum
+    for variable_cost; None if infeasible), ``unbounded`` (True when every larger
+    variable_cost still meets the goal; ``value`` is then None), ``evaluations``,
+    and the ``break_even_month`` / ``final_cumulative_profit`` the solution
+    produces. Raises ValueError for an unknown parameter or bad horizon.
+    """
+    if parameter not in SOLVABLE_PARAMETERS:
+        raise ValueError(f"Cannot solve for {parameter}; choose one of {', '.join(SOLVABLE_PARAMETERS)}")
+    months = int(months)
+    if months < 1:
+        raise ValueError("months must be >= 1")
+    direction, floor, integer = SOLVABLE_PARAMETERS[parameter]
+    tolerance = 1 if integer else float(tolerance)
+    if tolerance <= 0:
+        raise ValueError("tolerance must be > 0")
+    base = {'fixed_costs': float(fixed_costs), 'price': float(price), 'variable_cost': float(variable_cost),
+            'initial_sales': int(initial_sales), 'monthly_growth': float(monthly_growth)}
+    start = max(base[parameter], floor)
+    goal = _goal_check(base, months, target_profit)
+    evaluations = 0
+
+    def ok(value):
+        nonlocal evaluations
+        evaluations += 1
+        params = dict(base)
+        params[parameter] = value
+        try:
+            return goal(params)
+        except OverflowError:
+            # Units grew past float range: the goal is met iff each unit earns money.
+            return params['price'] > params['variable_cost']
+
+    def widen(step):
+        return int(step * 2) if integer else step * 2
+
+    # ``good`` always meets the goal and ``bad`` never does; bisect until they are
+    # within tolerance. For direction +1 good > bad, for -1 good < bad.
+    value = None
+    if direction > 0:
+        if ok(start):
+            good, bad = start, floor
+            if ok(floor):
+                value = floor
+        else:
+            bad, step = start, max(abs(start), 1)
+            for _ in range(MAX_BRACKET_STEPS):
+                candidate = start + step
+                if ok(candidate):
+                    good = candidate
+                    break
+                bad, step = candidate, widen(step)
+            else:
+                return _result(parameter, months, target_profit, None, evaluations, base)
+    else:
+        if not ok(floor):
+            return _result(parameter, months, target_profit, None, evaluations, base)
+        if ok(start):
+            good, step = start, max(abs(start), 1)
+            for _ in range(MAX_BRACKET_STEPS):
+                candidate = start + step
+                if not ok(candidate):
+                    bad = candidate
+                    break
+                good, step = candidate, widen(step)
+            else:
+                return _result(parameter, months, target_profit, None, evaluations, base, unbounded=True)
+        else:
+            good, bad = floor, start
+
+    if value is None:
+        while abs(good - bad) > tolerance:
+            mid = (good + bad) // 2 if integer else (good + bad) / 2
+            if mid in (good, bad):
+                break
+            if ok(mid):
+                good = mid
+            else:
+                bad = mid
+        value = good
+    return _result(parameter, months, target_profit, value, evaluations, base)
+
+
+def _result(parameter, months, target_profit, value, evaluations, base, unbounded=False) -> Dict:
+    result = {
+        'parameter': parameter,
+        'goal': 'break_even' if target_profit is None else 'target_profit',
+        'months': months,
+        'target_profit': target_profit,
+        'feasible': value is not None or unbounded,
+        'value': value,
+        'unbounded': unbounded,
+        'evaluations': evaluations,
+        'break_even_month': None,
+        'final_cumulative_profit': None,
+    }
+    if value is not None:
+        params = dict(base)
+        params[parameter] = value
+        projection = project_months(params['fixed_costs'], params['price'], params['variable_cost'],
+                                    params['initial_sales'], params['monthly_growth'], months)
+        result['break_even_month'] = break_even_month(projection)
+        result['final_cumulative_profit'] = projection.column('cumulative_profit')[-1]
+    return result
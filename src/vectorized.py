@@ -0,0 +1,136 @@
+"""Vectorized (NumPy) counterparts of the simulator functions.
+
+These evaluate many parameter sets at once: the month loop stays in Python but
+each step operates on a whole array of scenarios, so the cost per scenario is a
+few array operations instead of a dict allocation per month.
+"""
+from typing import Dict
+
+import numpy as np
+
+
+def as_column(values, dtype, n: int):
+    """Return ``values`` as a 1-D array of ``n`` scenarios, broadcasting a scalar."""
+    arr = np.asarray(values, dtype=dtype)
+    if arr.ndim == 0:
+        arr = np.full(n, arr, dtype=dtype)
+    if arr.ndim != 1 or arr.shape[0] != n:
+        raise ValueError("Parameter arrays must be scalars or 1-D arrays of equal length")
+    return arr
+
+
+def scenario_count(*values) -> int:
+    """Number of scenarios in a mix of scalars and equal-length 1-D arrays (1 if all scalars)."""
+    sizes = {np.size(v) for v in values if np.ndim(v) > 0}
+    if len(sizes) > 1:
+        raise ValueError("Parameter arrays must be scalars or 1-D arrays of equal length")
+    return sizes.pop() if sizes else 1
+
+
+def project_months_batch(fixed_costs, price, variable_cost, initial_sales, monthly_growth,
+                         months: int) -> Dict[str, np.ndarray]:
+    """Batch version of :func:`simulator.project_months`.
+
+    Each parameter may be a scalar or a 1-D array; scalars are broadcast to the
+    number of scenarios. Returns a dict with ``month`` (shape ``(months,)``) and
+    ``units``, ``revenue``, ``variable_costs``, ``profit`` and
+    ``cumulative_profit`` (shape ``(months, scenarios)``, all float64).
+
+    Column ``[:, i]`` matches ``project_months`` called with the i-th parameter
+    set exactly: month 1 uses ``initial_sales`` as given (fractional or not), later
+    units follow the same ``int(units * (1 + monthly_growth))`` truncation, and the
+    cumulative profit is accumulated month by month in the same order as the
+    scalar loop.
+    """
+    n = scenario_count(fixed_costs, price, variable_cost, initial_sales, monthly_growth)
+    fixed_costs = as_column(fixed_costs, np.float64, n)
+    price = as_column(price, np.float64, n)
+    variable_cost = as_column(variable_cost, np.float64, n)
+    # Units stay float64, truncated with np.trunc like the scalar int(): after month 1
+    # every value is int(float), so float64 holds it exactly and large growth cannot
+    # overflow an int64.
+    units = as_column(initial_sales, np.float64, n)
+    growth_factor = 1 + as_column(monthly_growth, np.float64, n)
+
+    months = max(int(months), 0)
+    units_out = np.empty((months, n), dtype=np.float64)
+    revenue = np.empty((months, n), dtype=np.float64)
+    variable = np.empty((months, n), dtype=np.float64)
+    profit = np.empty((months, n), dtype=np.float64)
+    cumulative = np.empty((months, n), dtype=np.float64)
+
+    running = -fixed_costs
+    for m in range(months):
+        units_out[m] = units
+        np.multiply(units, price, out=revenue[m])
+        np.multiply(units, variable_cost, out=variable[m])
+        np.subtract(revenue[m], variable[m], out=profit[m])
+        running = running + profit[m]
+        cumulative[m] = running
+        units = np.trunc(units * growth_factor)
+
+    return {
+        "month": np.arange(1, months + 1, dtype=np.int64),
+        "units": units_out,
+        "revenue": revenue,
+        "variable_costs": variable,
+        "profit": profit,
+        "cumulative_profit": cumulative,
+    }
+
+
+def cumulative_profit_batch(fixed_costs, price, variable_cost, initial_sales, monthly_growth,
+                            months: int) -> np.ndarray:
+    """Return only the ``(months, scenarios)`` cumulative profit matrix.
+
+    Equivalent to ``project_months_batch(...)["cumulative_profit"]`` but allocates a
+    single output matrix, which keeps large stochastic runs within memory.
+    """
+    n = scenario_count(fixed_costs, price, variable_cost, initial_sales, monthly_growth)
+    price = as_column(price, np.float64, n)
+    variable_cost = as_column(variable_cost, np.float64, n)
+    units = as_column(initial_sales, np.float64, n)
+    growth_factor = 1 + as_column(monthly_growth, np.float64, n)
+    running = -as_column(fixed_costs, np.float64, n)
+
+    months = max(int(months), 0)
+    cumulative = np.empty((months, n), dtype=np.float64)
+    for m in range(months):
+        running = running + (units * price - units * variable_cost)
+        cumulative[m] = running
+        units = np.trunc(units * growth_factor)
+    return cumulative
+
+
+def break_even_months_batch(cumulative_profit: np.ndarray) -> np.ndarray:
+    """Return the break-even month for every scenario column (0 if never reached).
+
+    ``cumulative_profit`` is the ``(months, scenarios)`` array produced by
+    :func:`project_months_batch`; semantics match :func:`simulator.break_even_month`.
+    """
+    reached = cumulative_profit >= 0
+    first = np.argmax(reached, axis=0) + 1
+    return np.where(reached.any(axis=0), first, 0).astype(np.int64)
+
+
+def summarize_batch(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months: int):
+    """Return ``(break_even_month, final_cumulative_profit)`` arrays for many scenarios.
+
+    Same arithmetic as :func:`project_months_batch`, but only the running state is
+    kept, so memory is O(scenarios) regardless of ``months``.
+    """
+    n = scenario_count(fixed_costs, price, variable_cost, initial_sales, monthly_growth)
+    price = as_column(price, np.float64, n)
+    variable_cost = as_column(variable_cost, np.float64, n)
+    units = as_column(initial_sales, np.float64, n)
+    growth_factor = 1 + as_column(monthly_growth, np.float64, n)
+    running = -as_column(fixed_costs, np.float64, n)
+    break_even = np.zeros(n, dtype=np.int64)
+
+    for m in range(1, max(int(months), 0) + 1):
+        running = running + (units * price - units * variable_cost)
+        break_even[(break_even == 0) & (running >= 0)] = m
+        units = np.trunc(units * growth_factor)
+
+    final = running if months > 0 else np.zeros(n, dtype=np.float64)
+    return break_even, final
@@ -6,14 +6,20 @@ It is based on the clean rewrite but includes a few defensive fixes:
 - Call `sensitivity_analysis` with full argument list
 - Avoid concatenating None values when loading scenarios
 """
-from flask import Flask, request, render_template_string
+from flask import Flask, Response, request, stream_with_context
+from itertools import islice, starmap
 import json
 from simulator import project_months, cohort_projection, sensitivity_analysis, break_even_month
 from scenarios import save_scenario, load_scenario, list_scenarios, delete_scenario
-from api import api
+from precompute import load_projection, store_projection
+from api import api, STREAM_CHUNK_ROWS
+from results import ProjectionResult
+import instrumentation
+from instrumentation import timed, timed_iter
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
 app.register_blueprint(api)
+instrumentation.init_app(app)
 
 BASE_TEMPLATE = '''<!DOCTYPE html>
 <html lang="en">
@@ -48,7 +54,40 @@ BASE_TEMPLATE = '''<!DOCTYPE html>
 </body>
 </html>'''
 
-TABLE_ROW = "<tr><td>{month}</td><td>{units:,}</td><td>KES {revenue:,.0f}</td><td>KES {variable_costs:,.0f}</td><td>KES {profit:,.0f}</td><td>KES {cumulative_profit:,.0f}</td></tr>"
+# Positional, in ProjectionResult.fields order, so rows format straight from the columns
+# without a dict per month; month and units are stored as floats, hence ".0f".
+TABLE_ROW = "<tr><td>{:.0f}</td><td>{:,.0f}</td><td>KES {:,.0f}</td><td>KES {:,.0f}</td><td>KES {:,.0f}</td><td>KES {:,.0f}</td></tr>"
+
+# Compiled once at import; render_template_string re-parses its source on every call.
+# The page has no per-request variables besides its content, so the markup around the
+# content is rendered once too and reused by stream_page.
+PAGE = app.jinja_env.from_string(BASE_TEMPLATE)
+_CONTENT_SLOT = '\x00content\x00'
+PAGE_HEAD, PAGE_TAIL = PAGE.render(content_html=_CONTENT_SLOT).split(_CONTENT_SLOT)
+
+
+def render_page(content_html):
+    return PAGE.render(content_html=content_html)
+
+
+def stream_page(chunks):
+    """Stream the page with ``chunks`` (an iterable of HTML strings) as its content."""
+    def generate():
+        yield PAGE_HEAD
+        yield from chunks
+        yield PAGE_TAIL
+
+    return Response(stream_with_context(generate()), mimetype='text/html')
+
+
+def table_rows(results, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield the results table's ``<tr>`` markup, ``chunk_rows`` months per string."""
+    rows = zip(*(results.column(name) for name in ProjectionResult.fields))
+    while True:
+        chunk = ''.join(starmap(TABLE_ROW.format, islice(rows, chunk_rows)))
+        if not chunk:
+            return
+        yield chunk
 
 
 def build_persona_presets():
@@ -103,7 +142,7 @@ def home():
         function updatePersona(){var key=selectEl.value; var p=personas[key]; descEl.textContent=p.desc; var html=''; html+='<div style="flex:1"><label>Fixed Costs</label><input type="number" value="'+p.fixed_costs+'" readonly></div>'; html+='<div style="flex:1"><label>Price</label><input type="number" value="'+p.price+'" readonly></div>'; html+='<div style="flex:1"><label>Variable Cost</label><input type="number" value="'+p.variable_cost+'" readonly></div>'; defaultsEl.innerHTML=html;} selectEl.addEventListener('change', updatePersona); updatePersona();
     </script>
     '''
-    return render_template_string(BASE_TEMPLATE, content_html=persona_html)
+    return render_page(persona_html)
 
 
 @app.route('/simulator')
@@ -131,27 +170,28 @@ def simulator_form():
         </form>
     </div>
     '''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/simulate', methods=['POST'])
 def simulate():
-    fixed_costs = float(request.form.get('fixed_costs', 10000))
-    price = float(request.form.get('price', 50))
-    variable_cost = float(request.form.get('variable_cost', 20))
-    initial_sales = int(request.form.get('initial_sales', 200))
-    monthly_growth = float(request.form.get('monthly_growth', 0.05))
-    if monthly_growth > 1:
-        monthly_growth = monthly_growth / 100.0
-    months = int(request.form.get('months', 12))
-
-    results = project_months(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months)
-    rows = ''.join(TABLE_ROW.format(**r) for r in results)
+    with timed('simulate.parse'):
+        fixed_costs = float(request.form.get('fixed_costs', 10000))
+        price = float(request.form.get('price', 50))
+        variable_cost = float(request.form.get('variable_cost', 20))
+        initial_sales = int(request.form.get('initial_sales', 200))
+        monthly_growth = float(request.form.get('monthly_growth', 0.05))
+        if monthly_growth > 1:
+            monthly_growth = monthly_growth / 100.0
+        months = int(request.form.get('months', 12))
+
+    with timed('simulate.project_months'):
+        results = project_months(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months)
     be_month = break_even_month(results)
-    final_profit = results[-1]['cumulative_profit'] if results else 0
-    results_json = json.dumps(results)
+    final_profit = results.column('cumulative_profit')[-1] if results else 0
 
-    content = '''
+    with timed('simulate.render'):
+        summary = '''
     <a href="/simulator" class="back-link">← Back to Dashboard</a>
     <div class="card">
         <h2>📊 Projection Results</h2>
@@ -163,7 +203,16 @@ def simulate():
 
     <table>
         <thead><tr><th>Month</th><th>Units Sold</th><th>Revenue</th><th>Variable Costs</th><th>Monthly Profit</th><th>Cumulative Profit</th></tr></thead>
-        <tbody>''' + rows + '''</tbody>
+        <tbody>'''
+
+    # The summary and the first rows go out before the rest of the table is formatted,
+    # so long projections start rendering immediately.
+    def content():
+        yield summary
+        yield from timed_iter('simulate.table_rows', table_rows(results))
+        with timed('simulate.json_dumps'):
+            results_json = json.dumps(results.to_columns())
+        yield '''</tbody>
     </table>
 
     <div class="card mt-3">
@@ -175,10 +224,10 @@ def simulate():
     <script src="https://cdn.jsdelivr.net/npm/chartjs-plugin-zoom@1.2.1/dist/chartjs-plugin-zoom.min.js"></script>
     <script>
         var resultsData = ''' + results_json + ''';
-        var labels = resultsData.map(function(r){ return r.month; });
-        var revenue = resultsData.map(function(r){ return Number(r.revenue); });
-        var variable_costs = resultsData.map(function(r){ return Number(r.variable_costs); });
-        var cumulative = resultsData.map(function(r){ return Number(r.cumulative_profit); });
+        var labels = resultsData.month;
+        var revenue = resultsData.revenue;
+        var variable_costs = resultsData.variable_costs;
+        var cumulative = resultsData.cumulative_profit;
         var ctx = document.getElementById('projection-chart').getContext('2d');
         var projChart = new Chart(ctx, {
             type: 'line',
@@ -188,7 +237,8 @@ def simulate():
     </script>
 
     '''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+
+    return stream_page(content())
 
 
 @app.route('/cohort')
@@ -213,7 +263,7 @@ def cohort_form():
         </form>
     </div>
     '''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/cohort_simulate', methods=['POST'])
@@ -234,7 +284,7 @@ def cohort_simulate():
     <div class="card"><h2>👥 Cohort Analysis Results</h2><table><thead><tr><th>Month</th><th>Customers</th><th>Monthly Margin</th><th>Cumulative Margin</th></tr></thead><tbody>''' + rows + '''</tbody></table></div>
     <div class="btn-group"><a href="/cohort" class="back-link">Run Another</a><a href="/" class="back-link">Home</a></div>
     '''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/compare')
@@ -243,7 +293,7 @@ def compare_form():
     <a href="/" class="back-link">← Back to Home</a>
     <div class="card"><h2>🔄 Compare Two Scenarios</h2><form action="/compare_simulate" method="post"><div class="grid-2"><div><h4>Scenario A</h4><div class="form-group"><label>Fixed Costs</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="a_fixed_costs" value="10000" step="100" required></div></div><div class="form-group"><label>Price per Unit</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="a_price" value="50" step="0.01" required></div></div><div class="form-group"><label>Variable Cost</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="a_variable_cost" value="20" step="0.01" required></div></div></div><div><h4>Scenario B</h4><div class="form-group"><label>Fixed Costs</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="b_fixed_costs" value="15000" step="100" required></div></div><div class="form-group"><label>Price per Unit</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="b_price" value="75" step="0.01" required></div></div><div class="form-group"><label>Variable Cost</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="b_variable_cost" value="25" step="0.01" required></div></div></div></div><button type="submit" class="btn">Compare</button></form></div>
     '''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/compare_simulate', methods=['POST'])
@@ -262,7 +312,7 @@ def compare_simulate():
     rows_a = ''.join('<tr><td>{month}</td><td>{units:,}</td><td>KES {revenue:,.0f}</td><td>KES {cumulative_profit:,.0f}</td></tr>'.format(**r) for r in results_a)
     rows_b = ''.join('<tr><td>{month}</td><td>{units:,}</td><td>KES {revenue:,.0f}</td><td>KES {cumulative_profit:,.0f}</td></tr>'.format(**r) for r in results_b)
     content = '''<a href="/compare" class="back-link">← Back</a><div class="grid-2"><div class="card"><h3>Scenario A</h3><table><thead><tr><th>Month</th><th>Units</th><th>Revenue</th><th>Cumulative Profit</th></tr></thead><tbody>''' + rows_a + '''</tbody></table></div><div class="card"><h3>Scenario B</h3><table><thead><tr><th>Month</th><th>Units</th><th>Revenue</th><th>Cumulative Profit</th></tr></thead><tbody>''' + rows_b + '''</tbody></table></div></div><div class="btn-group"><a href="/compare" class="back-link">Compare Again</a><a href="/" class="back-link">Home</a></div>'''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/sensitivity')
@@ -270,7 +320,7 @@ def sensitivity_form():
     content = '''
     <a href="/" class="back-link">← Back to Home</a>
     <div class="card"><h2>📈 Sensitivity Analysis</h2><form action="/sensitivity_simulate" method="post"><div class="grid-2"><div><div class="form-group"><label>Base Fixed Costs</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="fixed_costs" value="10000" step="100" required></div></div><div class="form-group"><label>Base Price</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="price" value="50" step="0.01" required></div></div><div class="form-group"><label>Base Variable Cost</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="variable_cost" value="20" step="0.01" required></div></div></div><div><div class="form-group"><label>Parameter to Vary</label><select name="vary_param" required><option value="price">Price</option><option value="variable_cost">Variable Cost</option><option value="fixed_costs">Fixed Costs</option></select></div><div class="form-group"><label>Variation Range (%)</label><input type="number" name="variation_range" value="20" step="1" required></div></div></div><button type="submit" class="btn">Run Analysis</button></form></div>'''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/sensitivity_simulate', methods=['POST'])
@@ -290,7 +340,7 @@ def sensitivity_simulate():
     results = sensitivity_analysis(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, vary_param, variation_range)
     rows = ''.join('<tr><td>{change_percent}%</td><td>{break_even_month}</td><td>KES {final_cumulative_profit:,.0f}</td></tr>'.format(**r) for r in results)
     content = '''<a href="/sensitivity" class="back-link">← Back</a><div class="card"><h2>📈 Sensitivity Results</h2><p>How ''' + vary_param + ''' changes affect profitability:</p><table><thead><tr><th>''' + vary_param.replace('_',' ').title() + '''</th><th>Break-Even Month</th><th>Final Profit</th></tr></thead><tbody>''' + rows + '''</tbody></table></div><div class="btn-group"><a href="/sensitivity" class="back-link">Run Another</a><a href="/" class="back-link">Home</a></div>'''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/scenarios')
@@ -307,7 +357,7 @@ def scenarios_list():
     else:
         load_section = ''
     content = '''<a href="/" class="back-link">← Back to Home</a><h2>💾 Manage Scenarios</h2><p>Save and load your simulation configurations.</p><div class="grid-2"><div class="card"><h3>Saved Scenarios</h3>''' + scenarios_table + '''</div><div class="card"><h3>Save New Scenario</h3><form action="/scenarios/save" method="post"><div class="form-group"><label>Scenario Name</label><input type="text" name="scenario_name" placeholder="e.g., Conservative Plan" required></div><div class="form-group"><label>Fixed Costs</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="fixed_costs" value="10000" step="100"></div></div><div class="form-group"><label>Price per Unit</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="price" value="50" step="0.01"></div></div><div class="form-group"><label>Variable Cost per Unit</label><div class="input-with-prefix"><span class="input-prefix">KES</span><input type="number" name="variable_cost" value="20" step="0.01"></div></div><div class="form-group"><label>Initial Sales</label><input type="number" name="initial_sales" value="200" step="1"></div><div class="form-group"><label>Monthly Growth (%)</label><input type="number" name="monthly_growth" value="5" step="0.1"></div><div class="form-group"><label>Months</label><input type="number" name="months" value="12" step="1"></div><button type="submit">Save Scenario</button></form></div></div>''' + load_section + ''''''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/scenarios/save', methods=['POST'])
@@ -322,6 +372,7 @@ def save_scenario_post():
         'months': int(request.form.get('months', 12))
     }
     save_scenario(name, params)
+    store_projection(name, params)
     return '<script>alert("Scenario saved!"); window.location="/scenarios";</script>'
 
 
@@ -330,16 +381,18 @@ def load_scenario_post():
     name = request.form.get('scenario_name')
     if not name:
         return '<script>alert("No scenario specified"); window.location="/scenarios";</script>'
-    scenario = load_scenario(name)
+    try:
+        scenario = load_scenario(name)
+    except FileNotFoundError:
+        scenario = None
     if not scenario:
         return '<script>alert("Scenario not found!"); window.location="/scenarios";</script>'
-    p = scenario
-    results = project_months(p['fixed_costs'], p['price'], p['variable_cost'], p['initial_sales'], p['monthly_growth'], p['months'])
-    rows = ''.join(TABLE_ROW.format(**r) for r in results)
+    results = load_projection(name, scenario)
+    rows = ''.join(table_rows(results))
     be_month = break_even_month(results)
-    final_profit = results[-1]['cumulative_profit'] if results else 0
+    final_profit = results.column('cumulative_profit')[-1] if results else 0
     content = '''<a href="/scenarios" class="back-link">← Back to Scenarios</a><div class="card"><h2>Loaded: ''' + name + '''</h2><div class="grid-2"><div><h4>Break-Even Month</h4><p>''' + (str(be_month) if be_month > 0 else "Not reached") + '''</p></div><div><h4>Final Profit</h4><p>KES ''' + f'{final_profit:,.0f}' + '''</p></div></div></div><table><thead><tr><th>Month</th><th>Units</th><th>Revenue</th><th>Variable Costs</th><th>Monthly Profit</th><th>Cumulative Profit</th></tr></thead><tbody>''' + rows + '''</tbody></table>'''
-    return render_template_string(BASE_TEMPLATE, content_html=content)
+    return render_page(content)
 
 
 @app.route('/scenarios/delete/<scenario_name>')
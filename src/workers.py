@@ -0,0 +1,59 @@
+"""Process-pool offload for CPU-heavy API work.
+
+Request threads in a WSGI server share one interpreter, so a long sensitivity
+sweep or Monte Carlo run holds the GIL and stalls every other request. When
+offloading is enabled (``app.config['OFFLOAD_CPU']``, set by ``server.py``), those
+endpoints submit their computation to a shared ``ProcessPoolExecutor`` and the
+request thread just waits on the future, which releases the GIL.
+
+The pool is created lazily on first use and sized by ``SIM_PROCESS_WORKERS``
+(default: CPU count). Workers are started with the ``spawn`` method, since forking
+a process that already runs server threads is unsafe. Offloaded callables and
+their arguments must be picklable, i.e. module-level functions with plain arguments.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def process_pool(max_workers: int = None) -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if max_workers is None and os.environ.get('SIM_PROCESS_WORKERS'):
+                    max_workers = int(os.environ['SIM_PROCESS_WORKERS'])
+                _pool = ProcessPoolExecutor(max_workers=max_workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+                atexit.register(shutdown_pool)
+    return _pool
+
+
+def warm_pool() -> None:
+    """Start every worker now, so the first offloaded request doesn't pay the spawn cost."""
+    pool = process_pool()
+    for future in [pool.submit(os.getpid) for _ in range(pool._max_workers)]:
+        future.result()
+
+
+def shutdown_pool(wait: bool = True) -> None:
+    """Shut the shared pool down (a later call to :func:`process_pool` starts a new one)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def run_cpu_bound(enabled: bool, fn, *args, **kwargs):
+    """Call ``fn(*args, **kwargs)`` in the process pool if ``enabled``, else inline."""
+    if not enabled:
+        return fn(*args, **kwargs)
+    return process_pool().submit(fn, *args, **kwargs).result()
@@ -0,0 +1,4 @@
+"""WSGI entry point: ``application`` is the production-configured app (see server.py)."""
+from server import configure
+
+application = configure()
@@ -1,6 +1,8 @@
+import json
 import unittest
 import sys
 import os
+from unittest import mock
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -36,6 +38,51 @@ class APITests(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data['status'], 'error')
 
+    def test_project_api_break_even_only(self):
+        response = self.client.get('/api/project?fixed_costs=10000000&price=50&variable_cost=20&initial_sales=200&monthly_growth=0&break_even_only=1')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertEqual(data['break_even_month'], 1667)
+        self.assertNotIn('results', data)
+
+    def test_project_api_columns_layout(self):
+        response = self.client.get('/api/project?months=4&layout=columns')
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['data']['results']
+        self.assertEqual(results['month'], [1, 2, 3, 4])
+
+    def test_project_api_cache_and_etag(self):
+        url = '/api/project?fixed_costs=12345&price=51&months=7'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers['ETag']
+        hits_before = self.client.get('/api/health').get_json()['cache']['hits']
+        second = self.client.get('/api/project?fixed_costs=12345.0&price=51.0&months=7')
+        self.assertEqual(second.headers['ETag'], etag)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(self.client.get('/api/health').get_json()['cache']['hits'], hits_before + 1)
+        not_modified = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_project_api_ndjson_stream(self):
+        response = self.client.get('/api/project?months=600&format=ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = response.data.decode().splitlines()
+        self.assertEqual(len(lines), 600)
+        self.assertEqual(json.loads(lines[-1])['month'], 600)
+
+    def test_cohort_api_csv_stream(self):
+        response = self.client.get('/api/cohort?months=3&format=csv')
+        self.assertEqual(response.mimetype, 'text/csv')
+        lines = response.data.decode().splitlines()
+        self.assertEqual(lines[0], 'month,customers,monthly_margin,cumulative_margin')
+        self.assertEqual(len(lines), 4)
+
+    def test_project_api_unknown_format(self):
+        response = self.client.get('/api/project?format=xml')
+        self.assertEqual(response.status_code, 400)
+
     def test_cohort_api_get(self):
         response = self.client.get('/api/cohort?initial_customers=100&monthly_margin=5.0&monthly_churn=0.1&months=12')
         self.assertEqual(response.status_code, 200)
@@ -50,6 +97,172 @@ class APITests(unittest.TestCase):
         self.assertEqual(data['status'], 'success')
         self.assertEqual(data['data']['parameter'], 'price')
 
+    def test_sensitivity_grid_api(self):
+        body = {'months': 12, 'axes': {'price': {'min': 40, 'max': 60, 'steps': 3}, 'variable_cost': [15, 25]}}
+        response = self.client.post('/api/sensitivity/grid', json=body)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertEqual(data['shape'], [3, 2])
+        self.assertEqual(data['points'], 6)
+        self.assertIn('compute_time_ms', data)
+        self.assertIn('tornado', data)
+
+    def test_sensitivity_grid_api_size_cap(self):
+        body = {'axes': {'price': {'min': 1, 'max': 100, 'steps': 1000}, 'variable_cost': {'min': 1, 'max': 2, 'steps': 1000}}}
+        response = self.client.post('/api/sensitivity/grid', json=body)
+        self.assertEqual(response.status_code, 400)
+
+    def test_sensitivity_grid_api_streams_rows(self):
+        body = {'months': 12, 'axes': {'price': [40, 60], 'variable_cost': [15, 20, 25]}}
+        full = self.client.post('/api/sensitivity/grid', json=body).get_json()['data']
+        response = self.client.post('/api/sensitivity/grid?format=ndjson', json=body)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual(sorted(row['index'] for row in rows), list(range(6)))
+        for row in rows:
+            i, j = divmod(row['index'], 3)
+            self.assertEqual((row['price'], row['variable_cost']), (full['axes']['price'][i],
+                                                                   full['axes']['variable_cost'][j]))
+            self.assertEqual(row['final_cumulative_profit'], full['final_cumulative_profit'][i][j])
+        response = self.client.post('/api/sensitivity/grid?format=csv', json=body)
+        self.assertEqual(response.data.decode().splitlines()[0],
+                         'index,price,variable_cost,break_even_month,final_cumulative_profit')
+
+    def test_sensitivity_grid_api_cell_cap(self):
+        body = {'months': 1_000_000, 'axes': {'price': {'min': 40, 'max': 60, 'steps': 100}}}
+        response = self.client.post('/api/sensitivity/grid', json=body)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('months', response.get_json()['message'])
+        body = {'months': 0, 'axes': {'price': [50]}}
+        self.assertEqual(self.client.post('/api/sensitivity/grid', json=body).status_code, 400)
+
+    def test_montecarlo_api(self):
+        body = {'price': {'dist': 'normal', 'mean': 50, 'std': 5}, 'months': 6, 'trials': 500, 'seed': 1}
+        response = self.client.post('/api/montecarlo', json=body)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertEqual(len(data['percentiles']['p50']), 6)
+        self.assertEqual(sum(data['break_even_histogram']), 500)
+
+    def test_montecarlo_api_limits(self):
+        response = self.client.post('/api/montecarlo', json={'months': 5000, 'trials': 10})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('months may not exceed', response.get_json()['message'])
+        response = self.client.post('/api/montecarlo', json={'months': 1200, 'trials': 10, 'chunk_size': 10**6})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('chunk_size * months', response.get_json()['message'])
+
+    def test_montecarlo_api_invalid_distribution(self):
+        response = self.client.post('/api/montecarlo', json={'price': {'dist': 'bogus'}, 'trials': 10})
+        self.assertEqual(response.status_code, 400)
+
+    def test_project_api_schedule(self):
+        schedule = json.dumps({'price': [{'from': 4, 'value': 60}], 'monthly_fixed_costs': 100})
+        response = self.client.get(f'/api/project?price=50&variable_cost=20&initial_sales=10&monthly_growth=0'
+                                   f'&months=6&fixed_costs=0&schedule={schedule}')
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['data']['results']
+        self.assertEqual([r['profit'] for r in results], [200, 200, 200, 300, 300, 300])
+        response = self.client.get(f'/api/project?months=6&break_even_only=1&schedule={schedule}')
+        self.assertEqual(response.get_json()['data']['months'], 6)
+        response = self.client.get(f'/api/project?format=csv&months=3&schedule={schedule}')
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 4)
+        response = self.client.get('/api/project?schedule={"price": "high"}')
+        self.assertEqual(response.status_code, 400)
+
+    def test_project_patch_api(self):
+        response = self.client.post('/api/project/patch', json={
+            'params': {'fixed_costs': 10000, 'price': 50, 'variable_cost': 20, 'months': 24},
+            'changes': {'price': 60},
+            'layout': 'columns',
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        expected = self.client.get('/api/project?fixed_costs=10000&price=60&variable_cost=20'
+                                   '&months=24&layout=columns').get_json()['data']
+        self.assertEqual(data['results'], expected['results'])
+        self.assertEqual(data['break_even_month'], expected['break_even_month'])
+        self.assertEqual(data['params']['price'], 60.0)
+        self.assertEqual(data['recomputed_months'], 24)
+
+        response = self.client.post('/api/project/patch', json={
+            'key': data['key'], 'changes': {'months': 30}, 'include_results': False})
+        extended = response.get_json()['data']
+        self.assertEqual(extended['recomputed_months'], 6)
+        self.assertNotIn('results', extended)
+        self.assertNotEqual(extended['key'], data['key'])
+
+    def test_project_patch_api_after_partial_patch(self):
+        params = {'fixed_costs': 1000, 'price': 10, 'variable_cost': 5, 'initial_sales': 100,
+                  'monthly_growth': 0.05, 'months': 12}
+        response = self.client.post('/api/project/patch', json={
+            'params': params, 'changes': {'monthly_growth': 0.5}, 'from_month': 6, 'include_results': False})
+        self.assertEqual(response.get_json()['data']['recomputed_months'], 7)
+        response = self.client.post('/api/project/patch', json={
+            'key': response.get_json()['data']['key'], 'changes': {'monthly_growth': 0.5}})
+        data = response.get_json()['data']
+        self.assertEqual(data['recomputed_months'], 12)
+        self.assertEqual([row['units'] for row in data['results'][:3]], [100, 150, 225])
+
+    def test_project_patch_api_errors(self):
+        response = self.client.post('/api/project/patch', json={'key': 'missing', 'changes': {'price': 60}})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post('/api/project/patch', json={'params': {}, 'changes': {'colour': 1}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unknown parameters', response.get_json()['message'])
+
+    def test_portfolio_api(self):
+        body = {'fixed_costs': 20000, 'months': 12, 'allocation': 'equal', 'product_results': True, 'products': [
+            {'name': 'basic', 'price': 20, 'variable_cost': 5, 'initial_sales': 500, 'monthly_growth': 0},
+            {'name': 'pro', 'price': 90, 'variable_cost': 30, 'initial_sales': 40, 'monthly_growth': 0},
+        ]}
+        response = self.client.post('/api/portfolio', json=body)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertEqual(len(data['results']), 12)
+        self.assertEqual(data['results'][0]['profit'], 7500 + 2400)
+        self.assertEqual(data['break_even_month'], 3)
+        self.assertEqual([p['allocated_fixed_costs'] for p in data['products']], [10000, 10000])
+        self.assertEqual([p['break_even_month'] for p in data['products']], [2, 5])
+        self.assertEqual(data['products'][1]['results']['contribution'][-1], 12 * 2400)
+
+        response = self.client.post('/api/portfolio', json=dict(body, layout='columns', product_results=False))
+        data = response.get_json()['data']
+        self.assertEqual(len(data['results']['cumulative_profit']), 12)
+        self.assertNotIn('results', data['products'][0])
+
+    def test_portfolio_api_errors(self):
+        response = self.client.post('/api/portfolio', json={'products': []})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/portfolio', json={'products': [{'price': 'high'}]})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/portfolio', json={'products': [{}], 'allocation': 'headcount'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/portfolio', json={'products': [{}] * 10, 'months': 2_000_000})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_api(self):
+        body = {'jobs': [
+            {'id': 'a', 'type': 'project', 'params': {'months': 3}},
+            {'id': 'b', 'type': 'unknown'},
+        ]}
+        response = self.client.post('/api/batch', json=body)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['failed'], 1)
+        self.assertEqual(data['results'][0]['id'], 'a')
+        self.assertEqual(len(data['results'][0]['data']['results']), 3)
+
+    def test_batch_api_requires_jobs(self):
+        response = self.client.post('/api/batch', json={})
+        self.assertEqual(response.status_code, 400)
+        jobs = [{'type': 'project', 'params': {'months': 6_000_000}}] * 2
+        response = self.client.post('/api/batch', json={'jobs': jobs})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('months in total', response.get_json()['message'])
+
     def test_scenarios_list_api(self):
         response = self.client.get('/api/scenarios')
         self.assertEqual(response.status_code, 200)
@@ -115,6 +328,117 @@ class APITests(unittest.TestCase):
         response = self.client.get('/api/scenarios/api_delete_test')
         self.assertEqual(response.status_code, 404)
 
+    def test_solve_api(self):
+        response = self.client.get('/api/solve?solve_for=price&months=6')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertTrue(data['feasible'])
+        self.assertEqual(data['break_even_month'], 6)
+        data = self.client.get('/api/solve?solve_for=initial_sales&months=12&target_profit=20000').get_json()['data']
+        self.assertGreaterEqual(data['final_cumulative_profit'], 20000)
+        self.assertEqual(self.client.get('/api/solve?solve_for=fixed_costs').status_code, 400)
+
+    def test_cohort_with_retention_curve(self):
+        spec = json.dumps({'type': 'shifted_geometric', 'churn': 0.1})
+        by_curve = self.client.get('/api/cohort?months=6&retention=' + spec).get_json()['data']
+        by_churn = self.client.get('/api/cohort?months=6&monthly_churn=0.1').get_json()['data']
+        self.assertAlmostEqual(by_curve['final_cumulative_margin'], by_churn['final_cumulative_margin'])
+        response = self.client.get('/api/cohort?retention=' + json.dumps({'type': 'weibull'}))
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/cohort?months=10000000&retention=' + spec)
+        self.assertEqual(response.status_code, 400)
+        data = self.client.post('/api/cohorts/layered', json={'months': 12, 'retention': {
+            'type': 'weibull', 'shape': 0.8, 'scale': 12}}).get_json()['data']
+        self.assertEqual(len(data['results']), 12)
+
+    def test_layered_cohorts_api(self):
+        response = self.client.post('/api/cohorts/layered', json={'months': 6, 'cac': 40, 'monthly_churn': 0.1})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertEqual(len(data['results']), 6)
+        self.assertEqual(data['ltv'], 50.0)
+        self.assertEqual(data['cac_payback_months'], 8)
+
+        data = self.client.post('/api/cohorts/layered', json={'months': 24, 'cac': [30, 60]}).get_json()['data']
+        self.assertEqual(len(data['configs']), 2)
+        self.assertEqual(data['configs'][1]['cac'], 60.0)
+
+        response = self.client.post('/api/cohorts/layered', json={'cac': [1, 2], 'monthly_churn': [0.1, 0.2, 0.3]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_layered_cohorts_api_retention_per_config(self):
+        response = self.client.post('/api/cohorts/layered', json={
+            'months': 6, 'cac': [30, 60], 'retention': [[1, 1], [0.5, 0.8], [0.25, 0.6]]})
+        self.assertEqual(response.status_code, 200)
+        configs = response.get_json()['data']['configs']
+        self.assertEqual([config['ltv'] for config in configs], [8.75, 12.0])
+
+    def test_load_scenario_with_results(self):
+        self.client.post('/api/scenarios', json={'name': 'api_results_test', 'months': 6})
+        try:
+            data = self.client.get('/api/scenarios/api_results_test?results=1&layout=columns').get_json()['data']
+            self.assertEqual(data['results']['month'], [1, 2, 3, 4, 5, 6])
+            self.assertIn('break_even_month', data)
+            data = self.client.get('/api/scenarios/api_results_test').get_json()['data']
+            self.assertNotIn('results', data)
+        finally:
+            self.client.delete('/api/scenarios/api_results_test')
+
+    def test_scenarios_list_prefix_tag_and_pagination(self):
+        for name in ('api_page_a', 'api_page_b', 'api_page_c'):
+            self.client.post('/api/scenarios', json={'name': name, 'tags': ['api_page']})
+        try:
+            data = self.client.get('/api/scenarios?prefix=api_page_&limit=2&offset=1').get_json()['data']
+            self.assertEqual(data['scenarios'], ['api_page_b', 'api_page_c'])
+            self.assertEqual(data['total'], 3)
+            data = self.client.get('/api/scenarios?tag=api_page').get_json()['data']
+            self.assertEqual(data['scenarios'], ['api_page_a', 'api_page_b', 'api_page_c'])
+            response = self.client.get('/api/scenarios?limit=-1')
+            self.assertEqual(response.status_code, 400)
+            response = self.client.post('/api/scenarios', json={'name': 'api_page_bad', 'tags': 'x'})
+            self.assertEqual(response.status_code, 400)
+        finally:
+            for name in ('api_page_a', 'api_page_b', 'api_page_c'):
+                self.client.delete(f'/api/scenarios/{name}')
+
+    def test_scenarios_warm_runs_one_at_a_time(self):
+        api_module = sys.modules['api']
+        with mock.patch.object(api_module, 'process_pool'), \
+                mock.patch.object(api_module, 'warm_in_background', side_effect=[object(), None]):
+            self.assertEqual(self.client.post('/api/scenarios/warm').status_code, 202)
+            response = self.client.post('/api/scenarios/warm')
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.get_json()['status'], 'error')
+
+    def test_chart_api_png_and_etag(self):
+        url = '/api/chart/projection?months=24&price=55'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'image/png')
+        self.assertTrue(response.data.startswith(b'\x89PNG'))
+        self.assertIn('max-age', response.headers['Cache-Control'])
+        etag = response.headers['ETag']
+        hits_before = self.client.get('/api/health').get_json()['chart_cache']['hits']
+        self.assertEqual(self.client.get(url).data, response.data)
+        self.assertEqual(self.client.get('/api/health').get_json()['chart_cache']['hits'], hits_before + 1)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+    def test_chart_api_types_and_svg(self):
+        for chart_type in ('cohort', 'cost_pie', 'waterfall'):
+            response = self.client.get(f'/api/chart/{chart_type}?months=12')
+            self.assertEqual(response.status_code, 200, chart_type)
+        response = self.client.get('/api/chart/waterfall?months=600&format=svg')
+        self.assertEqual(response.mimetype, 'image/svg+xml')
+        self.assertIn(b'<svg', response.data)
+
+    def test_chart_api_invalid(self):
+        self.assertEqual(self.client.get('/api/chart/radar').status_code, 400)
+        self.assertEqual(self.client.get('/api/chart/projection?format=gif').status_code, 400)
+        self.assertEqual(self.client.get('/api/chart/projection?months=0').status_code, 400)
+        for query in ('fixed_costs=0&variable_cost=0', 'fixed_costs=-5'):
+            response = self.client.get(f'/api/chart/cost_pie?{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertEqual(response.get_json()['status'], 'error')
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+BENCHMARKS = os.path.join(ROOT, 'benchmarks')
+if BENCHMARKS not in sys.path:
+    sys.path.insert(0, BENCHMARKS)
+
+import suite
+
+
+def report(**medians):
+    return {'meta': {}, 'results': {k: {'runs': 1, 'min': v, 'median': v, 'mean': v} for k, v in medians.items()}}
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_compare_flags_only_slowdowns_over_threshold(self):
+        baseline = report(**{'a[12]': 1.0, 'b[12]': 1.0, 'c[12]': 1.0})
+        current = report(**{'a[12]': 1.05, 'b[12]': 1.5, 'c[12]': 0.5, 'new[12]': 9.0})
+        regressions = suite.compare(baseline, current, threshold=10)
+        self.assertEqual([r[0] for r in regressions], ['b[12]'])
+        self.assertAlmostEqual(regressions[0][3], 50.0)
+        self.assertEqual(suite.compare(baseline, current, threshold=60), [])
+
+    def test_run_suite_writes_comparable_json(self):
+        result = suite.run_suite(horizons=[12], name_filter='simulator.', budget=0.001)
+        self.assertEqual(set(result['results']), {
+            'simulator.project_months[12]', 'simulator.cohort_projection[12]',
+            'simulator.sensitivity_analysis[12]', 'simulator.break_even_month[12]',
+            'simulator.portfolio_24[12]'})
+        for stats in result['results'].values():
+            self.assertGreaterEqual(stats['runs'], suite.MIN_RUNS)
+            self.assertGreater(stats['median'], 0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            suite.main(['--horizons', '12', '--filter', 'simulator.project', '--budget', '0.001', '--out', path])
+            with self.assertRaises(SystemExit):
+                with open(path) as f:
+                    baseline = json.load(f)
+                baseline['results']['simulator.project_months[12]']['median'] = 1e-12
+                with open(path, 'w') as f:
+                    json.dump(baseline, f)
+                suite.main(['--horizons', '12', '--filter', 'simulator.project', '--budget', '0.001',
+                            '--compare', path, '--threshold', '10'])
+
+
+if __name__ == '__main__':
+    unittest.main()
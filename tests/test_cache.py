@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import cache
+from cache import ResultCache, etag_for, make_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResultCacheTests(unittest.TestCase):
+    def test_key_canonicalizes_floats(self):
+        self.assertEqual(make_key('project', (50.0, -0.0)), make_key('project', (float('50'), 0.0)))
+        self.assertNotEqual(make_key('project', (50.0,)), make_key('cohort', (50.0,)))
+        self.assertEqual(etag_for(make_key('a', (1.5,))), etag_for(make_key('a', (1.5,))))
+
+    def test_etag_changes_with_simulator_version(self):
+        key = make_key('project', (50.0,))
+        before = etag_for(key)
+        with mock.patch.object(cache, 'SIMULATOR_VERSION', 'next'):
+            self.assertNotEqual(etag_for(key), before)
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResultCache(max_entries=2, max_bytes=1000, ttl=None)
+        cache.put('a', b'1')
+        cache.put('b', b'2')
+        cache.get('a')
+        cache.put('c', b'3')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'1')
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_eviction_by_bytes(self):
+        cache = ResultCache(max_entries=10, max_bytes=10, ttl=None)
+        cache.put('a', b'12345')
+        cache.put('b', b'12345')
+        cache.put('c', b'1')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['bytes'], 6)
+        cache.put('huge', b'x' * 11)
+        self.assertIsNone(cache.get('huge'))
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResultCache(max_entries=10, max_bytes=100, ttl=5, clock=clock)
+        cache.put('a', b'1')
+        clock.now = 4
+        self.assertEqual(cache.get('a'), b'1')
+        clock.now = 10
+        self.assertIsNone(cache.get('a'))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations']), (1, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
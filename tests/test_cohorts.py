@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from cohorts import (convolve_retention, layered_cohort_projection, layered_cohorts_batch, summarize_layered,
+                     unit_economics)
+from results import LayeredCohortResult
+from simulator import cohort_projection
+
+
+def naive_active(new, churn):
+    """Sum every cohort every month: the O(months^2) reference."""
+    return [sum(new[s] * (1 - churn) ** (t - s) for s in range(t + 1)) for t in range(len(new))]
+
+
+class LayeredCohortTests(unittest.TestCase):
+    def test_recurrence_matches_naive_sum(self):
+        batch = layered_cohorts_batch(24, 5.0, 0.07, new_customers=100, customer_growth=0.03)
+        new = batch['new_customers'][:, 0]
+        np.testing.assert_allclose(batch['active_customers'][:, 0], naive_active(new, 0.07))
+        np.testing.assert_allclose(batch['monthly_margin'], batch['active_customers'] * 5.0)
+
+    def test_single_cohort_reduces_to_cohort_projection(self):
+        layered = layered_cohort_projection(12, 5.0, 0.1, new_customers=0, initial_customers=100)
+        single = cohort_projection(100, 5.0, 0.1, 12)
+        np.testing.assert_allclose(layered.column('cumulative_margin'), single.column('cumulative_margin'))
+
+    def test_retention_curve_uses_convolution(self):
+        curve = 0.9 ** np.arange(36)
+        by_curve = layered_cohorts_batch(36, 5.0, retention=curve, new_customers=[50, 80], customer_growth=0.02)
+        by_churn = layered_cohorts_batch(36, 5.0, 0.1, new_customers=[50, 80], customer_growth=0.02)
+        np.testing.assert_allclose(by_curve['active_customers'], by_churn['active_customers'])
+        short = convolve_retention(np.ones((5, 1)), np.array([[1.0], [0.5], [0], [0], [0]]))
+        np.testing.assert_allclose(short[:, 0], [1, 1.5, 1.5, 1.5, 1.5], atol=1e-12)
+
+    def test_vectorized_configs_match_individual_runs(self):
+        churn = np.array([0.02, 0.1, 0.3])
+        cac = np.array([20.0, 40.0, 80.0])
+        batch = layered_cohorts_batch(18, 5.0, churn, marketing_budget=4000, budget_growth=0.01, cac=cac)
+        for i in range(3):
+            single = layered_cohort_projection(18, 5.0, churn[i], marketing_budget=4000, budget_growth=0.01,
+                                               cac=cac[i])
+            self.assertIsInstance(single, LayeredCohortResult)
+            np.testing.assert_allclose(batch['cumulative_net'][:, i], single.column('cumulative_net'))
+        np.testing.assert_allclose(batch['acquisition_spend'][0], 4000)
+        np.testing.assert_allclose(batch['new_customers'][0], 4000 / cac)
+
+    def test_summary_and_unit_economics(self):
+        batch = layered_cohorts_batch(24, 5.0, 0.05, new_customers=100, cac=[30, 60])
+        summary = summarize_layered(batch)
+        self.assertGreater(summary['payback_month'][0], 0)
+        self.assertEqual(summary['payback_month'][1], 0)
+        economics = unit_economics(5.0, cac=40, monthly_churn=0.1)
+        self.assertEqual(economics, {'ltv': 50.0, 'cac': 40, 'cac_payback_months': 8, 'ltv_to_cac': 1.25})
+        self.assertAlmostEqual(unit_economics(5.0, retention=[1, 0.5, 0.25])['ltv'], 8.75)
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            layered_cohorts_batch(12, 5.0, 0.1)
+        with self.assertRaises(ValueError):
+            layered_cohorts_batch(12, 5.0, 0.1, marketing_budget=1000)
+        with self.assertRaises(ValueError):
+            layered_cohorts_batch(12, 5.0, 0.1, retention=[1.0], new_customers=10)
+        with self.assertRaises(ValueError):
+            layered_cohorts_batch(12, 5.0, 1.5, new_customers=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import main
+from export import export_result, format_for_path, read_columns, read_result
+from run_from_config import run_batch
+from simulator import project_months
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.results = project_months(10000, 50, 20, 200, 0.05, 24)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_npz_round_trip(self):
+        path = os.path.join(self.dir, 'p.npz')
+        self.assertEqual(export_result(path, self.results), 'npz')
+        loaded = read_result(path)
+        self.assertEqual(loaded.to_records(), self.results.to_records())
+        columns = read_columns(path)
+        self.assertEqual(columns['month'].dtype, np.int64)
+        self.assertEqual(columns['revenue'].dtype, np.float64)
+
+    def test_npz_keeps_huge_unit_counts_as_float(self):
+        path = os.path.join(self.dir, 'huge.npz')
+        huge = project_months(0, 1, 0, 1000, 2.0, 60)
+        export_result(path, huge)
+        columns = read_columns(path)
+        self.assertEqual(columns['month'].dtype, np.int64)
+        self.assertEqual(columns['units'].dtype, np.float64)
+        self.assertEqual(columns['units'][-1], huge[-1]['units'])
+        self.assertEqual(read_result(path).to_records(), huge.to_records())
+
+    def test_npz_mmap_reader(self):
+        path = os.path.join(self.dir, 'p.npz')
+        export_result(path, self.results)
+        mapped = read_columns(path, mmap=True)
+        self.assertIsInstance(mapped['cumulative_profit'], np.memmap)
+        for name, values in read_columns(path).items():
+            np.testing.assert_array_equal(mapped[name], values)
+
+        empty = os.path.join(self.dir, 'empty.npz')
+        export_result(empty, project_months(1, 2, 1, 1, 0.0, 0))
+        self.assertEqual(len(read_columns(empty, mmap=True)['month']), 0)
+
+    def test_csv_matches_historical_format(self):
+        path = os.path.join(self.dir, 'p.csv')
+        export_result(path, self.results)
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], ','.join(self.results.fields))
+        self.assertEqual(lines[1], '1,200,10000.00,4000.00,6000.00,-4000.00')
+        columns = read_columns(path)
+        np.testing.assert_allclose(columns['revenue'], np.round(self.results.column('revenue'), 2))
+
+    def test_format_errors(self):
+        self.assertEqual(format_for_path('out.feather'), 'arrow')
+        self.assertEqual(format_for_path('out.bin', 'npz'), 'npz')
+        with self.assertRaises(ValueError):
+            format_for_path('out.txt')
+        with self.assertRaises(ValueError):
+            format_for_path('out.csv', 'xlsx')
+
+    @unittest.skipIf(HAVE_PYARROW, 'pyarrow installed')
+    def test_arrow_without_pyarrow(self):
+        with self.assertRaisesRegex(ImportError, 'pip install pyarrow'):
+            export_result(os.path.join(self.dir, 'p.parquet'), self.results)
+
+    @unittest.skipUnless(HAVE_PYARROW, 'pyarrow not installed')
+    def test_arrow_and_parquet_round_trip(self):
+        for name in ('p.arrow', 'p.parquet'):
+            path = os.path.join(self.dir, name)
+            export_result(path, self.results)
+            self.assertEqual(read_result(path).to_records(), self.results.to_records())
+            np.testing.assert_array_equal(read_columns(path, mmap=True)['revenue'], self.results.column('revenue'))
+
+    def test_batch_npz_and_cli_export(self):
+        source = os.path.join(self.dir, 'configs.jsonl')
+        with open(source, 'w') as f:
+            f.write(json.dumps({'name': 'a', 'fixed_costs': 1000, 'price': 50, 'variable_cost': 20}) + '\n')
+        out = os.path.join(self.dir, 'out')
+        rows = run_batch(source, out, max_workers=1, fmt='npz')
+        self.assertEqual(rows[0]['status'], 'computed')
+        self.assertEqual(len(read_columns(os.path.join(out, 'a.npz'))['month']), 12)
+        self.assertEqual(run_batch(source, out, max_workers=1, fmt='npz')[0]['status'], 'fresh')
+        self.assertEqual(run_batch(source, out, max_workers=1)[0]['status'], 'computed')
+        with self.assertRaises(ValueError):
+            run_batch(source, out, max_workers=1, fmt='npz', combined=os.path.join(self.dir, 'all.csv'))
+
+        path = os.path.join(self.dir, 'cli.npz')
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.main(['--fixed-costs', '1000', '--price', '10', '--variable-cost', '5', '--months', '3',
+                       '--export', path])
+        self.assertEqual(list(read_columns(path)['month']), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
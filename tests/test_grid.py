@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from grid import grid_axis, grid_row_fields, grid_sensitivity, iter_grid_rows, iter_grid_sensitivity, normalize_axes
+from simulator import break_even_month, project_months
+
+BASE = {'fixed_costs': 10000, 'price': 50, 'variable_cost': 20, 'initial_sales': 200, 'monthly_growth': 0.05}
+
+
+class GridSensitivityTests(unittest.TestCase):
+    def test_axis_specs(self):
+        self.assertEqual(grid_axis({'min': 40, 'max': 60, 'steps': 3}), [40.0, 50.0, 60.0])
+        self.assertEqual(grid_axis([1, 2]), [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            normalize_axes({'unknown': [1]})
+
+    def test_grid_matches_scalar_projection(self):
+        axes = {'price': [40, 50, 60], 'variable_cost': [15, 25], 'monthly_growth': [0.0, 0.1]}
+        result = grid_sensitivity(BASE, axes, months=12)
+        self.assertEqual(result['shape'], [3, 2, 2])
+        for i, price in enumerate(axes['price']):
+            for j, var in enumerate(axes['variable_cost']):
+                for k, growth in enumerate(axes['monthly_growth']):
+                    proj = project_months(BASE['fixed_costs'], price, var, BASE['initial_sales'], growth, 12)
+                    self.assertEqual(result['break_even_month'][i][j][k], break_even_month(proj))
+                    self.assertEqual(result['final_cumulative_profit'][i][j][k], proj[-1]['cumulative_profit'])
+
+    def test_tornado_sorted_by_swing(self):
+        result = grid_sensitivity(BASE, {'price': [40, 60], 'fixed_costs': [9000, 11000]}, months=12)
+        swings = [bar['swing'] for bar in result['tornado']]
+        self.assertEqual(swings, sorted(swings, reverse=True))
+        self.assertEqual(result['tornado'][0]['parameter'], 'price')
+
+    def test_chunks_cover_grid(self):
+        axes = normalize_axes({'price': {'min': 30, 'max': 70, 'steps': 10}, 'initial_sales': [100, 200, 300]})
+        chunks = list(iter_grid_sensitivity(BASE, axes, 12, max_workers=1, chunk_size=7))
+        self.assertEqual(sum(len(bem) for _, bem, _ in chunks), 30)
+
+    def test_rows_cover_grid(self):
+        axes = normalize_axes({'price': {'min': 30, 'max': 70, 'steps': 10}, 'initial_sales': [100, 200, 300]})
+        full = grid_sensitivity(BASE, axes, 12, max_workers=1)
+        rows = list(iter_grid_rows(BASE, axes, 12, max_workers=1, chunk_size=7))
+        self.assertEqual(grid_row_fields(axes),
+                         ('index', 'price', 'initial_sales', 'break_even_month', 'final_cumulative_profit'))
+        self.assertEqual(sorted(row[0] for row in rows), list(range(30)))
+        for index, price, sales, bem, final in rows:
+            i, j = divmod(index, 3)
+            self.assertEqual((price, sales), (axes['price'][i], axes['initial_sales'][j]))
+            self.assertEqual(bem, full['break_even_month'][i][j])
+            self.assertEqual(final, full['final_cumulative_profit'][i][j])
+
+    def test_process_pool_matches_inline(self):
+        axes = {'price': {'min': 30, 'max': 70, 'steps': 20}, 'monthly_growth': {'min': 0, 'max': 0.1, 'steps': 5}}
+        inline = grid_sensitivity(BASE, axes, 24, max_workers=1)
+        pooled = grid_sensitivity(BASE, axes, 24, max_workers=2, chunk_size=16)
+        self.assertEqual(inline['final_cumulative_profit'], pooled['final_cumulative_profit'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from incremental import param_segments, patch_projection, patch_segments, recompute_from
+from precompute import PROJECTION_PARAMETERS
+from simulator import project_months
+
+BASE = dict(fixed_costs=10000, price=50, variable_cost=20, initial_sales=200, monthly_growth=0.01, months=120)
+
+
+def project(params):
+    return project_months(*(params[name] for name in PROJECTION_PARAMETERS))
+
+
+class PatchProjectionTests(unittest.TestCase):
+    def test_matches_full_recompute_exactly(self):
+        rng = random.Random(7)
+        values = {
+            'fixed_costs': lambda: rng.uniform(0, 1e5),
+            'price': lambda: rng.uniform(20, 80),
+            'variable_cost': lambda: rng.uniform(0, 40),
+            'initial_sales': lambda: rng.randint(0, 500),
+            'monthly_growth': lambda: rng.uniform(-0.05, 0.05),
+            'months': lambda: rng.randint(0, 200),
+        }
+        params, results = BASE, project(BASE)
+        for _ in range(200):
+            changes = {name: values[name]() for name in rng.sample(PROJECTION_PARAMETERS, rng.randint(0, 3))}
+            results, params, _ = patch_projection(results, params, changes)
+            self.assertEqual(results.to_bytes(), project(params).to_bytes(), changes)
+
+    def test_recomputes_only_dependent_months(self):
+        results = project(BASE)
+        self.assertEqual(recompute_from(results, BASE, dict(BASE, months=150)), 120)
+        self.assertEqual(recompute_from(results, BASE, dict(BASE, months=100)), 100)
+        self.assertEqual(recompute_from(results, BASE, dict(BASE, price=60), from_month=90), 89)
+        self.assertEqual(recompute_from(results, BASE, dict(BASE, price=60)), 0)
+
+    def test_change_from_month(self):
+        results = project(BASE)
+        patched, params, start = patch_projection(results, BASE, {'price': 60, 'fixed_costs': 12000}, from_month=7)
+        self.assertEqual(start, 6)
+        self.assertEqual(params['price'], 60.0)
+        self.assertEqual(patched.to_records()[:6], results.to_records()[:6])
+        month7 = patched[6]
+        self.assertEqual(month7['units'], results[6]['units'])
+        self.assertEqual(month7['revenue'], results[6]['units'] * 60)
+        self.assertAlmostEqual(month7['cumulative_profit'],
+                               results[5]['cumulative_profit'] - 2000 + month7['units'] * 40)
+
+        grown, _, _ = patch_projection(results, BASE, {'monthly_growth': 0.5}, from_month=7)
+        self.assertEqual(grown[5]['units'], results[5]['units'])
+        self.assertEqual(grown[6]['units'], int(results[5]['units'] * 1.5))
+
+    def test_repeating_a_later_value_from_month_one(self):
+        params = dict(BASE, initial_sales=100, monthly_growth=0.05, months=12)
+        results, segments = project(params), param_segments(params)
+        results, params, _ = patch_projection(results, params, {'monthly_growth': 0.5}, 6, segments)
+        segments = patch_segments(segments, params, 6)
+        self.assertEqual(segments['monthly_growth'], ((1, 0.05), (6, 0.5)))
+
+        results, params, start = patch_projection(results, params, {'monthly_growth': 0.5}, 1, segments)
+        self.assertEqual(start, 0)
+        self.assertEqual(list(results.column('units'))[:3], [100, 150, 225])
+        self.assertEqual(results.to_bytes(), project(params).to_bytes())
+
+    def test_fixed_costs_from_month_after_partial_patch(self):
+        results, segments = project(BASE), param_segments(BASE)
+        results, params, _ = patch_projection(results, BASE, {'fixed_costs': 12000}, 6, segments)
+        segments = patch_segments(segments, params, 6)
+        results, params, _ = patch_projection(results, params, {'fixed_costs': 15000}, 3, segments)
+        self.assertAlmostEqual(results[2]['cumulative_profit'], project(params)[2]['cumulative_profit'])
+        self.assertAlmostEqual(results[-1]['cumulative_profit'], project(params)[-1]['cumulative_profit'])
+
+    def test_invalid_patches(self):
+        results = project(BASE)
+        with self.assertRaises(ValueError):
+            patch_projection(results, BASE, {'initial_sales': 10}, from_month=2)
+        with self.assertRaises(ValueError):
+            patch_projection(results, BASE, {'price': 60}, from_month=122)
+        with self.assertRaises(ValueError):
+            patch_projection(results, BASE, {'prise': 60})
+        with self.assertRaises(ValueError):
+            patch_projection(results, dict(BASE, months=12), {'price': 60})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import instrumentation
+from instrumentation import BUCKETS, Histogram, instrument, render_prometheus, timed, timed_iter
+from simulator import project_months
+from webapp import app
+
+
+class InstrumentationTests(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        instrumentation.enable(True)
+
+    def tearDown(self):
+        instrumentation.enable(False)
+        instrumentation.reset()
+
+    def test_histogram_buckets_are_cumulative_in_output(self):
+        instrumentation.observe(instrumentation.STAGE_METRIC, 'stage', 'x', 0.0003)
+        instrumentation.observe(instrumentation.STAGE_METRIC, 'stage', 'x', 20.0)
+        text = render_prometheus()
+        self.assertIn('# TYPE simulator_stage_seconds histogram', text)
+        self.assertIn('simulator_stage_seconds_bucket{stage="x",le="0.00025"} 0', text)
+        self.assertIn('simulator_stage_seconds_bucket{stage="x",le="0.0005"} 1', text)
+        self.assertIn('simulator_stage_seconds_bucket{stage="x",le="10.0"} 1', text)
+        self.assertIn('simulator_stage_seconds_bucket{stage="x",le="+Inf"} 2', text)
+        self.assertIn('simulator_stage_seconds_count{stage="x"} 2', text)
+
+    def test_histogram_boundary_falls_in_its_bucket(self):
+        histogram = Histogram()
+        histogram.observe(BUCKETS[0])
+        self.assertEqual(histogram.snapshot()[0][0], 1)
+
+    def test_timed_and_instrument(self):
+        @instrument('demo')
+        def work(x):
+            return x * 2
+
+        self.assertEqual(work(2), 4)
+        with timed('block'):
+            pass
+        text = render_prometheus()
+        self.assertIn('simulator_stage_seconds_count{stage="demo"} 1', text)
+        self.assertIn('simulator_stage_seconds_count{stage="block"} 1', text)
+
+    def test_timed_iter_excludes_consumer_time(self):
+        for _ in timed_iter('produce', range(3)):
+            time.sleep(0.02)
+        text = render_prometheus()
+        self.assertIn('simulator_stage_seconds_count{stage="produce"} 1', text)
+        total = float(text.split('simulator_stage_seconds_sum{stage="produce"} ')[1].split()[0])
+        self.assertLess(total, 0.02)
+
+    def test_disabled_records_nothing(self):
+        instrumentation.enable(False)
+        project_months(10000, 50, 20, 200, 0.05, 12)
+        with timed('block'):
+            pass
+        self.assertEqual(render_prometheus(), '\n')
+
+    def test_simulator_functions_instrumented(self):
+        project_months(10000, 50, 20, 200, 0.05, 12)
+        self.assertIn('stage="simulator.project_months"', render_prometheus())
+
+
+class InstrumentationEndpointTests(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+        instrumentation.reset()
+        instrumentation.enable(True)
+
+    def tearDown(self):
+        instrumentation.enable(False)
+        instrumentation.reset()
+        app.config.pop('ALLOW_PROFILING', None)
+
+    def test_metrics_endpoint_reports_simulate_stages(self):
+        response = self.client.post('/simulate', data={'months': 6})
+        self.assertEqual(response.status_code, 200)
+        # The page is streamed: its stages run, and the request is timed, as the body is read.
+        self.assertIn(b'Projection Results', response.data)
+        response.close()
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        for stage in ('simulate.parse', 'simulate.project_months', 'simulate.table_rows',
+                      'simulate.json_dumps', 'simulate.render'):
+            self.assertIn(f'simulator_stage_seconds_count{{stage="{stage}"}} 1', text)
+        self.assertIn('simulator_request_seconds_count{endpoint="simulate"} 1', text)
+
+    def test_api_requests_timed_by_endpoint(self):
+        self.client.get('/api/health')
+        self.assertIn('endpoint="api.api_health"', self.client.get('/metrics').get_data(as_text=True))
+
+    def test_profile_requires_opt_in(self):
+        response = self.client.get('/api/health?profile=1')
+        self.assertEqual(response.get_json()['status'], 'healthy')
+
+    def test_profile_returns_summary(self):
+        app.config['ALLOW_PROFILING'] = True
+        response = self.client.get('/api/project?months=24&profile=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        self.assertIn('cumulative', text)
+        self.assertIn('project_months', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
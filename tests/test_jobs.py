@@ -0,0 +1,75 @@
+import os
+import sys
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from jobs import job_months, run_job, run_jobs
+from simulator import break_even_month, project_months
+
+
+class JobTests(unittest.TestCase):
+    def test_project_job_matches_simulator(self):
+        entry = run_job({'id': 'p', 'type': 'project', 'params': {'price': 60, 'months': 6}})
+        self.assertEqual(entry['status'], 'success')
+        expected = project_months(10000, 60, 20, 200, 0.05, 6)
+        self.assertEqual(entry['data']['results'], expected.to_records())
+        self.assertEqual(entry['data']['break_even_month'], break_even_month(expected))
+        self.assertIn('time_ms', entry)
+
+    def test_errors_are_isolated_and_order_kept(self):
+        jobs = [
+            {'id': 1, 'type': 'break_even', 'params': {'fixed_costs': 1e7, 'monthly_growth': 0}},
+            {'id': 2, 'type': 'nope'},
+            {'id': 3, 'type': 'project', 'params': {'price': 'abc'}},
+            {'id': 4, 'type': 'cohort', 'params': {'months': 3}},
+            'not a job',
+        ]
+        entries = run_jobs(jobs, max_workers=4)
+        self.assertEqual([e['id'] for e in entries], [1, 2, 3, 4, 4])
+        self.assertEqual([e['status'] for e in entries], ['success', 'error', 'error', 'success', 'error'])
+        self.assertEqual(entries[0]['data']['break_even_month'], 1667)
+
+    def test_dead_worker_fails_remaining_jobs(self):
+        class DyingPool:
+            _max_workers = 2
+
+            def map(self, fn, *iterables, chunksize=1):
+                self.chunksize = chunksize
+                yield fn(next(iter(iterables[0])), 0)
+                raise BrokenProcessPool('killed')
+
+        pool = DyingPool()
+        jobs = [{'id': i, 'type': 'break_even', 'params': {}} for i in range(20)]
+        entries = run_jobs(jobs, executor=pool)
+        self.assertEqual(pool.chunksize, 2)
+        self.assertEqual([e['id'] for e in entries], list(range(20)))
+        self.assertEqual(entries[0]['status'], 'success')
+        self.assertEqual({e['status'] for e in entries[1:]}, {'error'})
+        self.assertIn('Worker process died', entries[1]['message'])
+        self.assertEqual(entries[1]['type'], 'break_even')
+
+    def test_job_months(self):
+        self.assertEqual(job_months({'type': 'project', 'params': {'months': 24}}), 24)
+        self.assertEqual(job_months({'type': 'cohort'}), 12)
+        self.assertEqual(job_months({'type': 'sensitivity', 'params': {'months': 10}}), 50)
+        self.assertEqual(job_months({'type': 'break_even', 'params': {'months': 10**9}}), 0)
+        self.assertEqual(job_months({'type': 'project', 'params': {'months': 'abc'}}), 0)
+        self.assertEqual(job_months('not a job'), 0)
+
+    def test_sensitivity_job(self):
+        entry = run_job({'type': 'sensitivity', 'params': {'parameter': 'variable_cost'}})
+        self.assertEqual(len(entry['data']['results']), 5)
+
+    def test_break_even_only_flag_parsing(self):
+        for value, expected in (('false', False), ('0', False), (False, False), ('true', True), ('1', True), (True, True)):
+            entry = run_job({'type': 'sensitivity', 'params': {'break_even_only': value}})
+            self.assertEqual('final_cumulative_profit' not in entry['data']['results'][0], expected, value)
+
+
+if __name__ == '__main__':
+    unittest.main()
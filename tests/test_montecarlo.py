@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import montecarlo
+from montecarlo import monte_carlo_projection
+from simulator import break_even_month, project_months
+
+SPECS = {
+    'fixed_costs': 10000,
+    'price': {'dist': 'normal', 'mean': 50, 'std': 5},
+    'variable_cost': {'dist': 'triangular', 'left': 15, 'mode': 20, 'right': 30},
+    'initial_sales': {'dist': 'lognormal', 'median': 200, 'sigma': 0.3},
+    'monthly_growth': {'dist': 'uniform', 'low': 0.0, 'high': 0.1},
+}
+
+
+class MonteCarloTests(unittest.TestCase):
+    def test_constant_inputs_match_deterministic_projection(self):
+        summary = monte_carlo_projection(10000, 50, 20, 200, 0.05, 12, trials=50, seed=1)
+        expected = project_months(10000, 50, 20, 200, 0.05, 12)
+        self.assertEqual(summary['percentiles']['p50'], list(expected.column('cumulative_profit')))
+        self.assertEqual(summary['break_even_histogram'][break_even_month(expected)], 50)
+
+    def test_seed_is_reproducible(self):
+        a = monte_carlo_projection(**SPECS, months=12, trials=3000, seed=42, chunk_size=500)
+        b = monte_carlo_projection(**SPECS, months=12, trials=3000, seed=42, chunk_size=500)
+        self.assertEqual(a, b)
+        self.assertEqual(sum(a['break_even_histogram']), 3000)
+
+    def test_unseeded_run_reports_its_seed(self):
+        original = montecarlo.EXACT_PERCENTILE_CELLS
+        montecarlo.EXACT_PERCENTILE_CELLS = 0
+        try:
+            a = monte_carlo_projection(**SPECS, months=12, trials=2000, chunk_size=500)
+            b = monte_carlo_projection(**SPECS, months=12, trials=2000, seed=a['seed'], chunk_size=500)
+        finally:
+            montecarlo.EXACT_PERCENTILE_CELLS = original
+        self.assertIsInstance(a['seed'], int)
+        self.assertEqual(a, b)
+
+    def test_bands_are_ordered(self):
+        summary = monte_carlo_projection(**SPECS, months=24, trials=2000, seed=7)
+        bands = summary['percentiles']
+        for lo, mid, hi in zip(bands['p5'], bands['p50'], bands['p95']):
+            self.assertLessEqual(lo, mid)
+            self.assertLessEqual(mid, hi)
+
+    def test_histogram_mode_close_to_exact(self):
+        exact = monte_carlo_projection(**SPECS, months=24, trials=4000, seed=3)
+        original = montecarlo.EXACT_PERCENTILE_CELLS
+        montecarlo.EXACT_PERCENTILE_CELLS = 0
+        try:
+            binned = monte_carlo_projection(**SPECS, months=24, trials=4000, seed=3)
+        finally:
+            montecarlo.EXACT_PERCENTILE_CELLS = original
+        self.assertFalse(binned['exact'])
+        self.assertEqual(binned['break_even_histogram'], exact['break_even_histogram'])
+        for key in ('p5', 'p50', 'p95'):
+            self.assertAlmostEqual(binned['percentiles'][key][-1], exact['percentiles'][key][-1],
+                                   delta=abs(exact['percentiles'][key][-1]) * 0.02)
+
+    def test_invalid_distribution(self):
+        with self.assertRaises(ValueError):
+            monte_carlo_projection(10000, {'dist': 'cauchy'}, 20, 200, 0.05, 12, trials=10)
+        with self.assertRaises(ValueError):
+            monte_carlo_projection(10000, {'dist': 'normal', 'mean': 50}, 20, 200, 0.05, 12, trials=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from portfolio import normalize_products, project_portfolio, simulate_portfolio
+from simulator import break_even_month, project_months
+
+BASIC = {'name': 'basic', 'price': 20, 'variable_cost': 5, 'initial_sales': 500, 'monthly_growth': 0.0}
+PRO = {'name': 'pro', 'price': 90, 'variable_cost': 30, 'initial_sales': 40, 'monthly_growth': 0.05,
+       'fixed_costs': 8000}
+
+
+class PortfolioTests(unittest.TestCase):
+    def test_single_product_matches_project_months(self):
+        portfolio = simulate_portfolio([dict(PRO, fixed_costs=0)], 10000, 36)
+        expected = project_months(10000, 90, 30, 40, 0.05, 36)
+        self.assertEqual(portfolio['results'].to_records(), expected.to_records())
+        self.assertEqual(portfolio['break_even_month'], break_even_month(expected))
+        self.assertEqual(portfolio['products'][0]['break_even_month'], break_even_month(expected))
+
+    def test_shared_fixed_costs_are_subtracted_once(self):
+        portfolio = simulate_portfolio([BASIC, PRO], 50000, 24)
+        basic = project_months(0, 20, 5, 500, 0.0, 24)
+        pro = project_months(8000, 90, 30, 40, 0.05, 24)
+        cumulative = portfolio['results'].column('cumulative_profit')
+        expected = [b + p - 50000 for b, p in zip(basic.column('cumulative_profit'), pro.column('cumulative_profit'))]
+        for got, want in zip(cumulative, expected):
+            self.assertAlmostEqual(got, want, places=6)
+        self.assertEqual(list(portfolio['results'].column('units')),
+                         [b + p for b, p in zip(basic.column('units'), pro.column('units'))])
+        self.assertAlmostEqual(portfolio['final_cumulative_profit'], expected[-1], places=6)
+        self.assertAlmostEqual(portfolio['total_contribution'],
+                               basic.column('cumulative_profit')[-1] + pro.column('cumulative_profit')[-1] + 8000)
+
+    def test_allocation_and_product_break_even(self):
+        portfolio = simulate_portfolio([BASIC, PRO], 50000, 24, allocation='equal')
+        basic, pro = portfolio['products']
+        self.assertEqual(basic['allocated_fixed_costs'], 25000)
+        self.assertEqual(pro['allocated_fixed_costs'], 33000)
+        self.assertAlmostEqual(basic['contribution_share'] + pro['contribution_share'], 1.0)
+        self.assertEqual(basic['break_even_month'], 4)  # 7500 a month against 25000
+        self.assertAlmostEqual(basic['final_profit'], 24 * 7500 - 25000)
+
+        by_revenue = simulate_portfolio([BASIC, PRO], 50000, 24)
+        revenue = project_portfolio([BASIC, PRO], 24)['revenue'].sum(axis=0)
+        allocated = [p['allocated_fixed_costs'] for p in by_revenue['products']]
+        self.assertAlmostEqual(allocated[0], 50000 * revenue[0] / revenue.sum())
+        self.assertAlmostEqual(sum(allocated), 58000)
+
+    def test_product_that_never_breaks_even(self):
+        loss = {'name': 'loss', 'price': 10, 'variable_cost': 12}
+        portfolio = simulate_portfolio([BASIC, loss], 1000, 12, allocation='contribution')
+        self.assertEqual(portfolio['products'][1]['break_even_month'], 0)
+        self.assertEqual(portfolio['products'][1]['allocated_fixed_costs'], 0)
+        self.assertEqual(portfolio['break_even_month'], 1)
+
+    def test_zero_months(self):
+        portfolio = simulate_portfolio([BASIC, PRO], 1000, 0)
+        self.assertEqual(len(portfolio['results']), 0)
+        self.assertEqual(portfolio['break_even_month'], 0)
+        self.assertEqual(portfolio['final_cumulative_profit'], -9000)
+
+    def test_invalid_products(self):
+        self.assertEqual([p['name'] for p in normalize_products([{}, {}])], ['product-1', 'product-2'])
+        for products in ([], [BASIC, BASIC], [{'colour': 'red'}], [{'price': -1}], ['basic']):
+            with self.assertRaises(ValueError):
+                normalize_products(products)
+        with self.assertRaises(ValueError):
+            simulate_portfolio([BASIC], 1000, 12, allocation='headcount')
+        with self.assertRaises(ValueError):
+            simulate_portfolio([BASIC], -1, 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
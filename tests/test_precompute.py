@@ -0,0 +1,118 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import precompute
+from precompute import load_projection, projection_key, store_projection, warm_in_background, warm_scenarios
+from scenarios import FileScenarioStore, SQLiteScenarioStore
+from simulator import project_months
+
+PARAMS = {'fixed_costs': 10000.0, 'price': 50.0, 'variable_cost': 20.0, 'initial_sales': 200,
+          'monthly_growth': 0.05, 'months': 24}
+
+
+class PrecomputeTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def stores(self):
+        return [FileScenarioStore(self.tmp / 'files'), SQLiteScenarioStore(self.tmp / 'db.sqlite')]
+
+    def test_key_tracks_params_and_version(self):
+        key = projection_key(PARAMS)
+        self.assertEqual(key, projection_key(dict(PARAMS, price=50)))
+        self.assertNotEqual(key, projection_key(dict(PARAMS, price=51)))
+        with mock.patch.object(precompute, 'SIMULATOR_VERSION', 'next'):
+            self.assertNotEqual(key, projection_key(PARAMS))
+
+    def test_load_reads_persisted_copy(self):
+        expected = project_months(10000.0, 50.0, 20.0, 200, 0.05, 24)
+        for store in self.stores():
+            store.save('s', PARAMS)
+            self.assertEqual(store_projection('s', PARAMS, store), expected)
+            with mock.patch.object(precompute, 'project_months', side_effect=AssertionError('recomputed')):
+                self.assertEqual(load_projection('s', store=store), expected)
+
+    def test_stale_copy_is_recomputed(self):
+        for store in self.stores():
+            store.save('s', PARAMS)
+            store_projection('s', PARAMS, store)
+            store.save('s', dict(PARAMS, months=6))
+            self.assertEqual(len(load_projection('s', store=store)), 6)
+            self.assertEqual(store.load_results('s')[0], projection_key(dict(PARAMS, months=6)))
+            store.save_results('s', projection_key(dict(PARAMS, months=6)), b'corrupt')
+            self.assertEqual(len(load_projection('s', store=store)), 6)
+
+    def test_delete_removes_results(self):
+        for store in self.stores():
+            store.save('s', PARAMS)
+            store_projection('s', PARAMS, store)
+            store.delete('s')
+            self.assertIsNone(store.load_results('s'))
+
+    def test_warm_scenarios(self):
+        for store in self.stores():
+            for i in range(3):
+                store.save(f's{i}', dict(PARAMS, months=12 + i))
+            self.assertEqual(warm_scenarios(store, max_workers=1), {'computed': 3, 'fresh': 0, 'failed': 0})
+            self.assertEqual(warm_scenarios(store, max_workers=1), {'computed': 0, 'fresh': 3, 'failed': 0})
+            with mock.patch.object(precompute, 'SIMULATOR_VERSION', 'next'):
+                self.assertEqual(warm_scenarios(store, max_workers=2)['computed'], 3)
+            self.assertEqual(warm_scenarios(store, force=True, max_workers=1)['computed'], 3)
+
+    def test_warm_scenarios_on_executor(self):
+        store = FileScenarioStore(self.tmp / 'exec')
+        for i in range(3):
+            store.save(f's{i}', dict(PARAMS, months=12 + i))
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            self.assertEqual(warm_scenarios(store, executor=pool)['computed'], 3)
+        self.assertEqual(warm_scenarios(store, max_workers=1)['fresh'], 3)
+
+    def test_warm_scenarios_counts_failures_and_continues(self):
+        store = FileScenarioStore(self.tmp / 'failing')
+        for i in range(4):
+            store.save(f's{i}', dict(PARAMS, months=12 + i))
+        compute = precompute._compute
+
+        def flaky(params):
+            if params['months'] == 13:
+                raise OverflowError('boom')
+            return compute(params)
+
+        with mock.patch.object(precompute, '_compute', side_effect=flaky), ThreadPoolExecutor(2) as pool:
+            self.assertEqual(warm_scenarios(store, executor=pool), {'computed': 3, 'fresh': 0, 'failed': 1})
+        with mock.patch.object(store, 'save_results', side_effect=OSError('disk full')):
+            self.assertEqual(warm_scenarios(store, max_workers=1), {'computed': 0, 'fresh': 3, 'failed': 1})
+        self.assertEqual(warm_scenarios(store, max_workers=1), {'computed': 1, 'fresh': 3, 'failed': 0})
+
+    def test_one_background_warm_at_a_time(self):
+        release = threading.Event()
+        with mock.patch.object(precompute, 'warm_scenarios', side_effect=lambda **kwargs: release.wait(5)):
+            first = warm_in_background()
+            try:
+                self.assertIsNotNone(first)
+                self.assertIsNone(warm_in_background())
+            finally:
+                release.set()
+                first.join()
+            second = warm_in_background()
+            self.assertIsNotNone(second)
+            second.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import tracemalloc
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from results import CohortResult, ProjectionResult, column, iter_rows
+from simulator import cohort_projection, project_months
+
+
+class ColumnarResultTests(unittest.TestCase):
+    def test_projection_is_columnar_and_record_compatible(self):
+        results = project_months(1000, 10, 5, initial_sales=20, monthly_growth=0.5, months=6)
+        self.assertIsInstance(results, ProjectionResult)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(list(results.column('month')), [1, 2, 3, 4, 5, 6])
+        first = results[0]
+        self.assertEqual(first, {'month': 1, 'units': 20, 'revenue': 200.0, 'variable_costs': 100.0,
+                                 'profit': 100.0, 'cumulative_profit': -900.0})
+        self.assertIsInstance(first['units'], int)
+        self.assertEqual(results[-1], results.to_records()[-1])
+        self.assertEqual(len(results[1:3]), 2)
+
+    def test_binary_round_trip(self):
+        results = project_months(1000, 10, 5, initial_sales=20, monthly_growth=0.5, months=50)
+        data = results.to_bytes()
+        self.assertEqual(len(data), 16 + results.nbytes)
+        self.assertEqual(ProjectionResult.from_bytes(data), results)
+        self.assertEqual(len(ProjectionResult.from_bytes(ProjectionResult().to_bytes())), 0)
+        with self.assertRaises(ValueError):
+            ProjectionResult.from_bytes(data[:-8])
+        with self.assertRaises(ValueError):
+            CohortResult.from_bytes(data)
+        with self.assertRaises(ValueError):
+            ProjectionResult.from_bytes(b'junk' + data[4:])
+
+    def test_to_columns(self):
+        results = cohort_projection(100, 5.0, 0.1, 3)
+        self.assertIsInstance(results, CohortResult)
+        cols = results.to_columns()
+        self.assertEqual(cols['customers'], [100, 90, 81])
+        self.assertEqual(set(cols), set(CohortResult.fields))
+
+    def test_from_records_round_trip(self):
+        results = project_months(500, 12, 4, 30, 0.1, 12)
+        rebuilt = ProjectionResult.from_records(results.to_records())
+        self.assertEqual(rebuilt, results)
+
+    def test_from_rows_streams_rows(self):
+        months = 20000
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        results = project_months(10000, 50, 20, 200, 0.0001, months)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(len(results), months)
+        # Six float64 columns with array growth slack; holding every row tuple would be ~370 B/month.
+        self.assertLess((peak - start) / months, 100)
+
+    def test_helpers_accept_legacy_lists(self):
+        records = project_months(500, 12, 4, 30, 0.1, 4).to_records()
+        self.assertEqual(column(records, 'units'), [r['units'] for r in records])
+        rows = list(iter_rows(records, ('month', 'profit')))
+        self.assertEqual(rows[0], (1, records[0]['profit']))
+
+    def test_empty_result(self):
+        results = project_months(500, 12, 4, 30, 0.1, 0)
+        self.assertFalse(results)
+        with self.assertRaises(IndexError):
+            results[0]
+
+
+if __name__ == '__main__':
+    unittest.main()
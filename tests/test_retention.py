@@ -0,0 +1,81 @@
+import math
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import retention
+from retention import curve_key, expected_lifetime, survival, survival_table
+from simulator import calculate_ltv, cohort_projection
+
+WEIBULL = {'type': 'weibull', 'shape': 0.7, 'scale': 10}
+
+
+class RetentionCurveTests(unittest.TestCase):
+    def test_curve_shapes(self):
+        geometric = {'type': 'shifted_geometric', 'churn': 0.1}
+        self.assertEqual(survival_table(geometric, 3), (1.0, 0.9, 0.81 + 0.0))
+        self.assertEqual(survival(WEIBULL, 0), 1.0)
+        self.assertAlmostEqual(survival(WEIBULL, 10), math.exp(-1))
+        self.assertEqual(survival_table([1.0, 0.5], 4), (1.0, 0.5, 0.0, 0.0))
+        self.assertEqual(curve_key({'type': 'empirical', 'values': [1, 0.5]}), curve_key([1.0, 0.5]))
+
+    def test_invalid_specs(self):
+        for spec in ({'type': 'weibull', 'shape': 1}, {'type': 'weibull', 'shape': 0, 'scale': 1},
+                     {'type': 'shifted_geometric', 'churn': 2}, {'type': 'nope'}, [], [1, -0.5], 'x'):
+            with self.assertRaises(ValueError):
+                curve_key(spec)
+
+    def test_expected_lifetime(self):
+        self.assertAlmostEqual(expected_lifetime({'type': 'shifted_geometric', 'churn': 0.1}), 10.0)
+        self.assertEqual(expected_lifetime({'type': 'shifted_geometric', 'churn': 0}), math.inf)
+        self.assertAlmostEqual(expected_lifetime([1, 0.5, 0.25]), 1.75)
+        self.assertAlmostEqual(expected_lifetime(WEIBULL, 36), sum(math.exp(-((k / 10) ** 0.7)) for k in range(36)))
+        unbounded = expected_lifetime(WEIBULL)
+        self.assertGreater(unbounded, expected_lifetime(WEIBULL, 36))
+        self.assertAlmostEqual(unbounded, sum(math.exp(-((k / 10) ** 0.7)) for k in range(2000)), places=6)
+
+    def test_tables_are_cached(self):
+        retention.clear_cache()
+        for margin in range(1, 500):
+            calculate_ltv(margin, retention=WEIBULL, months=24)
+        info = retention.cache_info()
+        self.assertEqual(info['misses'], 1)
+        self.assertGreaterEqual(info['hits'], 498)
+
+    def test_table_cache_is_bounded_by_months(self):
+        retention.clear_cache()
+        original = retention.MAX_CACHED_MONTHS
+        retention.MAX_CACHED_MONTHS = 256
+        try:
+            for scale in range(1, 10):
+                survival_table({'type': 'weibull', 'shape': 0.7, 'scale': scale}, 100)
+            info = retention.cache_info()
+            self.assertEqual(info['tables'], 2)
+            self.assertLessEqual(info['months'], 256)
+            survival_table({'type': 'weibull', 'shape': 0.7, 'scale': 9}, 100)
+            self.assertEqual(retention.cache_info()['hits'], 1)
+        finally:
+            retention.MAX_CACHED_MONTHS = original
+            retention.clear_cache()
+
+    def test_ltv_and_cohort_with_retention(self):
+        self.assertEqual(calculate_ltv(5.0, 0.1), 50.0)
+        self.assertAlmostEqual(calculate_ltv(5.0, retention={'type': 'shifted_geometric', 'churn': 0.1}), 50.0)
+        self.assertAlmostEqual(calculate_ltv(5.0, retention=[1, 0.5]), 7.5)
+        with self.assertRaises(ValueError):
+            calculate_ltv(5.0)
+        by_curve = cohort_projection(100, 5.0, None, 12, retention={'type': 'shifted_geometric', 'churn': 0.1})
+        by_churn = cohort_projection(100, 5.0, 0.1, 12)
+        for a, b in zip(by_curve.column('cumulative_margin'), by_churn.column('cumulative_margin')):
+            self.assertAlmostEqual(a, b)
+        weibull = cohort_projection(1000, 5.0, None, 6, retention=WEIBULL)
+        self.assertEqual(weibull[5]['customers'], int(1000 * survival(WEIBULL, 5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
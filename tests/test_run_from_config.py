@@ -0,0 +1,134 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import run_from_config
+from run_from_config import config_key, run_batch
+
+
+def write_jsonl(path, configs):
+    with open(path, 'w') as f:
+        for cfg in configs:
+            f.write(json.dumps(cfg) + '\n')
+
+
+class BatchRunTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.out = os.path.join(self.dir, 'out')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_jsonl_batch_summary_and_outputs(self):
+        source = os.path.join(self.dir, 'configs.jsonl')
+        write_jsonl(source, [
+            {'name': 'a', 'fixed_costs': 1000, 'price': 50, 'variable_cost': 20, 'initial_sales': 10, 'months': 6},
+            {'fixed_costs': 100000, 'price': 50, 'variable_cost': 20, 'initial_sales': 10, 'months': 3},
+            {'name': 'bad', 'fixed_costs': -1, 'price': 50, 'variable_cost': 20},
+        ])
+        combined = os.path.join(self.dir, 'all.csv')
+        rows = run_batch(source, self.out, max_workers=1, combined=combined)
+        self.assertEqual([r['name'] for r in rows], ['a', 'configs-2', 'bad'])
+        self.assertEqual([r['status'] for r in rows], ['computed', 'computed', 'failed'])
+        self.assertEqual(rows[0]['break_even_month'], 4)
+        self.assertEqual(rows[1]['break_even_month'], 0)
+        self.assertIn('non-negative', rows[2]['error'])
+        with open(os.path.join(self.out, 'a.csv')) as f:
+            self.assertEqual(len(f.readlines()), 7)
+        with open(combined) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0].split(',')[0], 'config')
+        self.assertEqual(len(lines), 1 + 6 + 3)
+        self.assertTrue(lines[1].startswith('a,1,'))
+
+    def test_rerun_skips_unchanged_configs(self):
+        source = os.path.join(self.dir, 'configs')
+        os.makedirs(source)
+        for name, price in (('x', 50), ('y', 60)):
+            with open(os.path.join(source, f'{name}.json'), 'w') as f:
+                json.dump({'fixed_costs': 1000, 'price': price, 'variable_cost': 20}, f)
+        first = run_batch(source, self.out, max_workers=1)
+        self.assertEqual([r['status'] for r in first], ['computed', 'computed'])
+
+        with open(os.path.join(source, 'y.json'), 'w') as f:
+            json.dump({'fixed_costs': 1000, 'price': 70, 'variable_cost': 20}, f)
+        second = run_batch(source, self.out, max_workers=1)
+        self.assertEqual([r['status'] for r in second], ['fresh', 'computed'])
+        self.assertEqual(second[0]['final_cumulative_profit'], first[0]['final_cumulative_profit'])
+
+        os.remove(os.path.join(self.out, 'x.csv'))
+        self.assertEqual([r['status'] for r in run_batch(source, self.out, max_workers=1)], ['computed', 'fresh'])
+        self.assertEqual([r['status'] for r in run_batch(source, self.out, max_workers=1, force=True)],
+                         ['computed', 'computed'])
+
+    def test_process_pool_matches_inline(self):
+        source = os.path.join(self.dir, 'configs.jsonl')
+        write_jsonl(source, [{'name': f'c{i}', 'fixed_costs': 1000 * i, 'price': 50, 'variable_cost': 20,
+                              'months': 12} for i in range(8)])
+        pooled = run_batch(source, self.out, max_workers=2)
+        inline = run_batch(source, os.path.join(self.dir, 'inline'), max_workers=1)
+        self.assertEqual(pooled, inline)
+
+    def test_duplicate_and_unsafe_names(self):
+        source = os.path.join(self.dir, 'dupes.jsonl')
+        cfg = {'fixed_costs': 1, 'price': 2, 'variable_cost': 1}
+        write_jsonl(source, [dict(cfg, name='a'), dict(cfg, name='a')])
+        with self.assertRaises(ValueError):
+            run_batch(source, self.out, max_workers=1)
+        write_jsonl(source, [dict(cfg, name='../escape')])
+        rows = run_batch(source, self.out, max_workers=1)
+        self.assertEqual(rows[0]['status'], 'failed')
+        self.assertFalse(os.path.exists(os.path.join(self.dir, 'escape.csv')))
+
+    def test_config_key_uses_defaults_and_version(self):
+        base = {'fixed_costs': 1000, 'price': 50, 'variable_cost': 20}
+        self.assertEqual(config_key(base), config_key(dict(base, initial_sales=100, months=12)))
+        self.assertNotEqual(config_key(base), config_key(dict(base, months=13)))
+        self.assertNotEqual(config_key(base), config_key(base, plot=True))
+
+    def test_single_config_mode(self):
+        out_csv = os.path.join(self.dir, 'single.csv')
+        path = os.path.join(self.dir, 'single.json')
+        with open(path, 'w') as f:
+            json.dump({'fixed_costs': 1000, 'price': 50, 'variable_cost': 20, 'export_csv': out_csv}, f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_from_config.main([path])
+        self.assertTrue(os.path.exists(out_csv))
+
+
+    def test_portfolio_configs(self):
+        portfolio = {'name': 'lines', 'fixed_costs': 20000, 'months': 12, 'allocation': 'equal', 'products': [
+            {'name': 'basic', 'price': 20, 'variable_cost': 5, 'initial_sales': 500, 'monthly_growth': 0},
+            {'name': 'pro', 'price': 90, 'variable_cost': 30, 'initial_sales': 40, 'monthly_growth': 0},
+        ]}
+        source = os.path.join(self.dir, 'configs.jsonl')
+        write_jsonl(source, [portfolio, {'name': 'bad', 'fixed_costs': 1000, 'products': [{'price': -5}]}])
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = {row['name']: row for row in run_batch(source, self.out)}
+        self.assertEqual(rows['lines']['status'], 'computed')
+        self.assertEqual(rows['lines']['break_even_month'], 3)
+        self.assertEqual(rows['bad']['status'], 'failed')
+        self.assertNotEqual(config_key(portfolio), config_key(dict(portfolio, allocation='revenue')))
+
+        path = os.path.join(self.dir, 'portfolio.json')
+        with open(path, 'w') as f:
+            json.dump(dict(portfolio, export_csv=os.path.join(self.dir, 'portfolio.csv')), f)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_from_config.main([path])
+        self.assertIn('Portfolio break-even month: 3', output.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.dir, 'portfolio.csv')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from scenarios import FileScenarioStore, ScenarioStore, SQLiteScenarioStore, migrate_file_store
+
+
+class StoreContract:
+    """Behaviour every scenario backend must share."""
+
+    def make_store(self, tmp: Path):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.store = self.make_store(self.tmp)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_save_load_delete(self):
+        params = {'price': 50.0, 'initial_sales': 200}
+        self.store.save('base', params)
+        self.assertEqual(self.store.load('base'), params)
+        self.store.save('base', {'price': 60.0})
+        self.assertEqual(self.store.load('base'), {'price': 60.0})
+        self.assertTrue(self.store.delete('base'))
+        self.assertFalse(self.store.delete('base'))
+        with self.assertRaises(FileNotFoundError):
+            self.store.load('base')
+
+    def test_list_prefix_and_pagination(self):
+        for name in ['b-2', 'a-1', 'b-1', 'b-10', 'c']:
+            self.store.save(name, {'price': 1.0})
+        self.assertEqual(self.store.list(), ['a-1', 'b-1', 'b-10', 'b-2', 'c'])
+        self.assertEqual(self.store.list(prefix='b-'), ['b-1', 'b-10', 'b-2'])
+        self.assertEqual(self.store.list(prefix='b-', limit=2, offset=1), ['b-10', 'b-2'])
+        self.assertEqual(self.store.list(limit=0), [])
+        self.assertEqual(self.store.count(prefix='b-'), 3)
+        self.assertEqual(self.store.count(), 5)
+        self.store.delete('b-1')
+        self.assertEqual(self.store.list(prefix='b'), ['b-10', 'b-2'])
+
+    def test_tags(self):
+        self.store.save('x', {'price': 1.0}, tags=['q3', 'pricing'])
+        self.store.save('y', {'price': 2.0}, tags=['q3'])
+        self.store.save('z', {'price': 3.0})
+        self.assertEqual(self.store.load('x'), {'price': 1.0})
+        self.assertEqual(self.store.tags('x'), ['pricing', 'q3'])
+        self.assertEqual(self.store.list(tag='q3'), ['x', 'y'])
+        self.assertEqual(self.store.count(tag='pricing'), 1)
+        self.store.save('x', {'price': 1.0})
+        self.assertEqual(self.store.list(tag='pricing'), [])
+
+
+class FileStoreTests(StoreContract, unittest.TestCase):
+    def make_store(self, tmp):
+        return FileScenarioStore(tmp / 'scenarios')
+
+    def test_sees_files_written_outside_the_store(self):
+        self.store.save('a', {'price': 1.0})
+        self.assertEqual(self.store.list(), ['a'])
+        (self.tmp / 'scenarios' / 'b.json').write_text('{"price": 2.0}')
+        self.assertEqual(self.store.list(), ['a', 'b'])
+
+    def test_sees_changes_within_mtime_granularity(self):
+        directory = self.tmp / 'scenarios'
+        self.store.save('a', {'price': 1.0})
+        self.assertEqual(self.store.list(), ['a'])
+        # Another process adds a file within the same mtime tick.
+        stat = directory.stat()
+        (directory / 'b.json').write_text('{"price": 2.0}')
+        os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.store.list(), ['a', 'b'])
+
+    def test_store_interface_is_abstract(self):
+        with self.assertRaises(TypeError):
+            ScenarioStore()
+
+
+class SQLiteStoreTests(StoreContract, unittest.TestCase):
+    def make_store(self, tmp):
+        return SQLiteScenarioStore(tmp / 'scenarios.db')
+
+    def test_wal_mode(self):
+        mode = self.store._connect().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode, 'wal')
+
+    def test_concurrent_writers(self):
+        def write(worker):
+            for i in range(50):
+                self.store.save(f'w{worker}-{i:02d}', {'price': float(i)})
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.store.count(), 200)
+        self.assertEqual(self.store.count(prefix='w3-'), 50)
+
+    def test_migrate_from_file_store(self):
+        files = FileScenarioStore(self.tmp / 'json')
+        files.save('one', {'price': 1.0}, tags=['t'])
+        files.save('two', {'price': 2.0})
+        self.assertEqual(migrate_file_store(files, self.store, batch_size=1), 2)
+        self.assertEqual(self.store.list(), ['one', 'two'])
+        self.assertEqual(self.store.load('one'), {'price': 1.0})
+        self.assertEqual(self.store.list(tag='t'), ['one'])
+
+
+if __name__ == '__main__':
+    unittest.main()
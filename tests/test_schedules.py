@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from schedules import expand, schedule_key, segments_key
+from simulator import break_even_month, project_months
+
+
+def reference(fixed_costs, price, variable_cost, initial_sales, monthly_growth, months, schedule):
+    """Month-by-month evaluation of a schedule, for comparison."""
+    plan = dict(schedule_key(schedule))
+    prices = expand(plan.get('price', ()), price, months)
+    variable_costs = expand(plan.get('variable_cost', ()), variable_cost, months)
+    growth = expand(plan.get('monthly_growth', ()), monthly_growth, months)
+    monthly_fixed = expand(plan.get('monthly_fixed_costs', ()), 0.0, months)
+    season = plan.get('seasonality', (1.0,))
+    rows = []
+    cumulative = -fixed_costs
+    units = initial_sales
+    for m in range(months):
+        sold = int(units * season[m % len(season)])
+        revenue = sold * prices[m]
+        variable = sold * variable_costs[m]
+        profit = revenue - variable - monthly_fixed[m]
+        cumulative += profit
+        rows.append({'month': m + 1, 'units': sold, 'revenue': revenue, 'variable_costs': variable,
+                     'profit': profit, 'cumulative_profit': cumulative})
+        units = int(units * (1 + growth[m]))
+    return rows
+
+
+class ScheduleTests(unittest.TestCase):
+    def test_segments_steps_and_ramps(self):
+        segments = segments_key([{'from': 13, 'value': 55}, {'from': 25, 'value': 55, 'to': 70, 'until': 28}])
+        self.assertEqual(segments, ((13, 55.0, 0.0), (25, 55.0, 5.0), (29, 70.0, 0.0)))
+        values = expand(segments, 50.0, 30).tolist()
+        self.assertEqual(values[:12], [50.0] * 12)
+        self.assertEqual(values[12:24], [55.0] * 12)
+        self.assertEqual(values[24:], [55.0, 60.0, 65.0, 70.0, 70.0, 70.0])
+        self.assertEqual(segments_key(7), ((1, 7.0, 0.0),))
+        # A later segment cuts a ramp short.
+        cut = segments_key([{'from': 1, 'value': 0, 'to': 10, 'until': 11}, {'from': 5, 'value': 1}])
+        self.assertEqual(cut, ((1, 0.0, 1.0), (5, 1.0, 0.0)))
+
+    def test_invalid_specs(self):
+        for spec in ([], [{'from': 0, 'value': 1}], [{'value': 1}, {'from': 1, 'value': 2}],
+                     [{'from': 3, 'value': 1, 'to': 2}], [{'from': 3, 'value': 1, 'to': 2, 'until': 3}], 'x'):
+            with self.assertRaises(ValueError, msg=spec):
+                segments_key(spec)
+        with self.assertRaises(ValueError):
+            schedule_key({'colour': 1})
+        with self.assertRaises(ValueError):
+            schedule_key({'seasonality': []})
+
+    def test_constant_schedule_matches_project_months(self):
+        rng = random.Random(3)
+        for _ in range(100):
+            args = (rng.uniform(0, 1e5), rng.uniform(20, 80), rng.uniform(0, 40), rng.randint(0, 500),
+                    rng.choice([0.0, rng.uniform(-0.1, 0.1)]), rng.randint(0, 300))
+            schedule = {'price': args[1], 'variable_cost': args[2], 'monthly_growth': args[4]}
+            self.assertEqual(project_months(*args, schedule=schedule).to_bytes(), project_months(*args).to_bytes())
+
+    def test_matches_month_by_month_reference(self):
+        schedule = {
+            'price': [{'from': 13, 'value': 55}, {'from': 25, 'value': 55, 'to': 70, 'until': 36}],
+            'variable_cost': [{'from': 1, 'value': 20, 'to': 25, 'until': 120}],
+            'monthly_growth': [{'from': 1, 'value': 0.05}, {'from': 40, 'value': 0.0},
+                               {'from': 60, 'value': 0.02, 'to': -0.01, 'until': 80}],
+            'monthly_fixed_costs': [{'from': 1, 'value': 2000}, {'from': 61, 'value': 3000}],
+            'seasonality': [0.8, 0.9, 1.0, 1.0, 1.0, 1.1, 1.2, 1.2, 1.0, 1.0, 1.1, 1.5],
+        }
+        args = (100000, 50.0, 20.0, 200, 0.01, 120)
+        results = project_months(*args, schedule=schedule)
+        self.assertEqual(results.to_records(), reference(*args, schedule))
+        self.assertEqual(project_months(*args, schedule=schedule_key(schedule)), results)
+
+    def test_recurring_fixed_costs_delay_break_even(self):
+        plain = project_months(10000, 50, 20, 100, 0.0, 24)
+        recurring = project_months(10000, 50, 20, 100, 0.0, 24, schedule={'monthly_fixed_costs': 1000})
+        self.assertEqual(break_even_month(plain), 4)
+        self.assertEqual(break_even_month(recurring), 5)
+        self.assertEqual(recurring[0]['profit'], 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
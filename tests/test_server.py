@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from simulator import sensitivity_analysis
+from webapp import app
+from workers import run_cpu_bound, shutdown_pool
+
+
+class OffloadTests(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        app.config['OFFLOAD_CPU'] = True
+        self.client = app.test_client()
+
+    def tearDown(self):
+        app.config['OFFLOAD_CPU'] = False
+        shutdown_pool()
+
+    def test_run_cpu_bound_matches_inline(self):
+        args = (10000, 50, 20, 200, 0.05, 24, 'price', 0.2)
+        self.assertEqual(run_cpu_bound(True, sensitivity_analysis, *args),
+                         run_cpu_bound(False, sensitivity_analysis, *args))
+
+    def test_heavy_endpoints_offloaded(self):
+        response = self.client.get('/api/sensitivity?months=37&parameter=initial_sales&variation=0.3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['data']['results']), 5)
+
+        response = self.client.post('/api/montecarlo', json={'months': 6, 'trials': 200, 'seed': 3,
+                                                             'price': {'dist': 'normal', 'mean': 50, 'std': 5}})
+        self.assertEqual(response.status_code, 200)
+
+        jobs = [{'id': i, 'type': 'project', 'params': {'months': 6, 'price': 40 + i}} for i in range(3)]
+        data = self.client.post('/api/batch', json={'jobs': jobs}).get_json()['data']
+        self.assertEqual([r['id'] for r in data['results']], [0, 1, 2])
+        self.assertEqual(data['failed'], 0)
+
+        response = self.client.get('/api/chart/waterfall?months=7&price=61')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data.startswith(b'\x89PNG'))
+
+
+class ServerConfigTests(unittest.TestCase):
+    def test_configure_enables_offload(self):
+        from server import configure
+        try:
+            configured = configure(offload=True, process_workers=1)
+            self.assertIs(configured, app)
+            self.assertTrue(app.config['OFFLOAD_CPU'])
+            self.assertFalse(app.config['DEBUG'])
+        finally:
+            app.config['OFFLOAD_CPU'] = False
+            shutdown_pool()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import gc
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import shm_sweep as shm_sweep_module
+from shm_sweep import shm_sweep
+from simulator import cohort_projection, project_months, sensitivity_analysis
+
+
+def projection_args(count, months=12):
+    return [(10000 + 100 * i, 40 + i, 20, 150 + 10 * i, 0.01 * (i % 5), months) for i in range(count)]
+
+
+class ShmSweepTests(unittest.TestCase):
+    def test_inline_matches_project_months(self):
+        scenarios = projection_args(5)
+        with shm_sweep('project_months', scenarios, max_workers=1) as sweep:
+            self.assertEqual(sweep.shape, (5, 12))
+            for i, args in enumerate(scenarios):
+                expected = project_months(*args)
+                self.assertEqual(sweep.column('cumulative_profit')[i].tolist(),
+                                 list(expected.column('cumulative_profit')))
+                self.assertEqual(sweep.result(i).to_records(), expected.to_records())
+
+    def test_process_pool_matches_inline(self):
+        scenarios = projection_args(40, months=24)
+        inline = shm_sweep('project_months', scenarios, max_workers=1)
+        with shm_sweep('project_months', scenarios, max_workers=2, chunk_size=7) as pooled:
+            for name in pooled.fields:
+                self.assertEqual(pooled.column(name).tolist(), inline.column(name).tolist())
+
+    def test_views_outlive_result(self):
+        scenarios = projection_args(40)
+        expected = shm_sweep('project_months', scenarios, max_workers=1).column('cumulative_profit').sum()
+        column = shm_sweep('project_months', scenarios, max_workers=2, chunk_size=7).column('cumulative_profit')
+        gc.collect()
+        self.assertEqual(column.sum(), expected)
+
+        sweep = shm_sweep('project_months', scenarios, max_workers=2, chunk_size=7)
+        units = sweep.column('units')
+        sweep.close()
+        del sweep
+        gc.collect()
+        self.assertEqual(units.tolist(), [list(project_months(*args).column('units')) for args in scenarios])
+
+    def test_failure_on_caller_executor_waits_for_running_chunks(self):
+        fill = shm_sweep_module._fill
+        running, started, finished = threading.Event(), [], []
+
+        def flaky(name, shape, function, start, chunk):
+            if start == 0:
+                running.wait(5)
+                raise RuntimeError('chunk failed')
+            started.append(start)
+            running.set()
+            time.sleep(0.1)
+            fill(name, shape, function, start, chunk)
+            finished.append(start)
+
+        with ThreadPoolExecutor(max_workers=2) as pool, mock.patch.object(shm_sweep_module, '_fill', flaky):
+            with self.assertRaises(RuntimeError):
+                shm_sweep('project_months', projection_args(40), executor=pool, chunk_size=10)
+            # Every chunk that started wrote to the block before it was unlinked.
+            self.assertIn(10, started)
+            self.assertEqual(sorted(finished), sorted(started))
+
+    def test_cohort_and_sensitivity(self):
+        cohorts = [(1000 + i, 25.0, 0.05 + 0.01 * i, 18) for i in range(12)]
+        with shm_sweep('cohort_projection', cohorts, max_workers=2, chunk_size=5) as sweep:
+            for i, args in enumerate(cohorts):
+                self.assertEqual(sweep.result(i).to_records(), cohort_projection(*args).to_records())
+
+        base = (10000, 50, 20, 200, 0.05, 12)
+        sens = [base + ('price',), base + ('fixed_costs', 0.3), base + ('price', 0.2, True)]
+        with shm_sweep('sensitivity_analysis', sens, max_workers=2, chunk_size=1) as sweep:
+            self.assertEqual(sweep.shape, (3, 5))
+            for i, args in enumerate(sens):
+                self.assertEqual(sweep.result(i), sensitivity_analysis(*args))
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            shm_sweep('break_even_month', [])
+        with self.assertRaises(ValueError):
+            shm_sweep('project_months', projection_args(1, 12) + projection_args(1, 24))
+
+
+if __name__ == '__main__':
+    unittest.main()
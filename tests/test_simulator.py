@@ -11,6 +11,8 @@ if SRC not in sys.path:
 from simulator import break_even_units, project_months, break_even_month
 from simulator import calculate_ltv, cac_payback_months
 from simulator import cohort_projection, sensitivity_analysis
+from simulator import break_even_month_continuous, solve_break_even_month
+from simulator import iter_cohort_projection, iter_project_months
 
 
 class SimulatorTests(unittest.TestCase):
@@ -66,6 +68,50 @@ class SimulatorTests(unittest.TestCase):
         pos_10 = [r for r in results if r['change_percent'] == 10][0]
         self.assertGreater(neg_10['final_cumulative_profit'], pos_10['final_cumulative_profit'])
 
+    def test_row_generators_match_results(self):
+        rows = list(iter_project_months(1000, 10, 5, 20, 0.5, 12))
+        results = project_months(1000, 10, 5, 20, 0.5, 12)
+        self.assertEqual([r['cumulative_profit'] for r in results], [row[-1] for row in rows])
+        cohort_rows = list(iter_cohort_projection(100, 5.0, 0.1, 6))
+        self.assertEqual(cohort_rows[1], (2, 90, 450.0, 950.0))
+
+    def test_solve_break_even_month_matches_projection(self):
+        cases = [
+            (10000, 50, 20, 200, 0.05, 12),
+            (1000, 10, 5, 20, 0.5, 12),
+            (50000, 30, 10, 7, 0.1, 120),
+            (1000, 10, 5, 100, 0.0, 6),
+            (1000, 10, 5, 100, -0.3, 24),
+            (1000, 10, 5, 300, -1, 3),
+            (0, 10, 5, 0, 0.1, 3),
+            (1000, 5, 10, 100, 0.1, 24),
+            # Constant-profit tails whose running sum crosses zero within float rounding.
+            (1633.92, 2.58, 0.36, 23, 0, 600),
+            (589.96, 1.77, 0.91, 14, 0.05, 120),
+        ]
+        for case in cases:
+            expected = break_even_month(project_months(*case))
+            self.assertEqual(solve_break_even_month(*case), expected, case)
+
+    def test_solve_break_even_month_unbounded(self):
+        # Constant sales of 200 units at margin 30 cover 10M fixed costs in month 1667.
+        self.assertEqual(solve_break_even_month(1e7, 50, 20, 200, 0.0), 1667)
+        self.assertEqual(solve_break_even_month(1e7, 50, 20, 200, 0.0, months=1000), 0)
+        # Shrinking sales converge below the fixed costs: never.
+        self.assertEqual(solve_break_even_month(1e7, 50, 20, 200, -0.01), 0)
+
+    def test_break_even_month_continuous(self):
+        self.assertAlmostEqual(break_even_month_continuous(1000, 10, 5, 100, 0.0), 2.0)
+        self.assertEqual(break_even_month_continuous(1000, 10, 5, 100, -0.5), float('inf'))
+        estimate = break_even_month_continuous(10000, 50, 20, 200, 0.05)
+        self.assertLessEqual(estimate, break_even_month(project_months(10000, 50, 20, 200, 0.05, 12)))
+
+    def test_sensitivity_break_even_only(self):
+        full = sensitivity_analysis(10000, 50, 20, 200, 0.05, 12, 'price', 0.2)
+        fast = sensitivity_analysis(10000, 50, 20, 200, 0.05, 12, 'price', 0.2, break_even_only=True)
+        self.assertEqual([r['break_even_month'] for r in fast], [r['break_even_month'] for r in full])
+        self.assertNotIn('final_cumulative_profit', fast[0])
+
 
 
 if __name__ == '__main__':
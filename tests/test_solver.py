@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+from simulator import break_even_month, project_months
+from solver import final_cumulative_profit, solve_for
+
+BASE = dict(fixed_costs=10000, price=50, variable_cost=20, initial_sales=200, monthly_growth=0.05)
+
+
+def breaks_even(months, **params):
+    p = dict(BASE, **params)
+    return break_even_month(project_months(p['fixed_costs'], p['price'], p['variable_cost'], p['initial_sales'],
+                                           p['monthly_growth'], months)) > 0
+
+
+class SolverTests(unittest.TestCase):
+    def test_minimum_price_for_break_even(self):
+        result = solve_for('price', months=6, **BASE)
+        self.assertTrue(result['feasible'])
+        self.assertLess(result['evaluations'], 40)
+        self.assertTrue(breaks_even(6, price=result['value']))
+        self.assertFalse(breaks_even(6, price=result['value'] - 1e-5))
+        self.assertEqual(result['break_even_month'], 6)
+
+    def test_maximum_variable_cost(self):
+        result = solve_for('variable_cost', months=6, **BASE)
+        self.assertTrue(breaks_even(6, variable_cost=result['value']))
+        self.assertFalse(breaks_even(6, variable_cost=result['value'] + 1e-5))
+
+    def test_minimum_initial_sales_is_exact_integer(self):
+        result = solve_for('initial_sales', months=6, **BASE)
+        self.assertIsInstance(result['value'], int)
+        self.assertTrue(breaks_even(6, initial_sales=result['value']))
+        self.assertFalse(breaks_even(6, initial_sales=result['value'] - 1))
+
+    def test_growth_for_target_profit(self):
+        result = solve_for('monthly_growth', months=12, target_profit=50000, **BASE)
+        self.assertEqual(result['goal'], 'target_profit')
+        self.assertGreaterEqual(result['final_cumulative_profit'], 50000)
+        p = dict(BASE, monthly_growth=result['value'] - 1e-5)
+        self.assertLess(final_cumulative_profit(p['fixed_costs'], p['price'], p['variable_cost'], p['initial_sales'],
+                                                p['monthly_growth'], 12), 50000)
+
+    def test_goal_already_met_at_domain_floor(self):
+        result = solve_for('monthly_growth', months=12, **dict(BASE, fixed_costs=0))
+        self.assertEqual(result['value'], -1.0)
+
+    def test_infeasible_and_unbounded(self):
+        result = solve_for('monthly_growth', months=12, **dict(BASE, price=10))
+        self.assertFalse(result['feasible'])
+        self.assertIsNone(result['value'])
+        result = solve_for('variable_cost', months=12, **dict(BASE, fixed_costs=0, initial_sales=0))
+        self.assertTrue(result['feasible'])
+        self.assertTrue(result['unbounded'])
+
+    def test_final_cumulative_profit_matches_projection(self):
+        projection = project_months(1000, 10, 5, 20, 0.5, 9)
+        self.assertEqual(final_cumulative_profit(1000, 10, 5, 20, 0.5, 9), projection.column('cumulative_profit')[-1])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            solve_for('fixed_costs', months=12, **BASE)
+        with self.assertRaises(ValueError):
+            solve_for('price', months=0, **BASE)
+
+
+if __name__ == '__main__':
+    unittest.main()
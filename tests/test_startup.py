@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+BENCHMARKS = os.path.join(ROOT, 'benchmarks')
+if BENCHMARKS not in sys.path:
+    sys.path.insert(0, BENCHMARKS)
+
+import bench_startup
+
+
+class StartupTests(unittest.TestCase):
+    def test_cli_paths_skip_heavy_imports(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            for name, argv in bench_startup.cases(workdir).items():
+                _, modules, _ = bench_startup.import_profile(argv)
+                self.assertEqual(bench_startup.heavy_imports(modules), [], name)
+
+    @unittest.skipUnless(os.environ.get('SIM_CHECK_STARTUP_BUDGET'),
+                         'wall-clock budget; set SIM_CHECK_STARTUP_BUDGET=1 to check it')
+    def test_cli_paths_meet_budget(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            for name, argv in bench_startup.cases(workdir).items():
+                # Best of three, so one slow run on a busy machine doesn't fail the check.
+                total = min(bench_startup.import_profile(argv)[0] for _ in range(3))
+                self.assertLess(total / 1000, bench_startup.STARTUP_BUDGET_MS, name)
+
+    def test_parse_importtime(self):
+        stderr = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       100 |        100 |   _json\n'
+                  'import time:       300 |        400 | json\n'
+                  'import time:        50 |         50 | simulator\n')
+        total, modules, top_level = bench_startup.parse_importtime(stderr)
+        self.assertEqual(total, 450)
+        self.assertEqual(modules, {'_json': 100, 'json': 400, 'simulator': 50})
+        self.assertEqual(top_level, {'json': 400, 'simulator': 50})
+
+    def test_timings_flag_reports_on_stderr(self):
+        out = subprocess.run([sys.executable, os.path.join(ROOT, 'src', 'main.py'), '--fixed-costs', '1000',
+                              '--price', '10', '--variable-cost', '5', '--months', '3', '--timings'],
+                             capture_output=True, text=True, check=True)
+        self.assertIn('Month | Units', out.stdout)
+        self.assertNotIn('timings:', out.stdout)
+        self.assertIn('timings: imports', out.stderr)
+        self.assertIn('compute', out.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+import numpy as np
+
+from simulator import break_even_month, project_months
+from vectorized import break_even_months_batch, project_months_batch
+
+
+class VectorizedTests(unittest.TestCase):
+    def test_matches_scalar_projection_exactly(self):
+        rng = np.random.default_rng(7)
+        n = 50
+        fixed = rng.uniform(0, 50000, n)
+        price = rng.uniform(5, 200, n)
+        var = rng.uniform(1, 150, n)
+        sales = rng.integers(0, 1000, n)
+        growth = rng.uniform(-0.2, 0.3, n)
+        batch = project_months_batch(fixed, price, var, sales, growth, 36)
+        self.assertEqual(batch['units'].shape, (36, n))
+        for i in range(n):
+            scalar = project_months(fixed[i], price[i], var[i], int(sales[i]), growth[i], 36)
+            self.assertEqual([r['units'] for r in scalar], batch['units'][:, i].tolist())
+            self.assertEqual([r['cumulative_profit'] for r in scalar], batch['cumulative_profit'][:, i].tolist())
+            self.assertEqual([r['revenue'] for r in scalar], batch['revenue'][:, i].tolist())
+
+    def test_fractional_sales_and_large_growth_match_scalar(self):
+        params = [(1000.0, 10.0, 5.0, 20.7, 0.5), (1000.0, 10.0, 5.0, 0.4, 3.0), (0.0, 10.0, 5.0, 1000, 5.0)]
+        batch = project_months_batch(*[list(col) for col in zip(*params)], months=30)
+        for i, p in enumerate(params):
+            scalar = project_months(*p, 30)
+            self.assertEqual(batch['units'][:, i].tolist(), list(scalar.column('units')))
+            self.assertEqual(batch['cumulative_profit'][:, i].tolist(), list(scalar.column('cumulative_profit')))
+        # 1000 * 6 ** 29 units overflows int64 but stays finite and matches in float64.
+        self.assertGreater(batch['units'][-1, 2], np.iinfo(np.int64).max)
+
+    def test_scalars_broadcast(self):
+        batch = project_months_batch(1000, [10, 20], 5, 20, 0.5, 12)
+        self.assertEqual(batch['profit'].shape, (12, 2))
+        self.assertEqual(batch['month'].tolist(), list(range(1, 13)))
+
+    def test_mismatched_lengths(self):
+        with self.assertRaises(ValueError):
+            project_months_batch([1, 2], [10, 20, 30], 5, 20, 0.5, 12)
+
+    def test_break_even_months(self):
+        params = [(1000, 10, 5, 20, 0.5), (10000, 6, 5, 1, 0.0)]
+        batch = project_months_batch(*[list(col) for col in zip(*params)], months=12)
+        expected = [break_even_month(project_months(*p, 12)) for p in params]
+        self.assertEqual(break_even_months_batch(batch['cumulative_profit']).tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,6 +26,28 @@ class WebAppTests(unittest.TestCase):
         self.assertEqual(r.status_code, 200)
         self.assertIn(b'Projection Results', r.data)
 
+    def test_simulate_streams_table(self):
+        r = self.client.post('/simulate', data={
+            'fixed_costs': '10000', 'price': '50', 'variable_cost': '20', 'initial_sales': '1200', 'monthly_growth': '0', 'months': '3'
+        }, buffered=False)
+        self.assertTrue(r.is_streamed)
+        first = next(iter(r.response))
+        self.assertTrue(first.startswith(b'<!DOCTYPE html>'))
+        body = first + b''.join(r.response)
+        r.close()
+        self.assertIn(b'<tr><td>1</td><td>1,200</td><td>KES 60,000</td><td>KES 24,000</td><td>KES 36,000</td><td>KES 26,000</td></tr>', body)
+        self.assertEqual(body.count(b'<tr><td>'), 3)
+        self.assertIn(b'Projection Results', body)
+        self.assertIn(b'"month": [1, 2, 3]', body)
+        self.assertTrue(body.rstrip().endswith(b'</html>'))
+
+    def test_table_rows_chunks(self):
+        from simulator import project_months
+        from webapp import table_rows
+        results = project_months(1000, 10, 5, 10, 0.0, 5)
+        chunks = list(table_rows(results, chunk_rows=2))
+        self.assertEqual([c.count('<tr>') for c in chunks], [2, 2, 1])
+
     def test_cohort_routes(self):
         r = self.client.get('/cohort')
         self.assertEqual(r.status_code, 200)